@@ -4,7 +4,14 @@ PROJETO 4: ALGORITMO GENÉTICO
 Este script implementa um Algoritmo Genético para resolver o problema das N-Rainhas.
 A visualização mostra o melhor indivíduo de cada geração e um gráfico da evolução do fitness.
 """
+import os
+import heapq
 import random
+import struct
+import tempfile
+import time
+import queue
+import threading
 import numpy as np
 import matplotlib
 matplotlib.use('TkAgg')
@@ -26,107 +33,553 @@ def calcular_fitness(individuo):
                 ataques += 1
     return int(max_ataques - ataques)
 
-def selecionar_pais(populacao, fitness_populacao, k=3):
+def selecionar_pais(populacao, fitness_populacao, k=3, rng=random):
     """Seleciona um pai usando o método de Torneio."""
     # Pega k indivíduos aleatórios da população
-    selecao_torneio = random.choices(list(range(len(populacao))), k=k)
+    selecao_torneio = rng.choices(list(range(len(populacao))), k=k)
     # Encontra o índice do melhor indivíduo entre os selecionados
     indice_melhor = max(selecao_torneio, key=lambda i: fitness_populacao[i])
     return populacao[indice_melhor]
 
-def crossover(pai1, pai2):
+def crossover(pai1, pai2, rng=random):
     """Realiza o crossover de ponto único para criar um filho."""
     n = len(pai1)
-    ponto_corte = random.randint(1, n - 1)
+    ponto_corte = rng.randint(1, n - 1)
     filho = pai1[:ponto_corte] + pai2[ponto_corte:]
     return filho
 
-def mutacao(individuo, taxa_mutacao=0.1):
+def mutacao(individuo, taxa_mutacao=0.1, rng=random):
     """Aplica uma mutação aleatória em um indivíduo."""
-    if random.random() < taxa_mutacao:
+    if rng.random() < taxa_mutacao:
         n = len(individuo)
-        coluna = random.randint(0, n - 1)
-        nova_linha = random.randint(0, n - 1)
+        coluna = rng.randint(0, n - 1)
+        nova_linha = rng.randint(0, n - 1)
         individuo[coluna] = nova_linha
     return individuo
 
-# --- Algoritmo Principal e Visualização ---
+# --- Genoma de Permutação (uma rainha por linha e por coluna) ---
 
-def algoritmo_genetico_visual(n_rainhas=8, tam_populacao=100, geracoes=500, taxa_mutacao=0.1):
-    """Executa o Algoritmo Genético com visualização gráfica."""
-    plt.ion()
-    fig = plt.figure(figsize=(12, 6))
-    ax_tabuleiro = fig.add_subplot(1, 2, 1)
-    ax_grafico = fig.add_subplot(1, 2, 2)
-    fig.canvas.manager.set_window_title('Projeto 4: Algoritmo Genético para N-Rainhas')
+def calcular_fitness_permutacao(individuo):
+    """
+    Fitness para indivíduos que são permutações: como linhas e colunas nunca se repetem,
+    só restam conflitos nas diagonais, contados em O(n) com um contador por diagonal.
+    """
+    n = len(individuo)
+    diagonais_principais = [0] * (2 * n - 1)
+    diagonais_secundarias = [0] * (2 * n - 1)
+    for coluna, linha in enumerate(individuo):
+        diagonais_principais[coluna - linha + n - 1] += 1
+        diagonais_secundarias[coluna + linha] += 1
+    # Cada diagonal com k rainhas contribui com k*(k-1)/2 pares em ataque
+    ataques = sum(k * (k - 1) // 2 for k in diagonais_principais if k > 1) + \
+              sum(k * (k - 1) // 2 for k in diagonais_secundarias if k > 1)
+    return n * (n - 1) // 2 - ataques
+
+def inicializar_populacao_permutacao(n_rainhas, tam_populacao, rng=random):
+    """Cria a população inicial com permutações aleatórias das linhas."""
+    populacao = []
+    for _ in range(tam_populacao):
+        individuo = list(range(n_rainhas))
+        rng.shuffle(individuo)
+        populacao.append(individuo)
+    return populacao
+
+def crossover_pmx(pai1, pai2, rng=random):
+    """Partially Mapped Crossover (PMX): preserva um segmento de pai1 e o restante de pai2, sem repetições."""
+    n = len(pai1)
+    inicio, fim = sorted(rng.sample(range(n + 1), 2))
+    filho = [None] * n
+    filho[inicio:fim] = pai1[inicio:fim]
+    no_segmento = [False] * n
+    for gene in pai1[inicio:fim]:
+        no_segmento[gene] = True
+    posicao_em_pai2 = [0] * n
+    for posicao, gene in enumerate(pai2):
+        posicao_em_pai2[gene] = posicao
+
+    # Genes de pai2 que ficaram de fora do segmento seguem o mapeamento até uma posição livre
+    for i in range(inicio, fim):
+        gene = pai2[i]
+        if no_segmento[gene]:
+            continue
+        posicao = i
+        while inicio <= posicao < fim:
+            posicao = posicao_em_pai2[pai1[posicao]]
+        filho[posicao] = gene
+
+    for i in range(n):
+        if filho[i] is None:
+            filho[i] = pai2[i]
+    return filho
+
+def crossover_ox(pai1, pai2, rng=random):
+    """Order Crossover (OX): preserva um segmento de pai1 e completa na ordem relativa de pai2."""
+    n = len(pai1)
+    inicio, fim = sorted(rng.sample(range(n + 1), 2))
+    filho = [None] * n
+    filho[inicio:fim] = pai1[inicio:fim]
+    no_segmento = [False] * n
+    for gene in pai1[inicio:fim]:
+        no_segmento[gene] = True
+
+    restantes = [gene for gene in pai2[fim:] + pai2[:fim] if not no_segmento[gene]]
+    posicoes_livres = list(range(fim, n)) + list(range(0, inicio))
+    for posicao, gene in zip(posicoes_livres, restantes):
+        filho[posicao] = gene
+    return filho
+
+def mutacao_troca(individuo, taxa_mutacao=0.1, rng=random):
+    """Mutação por troca: permuta as linhas de duas colunas (mantém a permutação válida)."""
+    if rng.random() < taxa_mutacao:
+        i, j = rng.sample(range(len(individuo)), 2)
+        individuo[i], individuo[j] = individuo[j], individuo[i]
+    return individuo
+
+def mutacao_inversao(individuo, taxa_mutacao=0.1, rng=random):
+    """Mutação por inversão: inverte a ordem de um trecho do indivíduo."""
+    if rng.random() < taxa_mutacao:
+        inicio, fim = sorted(rng.sample(range(len(individuo) + 1), 2))
+        individuo[inicio:fim] = individuo[inicio:fim][::-1]
+    return individuo
+
+# --- Algoritmo Principal (sem visualização) ---
+
+def inicializar_populacao(n_rainhas, tam_populacao, rng=random):
+    """Cria a população inicial com indivíduos aleatórios."""
+    return [[rng.randint(0, n_rainhas - 1) for _ in range(n_rainhas)] for _ in range(tam_populacao)]
+
+# Operadores disponíveis para cada representação; o primeiro de cada grupo é o padrão
+GENOMAS = {
+    'linhas': {
+        'inicializar': inicializar_populacao,
+        'fitness': calcular_fitness,
+        'crossover': {'ponto_unico': crossover},
+        'mutacao': {'aleatoria': mutacao},
+    },
+    'permutacao': {
+        'inicializar': inicializar_populacao_permutacao,
+        'fitness': calcular_fitness_permutacao,
+        'crossover': {'pmx': crossover_pmx, 'ox': crossover_ox},
+        'mutacao': {'troca': mutacao_troca, 'inversao': mutacao_inversao},
+    },
+}
 
-    # 1. Inicializa a população com indivíduos aleatórios
-    populacao = [[random.randint(0, n_rainhas - 1) for _ in range(n_rainhas)] for _ in range(tam_populacao)]
-    
-    historico_melhor_fitness = []
+def obter_operadores(genoma='linhas', tipo_crossover=None, tipo_mutacao=None):
+    """Retorna (inicializar, fitness, crossover, mutacao) para a representação escolhida."""
+    if genoma not in GENOMAS:
+        raise ValueError(f"Genoma desconhecido: {genoma!r} (opções: {', '.join(GENOMAS)})")
+    config = GENOMAS[genoma]
+    tipo_crossover = tipo_crossover or next(iter(config['crossover']))
+    tipo_mutacao = tipo_mutacao or next(iter(config['mutacao']))
+    if tipo_crossover not in config['crossover'] or tipo_mutacao not in config['mutacao']:
+        raise ValueError(f"Operadores inválidos para o genoma {genoma!r}: {tipo_crossover!r}, {tipo_mutacao!r}")
+    return config['inicializar'], config['fitness'], config['crossover'][tipo_crossover], config['mutacao'][tipo_mutacao]
+
+def criar_nova_geracao(populacao, fitness_populacao, melhor_individuo, tam_populacao, taxa_mutacao, rng=random,
+                       operador_crossover=crossover, operador_mutacao=mutacao):
+    """Gera a próxima população por seleção, crossover, mutação e elitismo."""
+    nova_populacao = []
+    # Elitismo: o melhor indivíduo sobrevive para a próxima geração
+    nova_populacao.append(melhor_individuo)
+
+    while len(nova_populacao) < tam_populacao:
+        # Seleção
+        pai1 = selecionar_pais(populacao, fitness_populacao, rng=rng)
+        pai2 = selecionar_pais(populacao, fitness_populacao, rng=rng)
+        # Crossover
+        filho = operador_crossover(pai1, pai2, rng)
+        # Mutação
+        filho_mutado = operador_mutacao(filho, taxa_mutacao, rng)
+        nova_populacao.append(filho_mutado)
+    return nova_populacao
+
+# --- Checkpoint (salvar e retomar execuções longas) ---
+
+# assinatura, versão do RNG, n, população, geração, histórico, tipo do gene, tamanho da identificação
+CABECALHO_CHECKPOINT = struct.Struct('<4sBIIIIcI')
+ESTADO_RNG = struct.Struct('<625I?d')            # estado do Mersenne Twister + gauss_next
+ASSINATURA_CHECKPOINT = b'AGC2'
+CAMPOS_IDENTIFICACAO = ('genoma', 'crossover', 'mutacao', 'semente')
+
+def identificar_execucao(genoma, operador_crossover, operador_mutacao, semente):
+    """Identificação gravada no checkpoint: só a mesma configuração pode retomá-lo."""
+    return (genoma, operador_crossover.__name__, operador_mutacao.__name__, repr(semente))
+
+def salvar_checkpoint(caminho, populacao, historico, rng, geracao, identificacao):
+    """
+    Grava população, histórico de fitness, estado do RNG, geração e a identificação da
+    execução (genoma, operadores e semente) em um arquivo binário.
+    A escrita é atômica: o arquivo é montado em um temporário e só então substitui o anterior.
+    """
+    n_rainhas = len(populacao[0])
+    tipo_gene = b'H' if n_rainhas <= 0xFFFF else b'I'
+    versao_rng, estado_mt, gauss_next = rng.getstate()
+    texto_identificacao = '\n'.join(identificacao).encode('utf-8')
+    partes = [
+        CABECALHO_CHECKPOINT.pack(ASSINATURA_CHECKPOINT, versao_rng, n_rainhas, len(populacao),
+                                  geracao, len(historico), tipo_gene, len(texto_identificacao)),
+        texto_identificacao,
+        ESTADO_RNG.pack(*estado_mt, gauss_next is not None, gauss_next or 0.0),
+        struct.pack(f'<{n_rainhas * len(populacao)}{tipo_gene.decode()}', *(g for ind in populacao for g in ind)),
+        struct.pack(f'<{len(historico)}Q', *historico),
+    ]
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    descritor, temporario = tempfile.mkstemp(prefix='.checkpoint-', dir=diretorio)
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(b''.join(partes))
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+def carregar_checkpoint(caminho, rng):
+    """
+    Lê um checkpoint, restaura o estado do `rng` e retorna
+    (populacao, historico, geracao, identificacao).
+    """
+    with open(caminho, 'rb') as arquivo:
+        dados = arquivo.read()
+    if dados[:len(ASSINATURA_CHECKPOINT)] != ASSINATURA_CHECKPOINT:
+        raise ValueError(f"{caminho} não é um checkpoint do Algoritmo Genético (ou é de uma versão antiga)")
+    _, versao_rng, n_rainhas, tam_populacao, geracao, tam_historico, tipo_gene, tam_identificacao = \
+        CABECALHO_CHECKPOINT.unpack_from(dados, 0)
+    deslocamento = CABECALHO_CHECKPOINT.size
+    identificacao = tuple(dados[deslocamento:deslocamento + tam_identificacao].decode('utf-8').split('\n'))
+    deslocamento += tam_identificacao
+
+    *estado_mt, tem_gauss, gauss_next = ESTADO_RNG.unpack_from(dados, deslocamento)
+    rng.setstate((versao_rng, tuple(estado_mt), gauss_next if tem_gauss else None))
+    deslocamento += ESTADO_RNG.size
+
+    formato_genes = struct.Struct(f'<{n_rainhas * tam_populacao}{tipo_gene.decode()}')
+    genes = formato_genes.unpack_from(dados, deslocamento)
+    deslocamento += formato_genes.size
+    populacao = [list(genes[i:i + n_rainhas]) for i in range(0, len(genes), n_rainhas)]
+
+    historico = list(struct.unpack_from(f'<{tam_historico}Q', dados, deslocamento))
+    return populacao, historico, geracao, identificacao
+
+def algoritmo_genetico_headless(n_rainhas=8, tam_populacao=100, geracoes=500, taxa_mutacao=0.1,
+                                publicar=None, publicar_a_cada=1, parar=None, semente=None,
+                                arquivo_checkpoint=None, checkpoint_a_cada_s=5.0,
+                                genoma='linhas', tipo_crossover=None, tipo_mutacao=None, verboso=True):
+    """
+    Executa o Algoritmo Genético em velocidade máxima, sem nenhuma visualização.
+
+    `genoma` escolhe a representação ('linhas' ou 'permutacao', ver GENOMAS) e
+    `tipo_crossover`/`tipo_mutacao` escolhem os operadores dessa representação.
+
+    Se `publicar` for informado, ele é chamado como publicar(geracao, melhor_individuo, historico)
+    a cada `publicar_a_cada` gerações (e sempre na última). `parar` é um threading.Event
+    opcional que interrompe a evolução entre duas gerações.
+
+    Com `arquivo_checkpoint`, o estado é salvo no início de uma geração sempre que se passam
+    `checkpoint_a_cada_s` segundos; se o arquivo já existir, a execução é retomada dele e
+    segue exatamente a mesma trajetória de uma execução sem interrupção (mesma `semente`
+    e mesmos parâmetros).
+    Retorna (melhor_individuo, historico_melhor_fitness).
+    """
+    inicializar, fitness, operador_crossover, operador_mutacao = obter_operadores(genoma, tipo_crossover, tipo_mutacao)
+    identificacao = identificar_execucao(genoma, operador_crossover, operador_mutacao, semente)
+    rng = random.Random(semente)
+    if arquivo_checkpoint is not None and os.path.exists(arquivo_checkpoint):
+        populacao, historico_melhor_fitness, geracao_inicial, gravada = carregar_checkpoint(arquivo_checkpoint, rng)
+        if len(populacao) != tam_populacao or len(populacao[0]) != n_rainhas:
+            raise ValueError(f"Checkpoint {arquivo_checkpoint} não corresponde a n_rainhas={n_rainhas}, "
+                             f"tam_populacao={tam_populacao}")
+        if gravada != identificacao:
+            diferencas = ", ".join(f"{campo}={atual} (checkpoint: {antigo})"
+                                   for campo, atual, antigo in zip(CAMPOS_IDENTIFICACAO, identificacao, gravada)
+                                   if atual != antigo)
+            raise ValueError(f"Checkpoint {arquivo_checkpoint} não corresponde a {diferencas}")
+        if verboso: print(f"Retomando do checkpoint na geração {geracao_inicial}")
+    else:
+        populacao = inicializar(n_rainhas, tam_populacao, rng)
+        historico_melhor_fitness = []
+        geracao_inicial = 0
     max_fitness_possivel = n_rainhas * (n_rainhas - 1) / 2
+    melhor_individuo = None
+    ultimo_checkpoint = time.monotonic()
+
+    for geracao in range(geracao_inicial, geracoes):
+        if arquivo_checkpoint is not None and time.monotonic() - ultimo_checkpoint >= checkpoint_a_cada_s:
+            salvar_checkpoint(arquivo_checkpoint, populacao, historico_melhor_fitness, rng, geracao, identificacao)
+            ultimo_checkpoint = time.monotonic()
 
-    for geracao in range(geracoes):
-        # 2. Avalia o fitness de toda a população
-        fitness_populacao = [calcular_fitness(ind) for ind in populacao]
+        # Avalia o fitness de toda a população
+        fitness_populacao = [fitness(ind) for ind in populacao]
 
         # Encontra o melhor indivíduo da geração atual
         melhor_fitness_geracao = max(fitness_populacao)
         indice_melhor = fitness_populacao.index(melhor_fitness_geracao)
         melhor_individuo = populacao[indice_melhor]
         historico_melhor_fitness.append(melhor_fitness_geracao)
-        
-        # --- Visualização ---
-        ax_tabuleiro.clear()
-        ax_grafico.clear()
-        
-        # Desenha o tabuleiro do melhor indivíduo
-        tabuleiro_fundo = np.zeros((n_rainhas, n_rainhas))
-        for i in range(n_rainhas):
-            for j in range(n_rainhas):
-                if (i+j)%2 == 1: tabuleiro_fundo[i,j] = 1
-        ax_tabuleiro.imshow(tabuleiro_fundo, cmap='gray')
-        for col, lin in enumerate(melhor_individuo):
-            ax_tabuleiro.text(col, lin, '♛', ha='center', va='center', fontsize=28, color='gold')
-        ax_tabuleiro.set_title(f"Melhor Indivíduo | Geração: {geracao}")
-        ax_tabuleiro.set_xticks([]); ax_tabuleiro.set_yticks([])
-
-        # Desenha o gráfico de evolução do fitness
-        ax_grafico.plot(historico_melhor_fitness, marker='o', linestyle='-')
-        ax_grafico.set_title(f"Evolução do Fitness (Max: {max_fitness_possivel})")
-        ax_grafico.set_xlabel("Geração"); ax_grafico.set_ylabel("Melhor Fitness")
-        ax_grafico.set_xlim(0, geracoes); ax_grafico.set_ylim(0, max_fitness_possivel + 1)
-        ax_grafico.grid(True)
-        
-        plt.tight_layout()
-        plt.draw(); plt.pause(0.01)
-
-        # 3. Verifica se encontrou a solução
-        if melhor_fitness_geracao == max_fitness_possivel:
-            print(f"Solução encontrada na geração {geracao}")
+
+        resolvido = melhor_fitness_geracao == max_fitness_possivel
+        ultima = resolvido or geracao == geracoes - 1 or (parar is not None and parar.is_set())
+        if publicar is not None and (ultima or geracao % publicar_a_cada == 0):
+            # Publica uma cópia: o consumidor roda em outra thread
+            publicar(geracao, list(melhor_individuo), historico_melhor_fitness)
+
+        if resolvido:
+            if verboso: print(f"Solução encontrada na geração {geracao}")
+            break
+        if ultima:
             break
 
-        # 4. Cria a próxima geração
-        nova_populacao = []
-        # Elitismo: o melhor indivíduo sobrevive para a próxima geração
-        nova_populacao.append(melhor_individuo)
-
-        while len(nova_populacao) < tam_populacao:
-            # Seleção
-            pai1 = selecionar_pais(populacao, fitness_populacao)
-            pai2 = selecionar_pais(populacao, fitness_populacao)
-            # Crossover
-            filho = crossover(pai1, pai2)
-            # Mutação
-            filho_mutado = mutacao(filho, taxa_mutacao)
-            nova_populacao.append(filho_mutado)
-        
-        populacao = nova_populacao
+        populacao = criar_nova_geracao(populacao, fitness_populacao, melhor_individuo, tam_populacao, taxa_mutacao, rng,
+                                       operador_crossover, operador_mutacao)
+
+    return melhor_individuo, historico_melhor_fitness
+
+# --- Modo Steady-State (substitui poucos indivíduos por passo) ---
+
+class PopulacaoIndexada:
+    """
+    População com o fitness indexado em dois heaps (máximo e mínimo), de forma que encontrar
+    o melhor e o pior indivíduo e substituir um indivíduo custa O(log P), sem reescanear a lista.
+    Entradas antigas nos heaps são descartadas de forma preguiçosa, comparando a versão de cada posição.
+    """
+    def __init__(self, individuos, fitness):
+        self.individuos = list(individuos)
+        self.fitness = list(fitness)
+        self.versao = [0] * len(self.individuos)
+        self._reconstruir_heaps()
+
+    def __len__(self):
+        return len(self.individuos)
+
+    def _reconstruir_heaps(self):
+        self._heap_max = [(-f, i, 0) for i, f in enumerate(self.fitness)]
+        self._heap_min = [(f, i, 0) for i, f in enumerate(self.fitness)]
+        self.versao = [0] * len(self.individuos)
+        heapq.heapify(self._heap_max)
+        heapq.heapify(self._heap_min)
+
+    def _topo_valido(self, heap):
+        # Remove do topo as entradas que se referem a indivíduos já substituídos
+        while heap[0][2] != self.versao[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+    def melhor(self):
+        """Índice do indivíduo de maior fitness."""
+        return self._topo_valido(self._heap_max)
+
+    def pior(self):
+        """Índice do indivíduo de menor fitness."""
+        return self._topo_valido(self._heap_min)
+
+    def substituir(self, indice, individuo, fitness):
+        """Coloca um novo indivíduo na posição `indice`, atualizando os heaps em O(log P)."""
+        self.individuos[indice] = individuo
+        self.fitness[indice] = fitness
+        self.versao[indice] += 1
+        heapq.heappush(self._heap_max, (-fitness, indice, self.versao[indice]))
+        heapq.heappush(self._heap_min, (fitness, indice, self.versao[indice]))
+        # Evita que os heaps cresçam sem limite com entradas obsoletas
+        if len(self._heap_max) > 4 * len(self.individuos):
+            self._reconstruir_heaps()
+
+    def torneio(self, k=3, rng=random):
+        """Seleção por torneio: sorteia k posições e retorna o melhor indivíduo entre elas, em O(k)."""
+        indice_melhor = max((rng.randrange(len(self.individuos)) for _ in range(k)),
+                            key=self.fitness.__getitem__)
+        return self.individuos[indice_melhor]
+
+def algoritmo_genetico_steady_state(n_rainhas=8, tam_populacao=100, max_avaliacoes=50000, taxa_mutacao=0.1,
+                                    filhos_por_passo=2, semente=None, genoma='linhas',
+                                    tipo_crossover=None, tipo_mutacao=None, verboso=True):
+    """
+    Executa o Algoritmo Genético no modo steady-state: a cada passo são gerados apenas
+    `filhos_por_passo` filhos, e cada um substitui o pior indivíduo se não for pior que ele.
+
+    O histórico registra o melhor fitness a cada `tam_populacao` avaliações (uma "geração
+    equivalente"), para ser comparável ao modo geracional.
+    Retorna (melhor_individuo, historico_melhor_fitness, estatisticas), onde as estatísticas
+    incluem a vazão em filhos avaliados por segundo.
+    """
+    inicializar, fitness, operador_crossover, operador_mutacao = obter_operadores(genoma, tipo_crossover, tipo_mutacao)
+    rng = random.Random(semente)
+    max_fitness_possivel = n_rainhas * (n_rainhas - 1) // 2
+
+    tempo_inicial = time.perf_counter()
+    individuos = inicializar(n_rainhas, tam_populacao, rng)
+    populacao = PopulacaoIndexada(individuos, [fitness(ind) for ind in individuos])
+    historico_melhor_fitness = [populacao.fitness[populacao.melhor()]]
+    avaliacoes = 0
+
+    while avaliacoes < max_avaliacoes and populacao.fitness[populacao.melhor()] < max_fitness_possivel:
+        for _ in range(filhos_por_passo):
+            pai1 = populacao.torneio(rng=rng)
+            pai2 = populacao.torneio(rng=rng)
+            filho = operador_mutacao(operador_crossover(pai1, pai2, rng), taxa_mutacao, rng)
+            fitness_filho = fitness(filho)
+            avaliacoes += 1
 
+            indice_pior = populacao.pior()
+            if fitness_filho >= populacao.fitness[indice_pior]:
+                populacao.substituir(indice_pior, filho, fitness_filho)
+
+            if avaliacoes % tam_populacao == 0:
+                historico_melhor_fitness.append(populacao.fitness[populacao.melhor()])
+
+    tempo_total = time.perf_counter() - tempo_inicial
+    indice_melhor = populacao.melhor()
+    if populacao.fitness[indice_melhor] != historico_melhor_fitness[-1]:
+        historico_melhor_fitness.append(populacao.fitness[indice_melhor])
+    estatisticas = {
+        'avaliacoes': avaliacoes,
+        'tempo': tempo_total,
+        'avaliacoes_por_segundo': avaliacoes / tempo_total if tempo_total > 0 else float('inf'),
+    }
+    if verboso:
+        resultado = "Solução encontrada" if populacao.fitness[indice_melhor] == max_fitness_possivel else "Limite atingido"
+        print(f"{resultado} após {avaliacoes} avaliações "
+              f"({estatisticas['avaliacoes_por_segundo']:.0f} filhos avaliados/s)")
+    return populacao.individuos[indice_melhor], historico_melhor_fitness, estatisticas
+
+# --- Visualização (consumidor desacoplado da evolução) ---
+
+class RenderizadorGA:
+    """
+    Desenha o melhor indivíduo e a curva de fitness atualizando os artistas já criados
+    (set_data), sem limpar os eixos nem reconstruir o gráfico a cada quadro.
+    """
+    def __init__(self, n_rainhas, geracoes):
+        self.n_rainhas = n_rainhas
+        plt.ion()
+        self.fig = plt.figure(figsize=(12, 6))
+        self.ax_tabuleiro = self.fig.add_subplot(1, 2, 1)
+        self.ax_grafico = self.fig.add_subplot(1, 2, 2)
+        self.fig.canvas.manager.set_window_title('Projeto 4: Algoritmo Genético para N-Rainhas')
+        max_fitness_possivel = n_rainhas * (n_rainhas - 1) / 2
+
+        # Tabuleiro e rainhas: criados uma única vez
+        tabuleiro_fundo = np.indices((n_rainhas, n_rainhas)).sum(axis=0) % 2
+        self.ax_tabuleiro.imshow(tabuleiro_fundo, cmap='gray')
+        tamanho_rainha = max(2, 28 * 8 / n_rainhas)
+        self.rainhas, = self.ax_tabuleiro.plot([], [], linestyle='none', marker='$♛$',
+                                               markersize=tamanho_rainha, color='gold')
+        self.ax_tabuleiro.set_xticks([]); self.ax_tabuleiro.set_yticks([])
+
+        # Curva de fitness: uma única linha que cresce via set_data
+        self.linha_fitness, = self.ax_grafico.plot([], [], marker='o' if geracoes <= 200 else None, linestyle='-')
+        self.ax_grafico.set_title(f"Evolução do Fitness (Max: {max_fitness_possivel})")
+        self.ax_grafico.set_xlabel("Geração"); self.ax_grafico.set_ylabel("Melhor Fitness")
+        self.ax_grafico.set_xlim(0, geracoes); self.ax_grafico.set_ylim(0, max_fitness_possivel + 1)
+        self.ax_grafico.grid(True)
+        self.fig.tight_layout()
+
+    def atualizar(self, geracao, melhor_individuo, historico):
+        """Atualiza os artistas existentes com o estado mais recente da evolução."""
+        self.rainhas.set_data(range(self.n_rainhas), melhor_individuo)
+        self.ax_tabuleiro.set_title(f"Melhor Indivíduo | Geração: {geracao}")
+        self.linha_fitness.set_data(range(geracao + 1), historico[:geracao + 1])
+        self.fig.canvas.draw_idle()
+        self.fig.canvas.flush_events()
+
+    def aberto(self):
+        """Indica se a janela ainda não foi fechada pelo usuário."""
+        return plt.fignum_exists(self.fig.number)
+
+    def aguardar(self, segundos):
+        """Mantém a janela responsiva enquanto espera o próximo quadro."""
+        self.fig.canvas.start_event_loop(segundos)
+
+def algoritmo_genetico_visual(n_rainhas=8, tam_populacao=100, geracoes=500, taxa_mutacao=0.1,
+                              renderizar_a_cada=1, fps=30, semente=None,
+                              arquivo_checkpoint=None, checkpoint_a_cada_s=5.0,
+                              genoma='linhas', tipo_crossover=None, tipo_mutacao=None):
+    """
+    Executa o Algoritmo Genético com visualização gráfica.
+
+    A evolução roda em uma thread separada, em velocidade máxima; a thread principal
+    (exigida pelo matplotlib) apenas consome o estado mais recente, no máximo `fps`
+    vezes por segundo e a cada `renderizar_a_cada` gerações. Estados intermediários
+    que o desenho não acompanhar são descartados. Os parâmetros de semente e checkpoint
+    e de representação (genoma e operadores) são repassados para `algoritmo_genetico_headless`.
+    """
+    renderizador = RenderizadorGA(n_rainhas, geracoes)
+    caixa = queue.Queue(maxsize=1)
+    parar = threading.Event()
+    resultado = {}
+
+    def publicar(geracao, melhor_individuo, historico):
+        # Mantém apenas o quadro mais recente na caixa
+        try:
+            caixa.get_nowait()
+        except queue.Empty:
+            pass
+        caixa.put_nowait((geracao, melhor_individuo, historico))
+
+    def evoluir():
+        try:
+            resultado['saida'] = algoritmo_genetico_headless(n_rainhas, tam_populacao, geracoes, taxa_mutacao,
+                                                             publicar=publicar, publicar_a_cada=renderizar_a_cada,
+                                                             parar=parar, semente=semente,
+                                                             arquivo_checkpoint=arquivo_checkpoint,
+                                                             checkpoint_a_cada_s=checkpoint_a_cada_s,
+                                                             genoma=genoma, tipo_crossover=tipo_crossover,
+                                                             tipo_mutacao=tipo_mutacao)
+        except BaseException as erro:
+            # Repassado à thread principal (ex.: checkpoint de outra configuração)
+            resultado['erro'] = erro
+
+    produtor = threading.Thread(target=evoluir, daemon=True)
+    produtor.start()
+
+    intervalo_quadro = 1.0 / fps
+    try:
+        while (produtor.is_alive() or not caixa.empty()) and renderizador.aberto():
+            inicio_quadro = time.perf_counter()
+            try:
+                quadro = caixa.get(timeout=intervalo_quadro)
+            except queue.Empty:
+                continue
+            renderizador.atualizar(*quadro)
+            restante = intervalo_quadro - (time.perf_counter() - inicio_quadro)
+            if restante > 0:
+                renderizador.aguardar(restante)
+    finally:
+        # Se a janela for fechada ou houver interrupção, encerra a evolução
+        parar.set()
+        produtor.join()
+
+    if 'erro' in resultado:
+        raise resultado['erro']
     plt.ioff(); plt.show()
+    melhor_individuo, _ = resultado['saida']
     return melhor_individuo
 
 if __name__ == "__main__":
-    solucao = algoritmo_genetico_visual(n_rainhas=8, tam_populacao=100, geracoes=500, taxa_mutacao=0.1)
+    # 'visual' desenha a evolução; 'headless' roda em velocidade máxima, sem janela;
+    # 'steady_state' substitui poucos indivíduos por passo e reporta filhos avaliados/s
+    MODO_EXECUCAO = 'visual'
+    # Para execuções longas: defina um arquivo (ex.: 'ag.ckpt') e uma semente; se o
+    # processo cair, rodar de novo retoma do último checkpoint com a mesma trajetória
+    ARQUIVO_CHECKPOINT = None
+    SEMENTE = None
+    # 'linhas' (ponto único) ou 'permutacao' (PMX/OX, mutação por troca/inversão, fitness O(n))
+    GENOMA = 'linhas'
+
+    if MODO_EXECUCAO == 'steady_state':
+        solucao, historico, estatisticas = algoritmo_genetico_steady_state(n_rainhas=8, tam_populacao=100,
+                                                                           max_avaliacoes=50000, taxa_mutacao=0.1,
+                                                                           semente=SEMENTE, genoma=GENOMA)
+        print(f"{estatisticas['avaliacoes']} filhos avaliados em {estatisticas['tempo']:.3f} segundos "
+              f"({estatisticas['avaliacoes_por_segundo']:.0f} por segundo)")
+    elif MODO_EXECUCAO == 'headless':
+        tempo_inicial = time.perf_counter()
+        solucao, historico = algoritmo_genetico_headless(n_rainhas=8, tam_populacao=100, geracoes=500, taxa_mutacao=0.1,
+                                                         semente=SEMENTE, arquivo_checkpoint=ARQUIVO_CHECKPOINT, genoma=GENOMA)
+        print(f"{len(historico)} gerações em {time.perf_counter() - tempo_inicial:.3f} segundos")
+    else:
+        solucao = algoritmo_genetico_visual(n_rainhas=8, tam_populacao=100, geracoes=500, taxa_mutacao=0.1,
+                                            renderizar_a_cada=1, fps=30,
+                                            semente=SEMENTE, arquivo_checkpoint=ARQUIVO_CHECKPOINT, genoma=GENOMA)
     ataques_finais = (8*7/2) - calcular_fitness(solucao)
     print(f"\nBusca concluída. Melhor indivíduo com {int(ataques_finais)} ataques.")
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+PROJETO 4 (ANÁLISE): ALGORITMO GENÉTICO - GENOMA DE LINHAS vs. GENOMA DE PERMUTAÇÃO
+
+Executa o Algoritmo Genético sem visualização para vários tamanhos de tabuleiro e mede,
+para cada representação, quantas gerações e quanto tempo de relógio são necessários
+até encontrar uma solução.
+"""
+import threading
+import time
+
+from algoritmo_genetico import algoritmo_genetico_headless
+
+# --- FUNÇÃO DE ANÁLISE (BANCADA DE TESTES) ---
+
+def medir_ate_solucao(n_rainhas, n_execucoes, limite_segundos, **kwargs):
+    """Executa o AG N vezes e retorna (sucessos, gerações médias, tempo médio) das execuções resolvidas."""
+    max_fitness_possivel = n_rainhas * (n_rainhas - 1) // 2
+    sucessos = 0
+    geracoes_total = 0
+    tempo_total = 0.0
+
+    for execucao in range(n_execucoes):
+        # O limite de tempo usa o mesmo Event que a visualização usa para interromper a evolução
+        parar = threading.Event()
+        cronometro = threading.Timer(limite_segundos, parar.set)
+        cronometro.start()
+        tempo_inicial = time.perf_counter()
+        _, historico = algoritmo_genetico_headless(n_rainhas=n_rainhas, parar=parar, semente=execucao,
+                                                   verboso=False, **kwargs)
+        tempo_execucao = time.perf_counter() - tempo_inicial
+        cronometro.cancel()
+
+        if historico[-1] == max_fitness_possivel:
+            sucessos += 1
+            geracoes_total += len(historico)
+            tempo_total += tempo_execucao
+
+    if sucessos == 0:
+        return 0, None, None
+    return sucessos, geracoes_total / sucessos, tempo_total / sucessos
+
+def executar_analise(nome, tamanhos, n_execucoes, limite_segundos, **kwargs):
+    """Imprime uma tabela com gerações e tempo até a solução para cada tamanho de tabuleiro."""
+    print(f"\n--- Genoma: {nome.upper()} ---")
+    print(f"{'N':>6} | {'Sucessos':>9} | {'Gerações (média)':>17} | {'Tempo médio (s)':>16}")
+    for n_rainhas in tamanhos:
+        sucessos, geracoes_media, tempo_medio = medir_ate_solucao(n_rainhas, n_execucoes, limite_segundos, **kwargs)
+        if sucessos:
+            print(f"{n_rainhas:>6} | {sucessos:>4}/{n_execucoes:<4} | {geracoes_media:>17.1f} | {tempo_medio:>16.3f}")
+        else:
+            print(f"{n_rainhas:>6} | {sucessos:>4}/{n_execucoes:<4} | {'-':>17} | {'-':>16}")
+
+# --- BLOCO PRINCIPAL DE EXECUÇÃO ---
+
+if __name__ == "__main__":
+    TAMANHOS = [8, 16, 32, 64, 128, 256, 512, 1000]
+    NUM_EXECUCOES = 3
+    LIMITE_SEGUNDOS = 120.0  # por execução
+
+    params_comuns = {'tam_populacao': 100, 'geracoes': 100000}
+
+    executar_analise('linhas (ponto único + mutação aleatória)', TAMANHOS, NUM_EXECUCOES, LIMITE_SEGUNDOS,
+                     genoma='linhas', taxa_mutacao=0.1, **params_comuns)
+    executar_analise('permutação (PMX + troca)', TAMANHOS, NUM_EXECUCOES, LIMITE_SEGUNDOS,
+                     genoma='permutacao', tipo_crossover='pmx', tipo_mutacao='troca', taxa_mutacao=0.5, **params_comuns)
+    executar_analise('permutação (OX + inversão)', TAMANHOS, NUM_EXECUCOES, LIMITE_SEGUNDOS,
+                     genoma='permutacao', tipo_crossover='ox', tipo_mutacao='inversao', taxa_mutacao=0.5, **params_comuns)
@@ -3,97 +3,357 @@ PROJETO 6: AGENTE BASEADO EM CONHECIMENTO - O MUNDO DE WUMPUS (VISUAL)
 
 Esta versão implementa o agente lógico com uma interface gráfica que mostra
 o conteúdo de sua Base de Conhecimento (KB) sendo construída passo a passo.
+
+A KB é proposicional: os fatos viram cláusulas em CNF de um solucionador SAT
+incremental (`solucionador_sat.py`), que deriva poços e o Wumpus a partir das brisas
+e dos fedores. As respostas ficam em grades booleanas NumPy indexadas pela casa, e
+tell/ask com strings como "~P_1,1" continuam disponíveis. A inferência é incremental:
+só as casas ligadas aos fatos novos são reavaliadas, e as casas seguras ainda não
+visitadas ficam em uma fronteira.
 """
+import heapq
 import random
 import time
+import numpy as np
 import matplotlib
-matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 
+from solucionador_sat import SolucionadorSAT
+
+def casas_adjacentes(pos, tamanho):
+    x, y = pos
+    adj = []
+    if x > 1: adj.append((x - 1, y))
+    if x < tamanho: adj.append((x + 1, y))
+    if y > 1: adj.append((x, y - 1))
+    if y < tamanho: adj.append((x, y + 1))
+    return adj
+
+# --- BASE DE CONHECIMENTO (CNF + SAT) ---
+class BaseConhecimento:
+    """
+    KB proposicional sobre as variáveis P_x,y (poço) e W_x,y (Wumpus), criadas sob demanda.
+    Cada fato vira cláusulas em um solucionador SAT incremental (CDCL):
+    - '~P', '~W', 'P', 'W': cláusulas unitárias; 'OK': ~P e ~W;
+    - 'B' (brisa): algum vizinho tem poço; 'S' (fedor): algum vizinho tem o Wumpus;
+    - há exatamente um Wumpus: no primeiro fedor, ele fica restrito aos vizinhos dessa
+      casa (no máximo um deles, e nenhuma outra casa).
+    consultar('~P', pos) e os demais predicados derivados perguntam se a KB implica o
+    fato, só no componente conexo de cláusulas da variável; as respostas positivas
+    ficam em grades booleanas por predicado, já que a KB só cresce. 'B' e 'S' são
+    percepções e também ficam em grades. tell/ask aceitam os fatos em texto ("~P_1,1").
+    """
+    PREDICADOS = ('OK', '~P', '~W', 'B', 'S', 'P', 'W')
+
+    def __init__(self, tamanho):
+        self.tamanho = tamanho
+        self.grades = {predicado: np.zeros((tamanho + 2, tamanho + 2), dtype=bool) for predicado in self.PREDICADOS}
+        self.outros = set()  # fatos em texto fora do formato PREDICADO_x,y
+        self.sat = SolucionadorSAT()
+        self.variaveis = {}  # ('P' ou 'W', casa) -> variável do solucionador
+        self.casa_da_variavel = [None]
+        self.representante = [0]  # union-find dos componentes de cláusulas
+        self.membros = [None]
+        self.candidatos_wumpus = None
+        self.alteradas = set()  # casas cujo conhecimento derivado pode ter mudado
+
+    # --- Variáveis, Cláusulas e Componentes ---
+
+    def _variavel(self, tipo, pos):
+        variavel = self.variaveis.get((tipo, pos))
+        if variavel is None:
+            variavel = self.variaveis[(tipo, pos)] = self.sat.nova_variavel()
+            self.casa_da_variavel.append(pos)
+            self.representante.append(variavel)
+            self.membros.append([variavel])
+            if tipo == 'W' and self.candidatos_wumpus is not None and pos not in self.candidatos_wumpus:
+                self.sat.adicionar_clausula([-variavel])
+        return variavel
+
+    def _raiz(self, variavel):
+        while self.representante[variavel] != variavel:
+            self.representante[variavel] = self.representante[self.representante[variavel]]
+            variavel = self.representante[variavel]
+        return variavel
+
+    def _adicionar_clausula(self, literais):
+        """Adiciona a cláusula, une os componentes das suas variáveis e marca as casas afetadas."""
+        self.sat.adicionar_clausula(literais)
+        raiz = self._raiz(abs(literais[0]))
+        for literal in literais[1:]:
+            outra = self._raiz(abs(literal))
+            if outra != raiz:
+                if len(self.membros[outra]) > len(self.membros[raiz]):
+                    raiz, outra = outra, raiz
+                self.representante[outra] = raiz
+                self.membros[raiz] += self.membros[outra]
+                self.membros[outra] = None
+        self.alteradas.update(self.casa_da_variavel[variavel] for variavel in self.membros[raiz])
+
+    def extrair_alteradas(self):
+        """Casas ligadas por cláusulas aos fatos novos desde a última chamada (e esvazia a lista)."""
+        alteradas, self.alteradas = self.alteradas, set()
+        return alteradas
+
+    def _implica(self, literal):
+        return self.sat.implica(literal, self.membros[self._raiz(abs(literal))])
+
+    # --- Fatos ---
+
+    def afirmar(self, predicado, pos):
+        """Registra o fato e retorna True se ele é novo."""
+        grade = self.grades[predicado]
+        if grade[pos]: return False
+        grade[pos] = True
+        if predicado in ('B', 'S'):
+            tipo = 'P' if predicado == 'B' else 'W'
+            adjacentes = casas_adjacentes(pos, self.tamanho)
+            if predicado == 'S' and self.candidatos_wumpus is None:
+                self._localizar_wumpus(adjacentes)
+            self._adicionar_clausula([self._variavel(tipo, adj) for adj in adjacentes])
+        elif predicado == 'OK':
+            self._adicionar_clausula([-self._variavel('P', pos)])
+            self._adicionar_clausula([-self._variavel('W', pos)])
+        else:
+            variavel = self._variavel(predicado[-1], pos)
+            self._adicionar_clausula([-variavel if predicado.startswith('~') else variavel])
+        return True
+
+    def _localizar_wumpus(self, candidatos):
+        # Exatamente um Wumpus: no máximo um entre os candidatos e nenhum nas outras casas
+        self.candidatos_wumpus = set(candidatos)
+        for i, a in enumerate(candidatos):
+            for b in candidatos[i + 1:]:
+                self._adicionar_clausula([-self._variavel('W', a), -self._variavel('W', b)])
+        for (tipo, pos), variavel in list(self.variaveis.items()):
+            if tipo == 'W' and pos not in self.candidatos_wumpus:
+                self._adicionar_clausula([-variavel])
+
+    def consultar(self, predicado, pos):
+        """Percepções ('B', 'S') são lidas da grade; os demais predicados são implicações da KB."""
+        grade = self.grades[predicado]
+        if grade[pos] or predicado in ('B', 'S'):
+            return bool(grade[pos])
+        if predicado == 'OK':
+            implicado = self.consultar('~P', pos) and self.consultar('~W', pos)
+        else:
+            tipo = predicado[-1]
+            if (tipo, pos) not in self.variaveis and not (tipo == 'W' and self.candidatos_wumpus is not None):
+                return False  # nenhuma cláusula fala dessa casa
+            variavel = self._variavel(tipo, pos)
+            implicado = self._implica(-variavel if predicado.startswith('~') else variavel)
+        if implicado:
+            grade[pos] = True
+        return implicado
+
+    def interpretar(self, fato):
+        """ "~P_1,2" -> ('~P', (1, 2)); None se o fato não for um predicado conhecido em uma casa do mundo."""
+        predicado, _, coordenadas = fato.rpartition('_')
+        x, _, y = coordenadas.partition(',')
+        if predicado in self.grades and x.isdigit() and y.isdigit():
+            pos = (int(x), int(y))
+            if 1 <= pos[0] <= self.tamanho and 1 <= pos[1] <= self.tamanho:
+                return predicado, pos
+        return None
+
+    def tell(self, fato):
+        interpretado = self.interpretar(fato)
+        if interpretado is None: self.outros.add(fato)
+        else: self.afirmar(*interpretado)
+
+    def ask(self, query):
+        interpretado = self.interpretar(query)
+        return query in self.outros if interpretado is None else self.consultar(*interpretado)
+
+# --- INFERÊNCIA PROBABILÍSTICA (Fronteira) ---
+def componentes_restricoes(restricoes):
+    """Agrupa as restrições de brisa (conjuntos de casas) que compartilham casas, por union-find."""
+    representante = {}
+    def raiz(casa):
+        while representante[casa] != casa:
+            representante[casa] = representante[representante[casa]]
+            casa = representante[casa]
+        return casa
+    for restricao in restricoes:
+        casas = list(restricao)
+        for casa in casas: representante.setdefault(casa, casa)
+        for casa in casas[1:]: representante[raiz(casa)] = raiz(casas[0])
+    grupos = {}
+    for restricao in restricoes:
+        grupos.setdefault(raiz(next(iter(restricao))), []).append(restricao)
+    return list(grupos.values())
+
+def enumerar_pocos(restricoes, prob_poco):
+    """
+    Probabilidade de poço em cada casa de um componente, enumerando só os modelos das
+    suas casas: cada restrição exige ao menos um poço entre as suas casas, e os poços
+    são independentes com probabilidade `prob_poco`. A busca poda as atribuições que já
+    deixaram uma restrição sem poço.
+    """
+    casas = sorted(set().union(*restricoes))
+    indice = {casa: i for i, casa in enumerate(casas)}
+    # Restrições pelo índice da sua última casa: é onde elas são verificadas
+    verificar = [[] for _ in casas]
+    for restricao in restricoes:
+        indices = [indice[casa] for casa in restricao]
+        verificar[max(indices)].append(indices)
+    atribuicao = [False] * len(casas)
+    pesos_poco = [0.0] * len(casas)
+    total = 0.0
+
+    def enumerar(i, peso):
+        nonlocal total
+        if i == len(casas):
+            total += peso
+            for j, poco in enumerate(atribuicao):
+                if poco: pesos_poco[j] += peso
+            return
+        for poco, fator in ((True, prob_poco), (False, 1 - prob_poco)):
+            atribuicao[i] = poco
+            if all(any(atribuicao[j] for j in indices) for indices in verificar[i]):
+                enumerar(i + 1, peso * fator)
+        atribuicao[i] = False
+
+    enumerar(0, 1.0)
+    return {casa: pesos_poco[i] / total for i, casa in enumerate(casas)}
+
 # --- CLASSE DO AGENTE (Lógica de Raciocínio) ---
 class AgenteWumpus:
-    def __init__(self, tamanho_mundo=4):
+    def __init__(self, tamanho_mundo=4, modo_probabilistico=False, prob_poco=0.2, risco_maximo=1.0):
         self.tamanho = tamanho_mundo
         self.posicao = (1, 1)
         self.visitados = set()
-        self.kb = set()
-        self.tell(f"OK_1,1")
-        self.tell(f"~P_1,1")
-        self.tell(f"~W_1,1")
+        self.kb = BaseConhecimento(tamanho_mundo)
+        self.fronteira = set()  # casas OK ainda não visitadas
+        self.heap_fronteira = []  # as mesmas casas em ordem (x, y); entradas visitadas saem ao chegar ao topo
+        self.kb.afirmar('OK', (1, 1))
+        # Modo probabilístico: sem casa OK, arrisca a casa da borda com menor chance de perigo
+        self.modo_probabilistico = modo_probabilistico
+        self.prob_poco = prob_poco
+        self.risco_maximo = risco_maximo  # acima desse risco o agente para em vez de arriscar
+        self.borda = set()  # casas não visitadas vizinhas de casas visitadas
+        self.brisas = set()  # casas visitadas com brisa, enquanto a sua restrição estiver em aberto
+        self.cache_componentes = {}  # restrições de um componente -> probabilidades de poço
+        self.riscos = {}  # última estimativa de perigo por casa da borda
 
-    def tell(self, fato): self.kb.add(fato)
-    def ask(self, query): return query in self.kb
+    def tell(self, fato): self.kb.tell(fato)
+    def ask(self, query): return self.kb.ask(query)
 
     def obter_adjacentes(self, pos):
-        x, y = pos
-        adj = []
-        if x > 1: adj.append((x - 1, y))
-        if x < self.tamanho: adj.append((x + 1, y))
-        if y > 1: adj.append((x, y - 1))
-        if y < self.tamanho: adj.append((x, y + 1))
-        return adj
+        return casas_adjacentes(pos, self.tamanho)
 
     def atualizar_kb_percepcoes(self, percepcoes):
-        x, y = self.posicao
         # Inferência a partir da AUSÊNCIA de percepções
         if 'Brisa' not in percepcoes:
-            for ax, ay in self.obter_adjacentes(self.posicao):
-                self.tell(f"~P_{ax},{ay}")
+            for adj in self.obter_adjacentes(self.posicao):
+                self.kb.afirmar('~P', adj)
         if 'Fedor' not in percepcoes:
-            for ax, ay in self.obter_adjacentes(self.posicao):
-                self.tell(f"~W_{ax},{ay}")
+            for adj in self.obter_adjacentes(self.posicao):
+                self.kb.afirmar('~W', adj)
 
-        # Adiciona percepções POSITIVAS à KB
-        if 'Brisa' in percepcoes: self.tell(f"B_{x},{y}")
-        if 'Fedor' in percepcoes: self.tell(f"S_{x},{y}")
+        # Percepções POSITIVAS viram cláusulas: algum vizinho tem poço / o Wumpus
+        if 'Brisa' in percepcoes:
+            self.kb.afirmar('B', self.posicao)
+            self.brisas.add(self.posicao)
+        if 'Fedor' in percepcoes: self.kb.afirmar('S', self.posicao)
 
     def inferir_casas_seguras(self):
-        # Percorre todo o mundo conhecido para fazer novas inferências
-        for x in range(1, self.tamanho + 1):
-            for y in range(1, self.tamanho + 1):
-                # Se uma casa é segura, não pode ter poço nem Wumpus
-                if self.ask(f"~P_{x},{y}") and self.ask(f"~W_{x},{y}"):
-                    self.tell(f"OK_{x},{y}")
-                # Lógica de inferência por resolução (simplificada)
-                # Se sinto brisa em (x,y) e sei que um vizinho é seguro de poços, o outro PODE ter um poço.
-                if self.ask(f"B_{x},{y}"):
-                    adjacentes = self.obter_adjacentes((x,y))
-                    adjacentes_desconhecidos = [p for p in adjacentes if not self.ask(f"~P_{p[0]},{p[1]}")]
-                    if len(adjacentes_desconhecidos) == 1:
-                        px, py = adjacentes_desconhecidos[0]
-                        # Se só resta uma possibilidade, inferimos que o poço está lá
-                        # (Este agente cauteloso não usa essa informação para agir, mas a armazena)
-                        # self.tell(f"P_{px},{py}")
+        # Só as casas ligadas por cláusulas aos fatos novos podem ter mudado (lista de trabalho)
+        for pos in self.kb.extrair_alteradas():
+            if pos in self.visitados or pos in self.fronteira:
+                continue
+            # A casa é segura se a KB implica que ela não tem poço nem Wumpus
+            if self.kb.consultar('OK', pos):
+                self.fronteira.add(pos)
+                heapq.heappush(self.heap_fronteira, pos)
+
+    def probabilidades_poco(self):
+        """
+        Chance de poço nas casas da borda sob as restrições de brisa abertas. Só as casas
+        ainda incertas entram, separadas em componentes independentes que são enumerados
+        exatamente e guardados em cache; as demais casas da borda ficam com a priori.
+        """
+        restricoes = []
+        for brisa in list(self.brisas):
+            adjacentes = self.obter_adjacentes(brisa)
+            if any(self.kb.consultar('P', adj) for adj in adjacentes):
+                self.brisas.discard(brisa)  # restrição já satisfeita por um poço conhecido
+                continue
+            restricoes.append(frozenset(adj for adj in adjacentes if not self.kb.consultar('~P', adj)))
+        probabilidades = {}
+        for componente in componentes_restricoes(list(set(restricoes))):
+            chave = frozenset(componente)
+            if chave not in self.cache_componentes:
+                self.cache_componentes[chave] = enumerar_pocos(componente, self.prob_poco)
+            probabilidades.update(self.cache_componentes[chave])
+        return probabilidades
+
+    def probabilidades_wumpus(self):
+        """O Wumpus é uniforme entre as casas ainda possíveis (exceto (1,1)), pois há exatamente um."""
+        kb = self.kb
+        candidatos = kb.candidatos_wumpus
+        if candidatos is None:
+            # Nenhum fedor ainda: possíveis são todas as casas sem ~W conhecido ((1,1) é OK)
+            interior = (slice(1, -1), slice(1, -1))
+            descartadas = np.count_nonzero(kb.grades['~W'][interior] | kb.grades['OK'][interior])
+            possiveis = self.tamanho * self.tamanho - descartadas
+            return {}, 1 / possiveis
+        possiveis = [casa for casa in candidatos if not kb.consultar('~W', casa)]
+        return {casa: 1 / len(possiveis) for casa in possiveis}, 0.0
+
+    def calcular_riscos(self):
+        """Probabilidade de poço ou Wumpus em cada casa da borda (eventos independentes dadas as percepções)."""
+        prob_poco = self.probabilidades_poco()
+        prob_wumpus, prob_wumpus_padrao = self.probabilidades_wumpus()
+        self.riscos = {}
+        for casa in self.borda:
+            if self.kb.consultar('P', casa) or self.kb.consultar('W', casa):
+                self.riscos[casa] = 1.0
+                continue
+            poco = 0.0 if self.kb.consultar('~P', casa) else prob_poco.get(casa, self.prob_poco)
+            wumpus = 0.0 if self.kb.consultar('~W', casa) else prob_wumpus.get(casa, prob_wumpus_padrao)
+            self.riscos[casa] = 1 - (1 - poco) * (1 - wumpus)
+        return self.riscos
 
     def decidir_proxima_acao(self, percepcoes):
         self.visitados.add(self.posicao)
+        self.fronteira.discard(self.posicao)
+        self.borda.discard(self.posicao)
+        self.borda.update(adj for adj in self.obter_adjacentes(self.posicao) if adj not in self.visitados)
+        self.kb.afirmar('OK', self.posicao)  # o agente sobreviveu à casa
         self.atualizar_kb_percepcoes(percepcoes)
         self.inferir_casas_seguras()
-        
-        casas_seguras_para_ir = []
-        for x in range(1, self.tamanho + 1):
-            for y in range(1, self.tamanho + 1):
-                if self.ask(f"OK_{x},{y}") and (x, y) not in self.visitados:
-                    casas_seguras_para_ir.append((x, y))
-        
-        if not casas_seguras_para_ir:
-            return None
-        else:
-            self.posicao = casas_seguras_para_ir[0]
+
+        # Primeira casa da fronteira na ordem (x, y) crescente
+        heap = self.heap_fronteira
+        while heap and heap[0] not in self.fronteira:
+            heapq.heappop(heap)
+        if heap:
+            self.posicao = heap[0]
             return self.posicao
+        if not self.modo_probabilistico or not self.borda:
+            return None
+        # Nenhuma casa provadamente segura: arrisca a de menor risco (empates na ordem (x, y))
+        riscos = self.calcular_riscos()
+        casa = min(riscos, key=lambda casa: (riscos[casa], casa))
+        if riscos[casa] > self.risco_maximo:
+            return None
+        self.posicao = casa
+        return self.posicao
 
 # --- CLASSE DO AMBIENTE (Simulação) ---
 class MundoWumpus:
-    def __init__(self, tamanho=4):
+    def __init__(self, tamanho=4, semente=None):
         self.tamanho = tamanho
-        self.wumpus = (random.randint(1, tamanho), random.randint(1, tamanho))
-        while self.wumpus == (1, 1): self.wumpus = (random.randint(1, tamanho), random.randint(1, tamanho))
-        self.pocos = []
+        gerador = random if semente is None else random.Random(semente)  # semente: mundo reprodutível
+        self.wumpus = (gerador.randint(1, tamanho), gerador.randint(1, tamanho))
+        while self.wumpus == (1, 1): self.wumpus = (gerador.randint(1, tamanho), gerador.randint(1, tamanho))
+        self.pocos = set()  # conjunto: consulta em O(1) mesmo em mundos grandes
         for x in range(1, tamanho + 1):
             for y in range(1, tamanho + 1):
-                if (x, y) != (1, 1) and random.random() < 0.2:
-                    self.pocos.append((x, y))
+                if (x, y) != (1, 1) and gerador.random() < 0.2:
+                    self.pocos.add((x, y))
     
     def obter_percepcoes(self, pos):
         percepcoes = []
@@ -105,12 +365,7 @@ class MundoWumpus:
         return percepcoes
 
     def _obter_adjacentes(self, pos):
-        x, y = pos; adj = []
-        if x > 1: adj.append((x - 1, y))
-        if x < self.tamanho: adj.append((x + 1, y))
-        if y > 1: adj.append((x, y - 1))
-        if y < self.tamanho: adj.append((x, y + 1))
-        return adj
+        return casas_adjacentes(pos, self.tamanho)
 
 # --- LÓGICA DE VISUALIZAÇÃO ---
 def preparar_visualizacao(tamanho):
@@ -141,26 +396,30 @@ def desenhar_passo_agente(ax, agente, percepcoes, passo):
     ax.grid(True)
     ax.set_xlim(0.5, agente.tamanho + 0.5); ax.set_ylim(0.5, agente.tamanho + 0.5)
 
+    kb = agente.kb
     for x in range(1, agente.tamanho + 1):
         for y in range(1, agente.tamanho + 1):
             textos = []
             cor_fundo = 'white'
             if (x,y) in agente.visitados:
                 cor_fundo = 'lightgray'
-                if agente.ask(f"B_{x},{y}"): textos.append("Brisa")
-                if agente.ask(f"S_{x},{y}"): textos.append("Fedor")
+                if kb.consultar('B', (x, y)): textos.append("Brisa")
+                if kb.consultar('S', (x, y)): textos.append("Fedor")
             
-            if agente.ask(f"OK_{x},{y}") and (x,y) not in agente.visitados:
+            if kb.consultar('OK', (x, y)) and (x,y) not in agente.visitados:
                 textos.append("OK")
                 cor_fundo = 'lightgreen'
 
-            if not agente.ask(f"OK_{x},{y}") and (x,y) not in agente.visitados:
+            if not kb.consultar('OK', (x, y)) and (x,y) not in agente.visitados:
                  # Lógica de incerteza
                  adjacentes_visitados = [p for p in agente.obter_adjacentes((x,y)) if p in agente.visitados]
-                 if any(agente.ask(f"B_{p[0]},{p[1]}") for p in adjacentes_visitados):
-                     if not agente.ask(f"~P_{x},{y}"): textos.append("P?")
-                 if any(agente.ask(f"S_{p[0]},{p[1]}") for p in adjacentes_visitados):
-                     if not agente.ask(f"~W_{x},{y}"): textos.append("W?")
+                 if kb.consultar('P', (x, y)): textos.append("P!")
+                 elif any(kb.consultar('B', p) for p in adjacentes_visitados):
+                     if not kb.consultar('~P', (x, y)): textos.append("P?")
+                 if kb.consultar('W', (x, y)): textos.append("W!")
+                 elif any(kb.consultar('S', p) for p in adjacentes_visitados):
+                     if not kb.consultar('~W', (x, y)): textos.append("W?")
+                 if (x, y) in agente.riscos: textos.append(f"risco {agente.riscos[(x, y)]:.2f}")
 
             # Desenha o fundo da célula
             rect = patches.Rectangle((x-0.5, y-0.5), 1, 1, facecolor=cor_fundo, zorder=1)
@@ -175,9 +434,13 @@ def desenhar_passo_agente(ax, agente, percepcoes, passo):
 
 # --- EXECUÇÃO PRINCIPAL ---
 if __name__ == "__main__":
+    matplotlib.use('TkAgg')  # só na execução visual; a simulação em lote roda sem janela
     TAMANHO_MUNDO = 4
+    MODO_PROBABILISTICO = False  # True: sem casa provadamente segura, arrisca a de menor risco
+    RISCO_MAXIMO = 0.25  # no modo probabilístico, para se todas as casas forem mais arriscadas
     mundo = MundoWumpus(tamanho=TAMANHO_MUNDO)
-    agente = AgenteWumpus(tamanho_mundo=TAMANHO_MUNDO)
+    agente = AgenteWumpus(tamanho_mundo=TAMANHO_MUNDO, modo_probabilistico=MODO_PROBABILISTICO,
+                          risco_maximo=RISCO_MAXIMO)
     
     fig, (ax_agente, ax_verdade) = preparar_visualizacao(TAMANHO_MUNDO)
     desenhar_mundo(ax_verdade, TAMANHO_MUNDO, mundo, "Mapa da Verdade (Realidade)")
@@ -0,0 +1,114 @@
+"""
+PROJETO 6 (ANÁLISE): SIMULAÇÃO EM LOTE DO AGENTE NO MUNDO DE WUMPUS
+
+Roda milhares de episódios sem interface gráfica, em mundos gerados com semente
+(`MundoWumpus(tamanho, semente)`), distribuídos em um pool de processos. Para cada
+modo do agente e tamanho de mundo, agrega a taxa de sobrevivência, as casas
+exploradas, os passos e a latência de cada decisão. O resultado vai para um arquivo
+JSON Lines compacto (cabeçalho com o resumo e uma linha por episódio), para comparar
+versões do agente nos mesmos mundos.
+"""
+import importlib.util
+import json
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+# O módulo do agente tem hífen no nome e não pode ser importado com `import`
+_especificacao = importlib.util.spec_from_file_location(
+    'base_conhecimento', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'base-conhecimento.py'))
+base_conhecimento = importlib.util.module_from_spec(_especificacao)
+_especificacao.loader.exec_module(base_conhecimento)
+
+# nome -> parâmetros do agente
+MODOS = {
+    'logico': {'modo_probabilistico': False},
+    'cauteloso': {'modo_probabilistico': True, 'risco_maximo': 0.25},
+    'arriscado': {'modo_probabilistico': True, 'risco_maximo': 1.0},
+}
+COLUNAS = ('modo', 'tamanho', 'semente', 'sobreviveu', 'casas', 'passos', 'latencias_us')  # uma latência por decisão
+
+def simular_episodio(tarefa):
+    """Um episódio completo; termina na morte, sem próxima ação ou no limite de passos."""
+    modo, tamanho, semente, max_passos = tarefa
+    mundo = base_conhecimento.MundoWumpus(tamanho, semente=semente)
+    agente = base_conhecimento.AgenteWumpus(tamanho, **MODOS[modo])
+    latencias = []
+    sobreviveu = True
+    for _ in range(max_passos):
+        percepcoes = mundo.obter_percepcoes(agente.posicao)
+        if 'MORTE' in percepcoes:
+            sobreviveu = False
+            break
+        inicio = time.perf_counter()
+        proximo = agente.decidir_proxima_acao(percepcoes)
+        latencias.append(time.perf_counter() - inicio)
+        if proximo is None:
+            break
+    # Casas visitadas com vida; a casa em que o agente morreu não conta
+    return (modo, tamanho, semente, sobreviveu, len(agente.visitados), len(latencias),
+            [round(1e6 * latencia) for latencia in latencias])
+
+def agregar(episodios):
+    """Resumo por (modo, tamanho)."""
+    grupos = {}
+    for episodio in episodios:
+        grupos.setdefault((episodio[0], episodio[1]), []).append(episodio)
+    resumo = []
+    for (modo, tamanho), grupo in sorted(grupos.items()):
+        casas = np.array([e[4] for e in grupo])
+        passos = np.array([e[5] for e in grupo])
+        latencias = np.concatenate([e[6] for e in grupo]) / 1e3  # todas as decisões do grupo, em ms
+        resumo.append({
+            'modo': modo, 'tamanho': tamanho, 'episodios': len(grupo),
+            'sobrevivencia': round(sum(e[3] for e in grupo) / len(grupo), 4),
+            'casas_media': round(float(casas.mean()), 2),
+            'casas_fracao': round(float(casas.mean()) / (tamanho * tamanho), 4),
+            'passos_media': round(float(passos.mean()), 2),
+            'latencia_media_ms': round(float(latencias.mean()), 4),
+            'latencia_p95_ms': round(float(np.percentile(latencias, 95)), 4),
+            'latencia_max_ms': round(float(latencias.max()), 4),
+        })
+    return resumo
+
+def executar_simulacao(modos, tamanhos, episodios, max_passos, processos, semente_base, rotulo, arquivo_saida):
+    tarefas = [(modo, tamanho, semente_base + i, max_passos)
+               for modo in modos for tamanho in tamanhos for i in range(episodios)]
+    inicio = time.time()
+    with Pool(processos) as pool:
+        resultados = sorted(pool.imap_unordered(simular_episodio, tarefas, chunksize=32))
+    duracao = time.time() - inicio
+
+    resumo = agregar(resultados)
+    print(f"{'Modo':<14} | {'Tamanho':>7} | {'Sobrev.':>7} | {'Casas':>7} | {'% mundo':>7} | {'Passos':>7} | "
+          f"{'Lat. média (ms)':>15} | {'Lat. p95 (ms)':>13} | {'Lat. máx (ms)':>13}")
+    for linha in resumo:
+        print(f"{linha['modo']:<14} | {linha['tamanho']:>7} | {linha['sobrevivencia']:>7.1%} | "
+              f"{linha['casas_media']:>7.1f} | {linha['casas_fracao']:>7.1%} | {linha['passos_media']:>7.1f} | "
+              f"{linha['latencia_media_ms']:>15.3f} | {linha['latencia_p95_ms']:>13.3f} | {linha['latencia_max_ms']:>13.3f}")
+    print(f"{len(resultados)} episódios em {duracao:.1f} s com {processos} processos")
+
+    # Mundos com as mesmas sementes: arquivos de versões diferentes do agente são comparáveis episódio a episódio
+    with open(arquivo_saida, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(json.dumps({'rotulo': rotulo, 'episodios_por_grupo': episodios, 'max_passos': max_passos,
+                                  'semente_base': semente_base, 'resumo': resumo, 'colunas': COLUNAS},
+                                 ensure_ascii=False) + '\n')
+        for episodio in resultados:
+            arquivo.write(json.dumps(episodio, ensure_ascii=False, separators=(',', ':')) + '\n')
+    print(f"Resultados em {arquivo_saida}")
+
+# --- BLOCO PRINCIPAL DE EXECUÇÃO ---
+
+if __name__ == "__main__":
+    ROTULO = 'sat-probabilistico'  # identifica a versão do agente no arquivo de resultados
+    SEMENTE_BASE = 0
+    EPISODIOS = 2000  # por modo e tamanho
+    TAMANHOS = [4, 8, 16]
+    MAX_PASSOS = 1000
+    PROCESSOS = os.cpu_count() or 1
+    ARQUIVO_SAIDA = f"resultados_wumpus_{ROTULO}.jsonl"
+
+    print(f"--- Simulação em lote: {EPISODIOS} episódios por modo e tamanho ---")
+    executar_simulacao(list(MODOS), TAMANHOS, EPISODIOS, MAX_PASSOS, PROCESSOS, SEMENTE_BASE, ROTULO, ARQUIVO_SAIDA)
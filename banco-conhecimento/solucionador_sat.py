@@ -0,0 +1,309 @@
+"""
+PROJETO 6 (MOTOR): SOLUCIONADOR SAT INCREMENTAL (CDCL)
+
+Motor de inferência proposicional da Base de Conhecimento do Mundo de Wumpus.
+As cláusulas estão em CNF, com literais inteiros como no formato DIMACS (v ou -v).
+- propagação unitária com dois literais observados por cláusula;
+- aprendizado de cláusulas no primeiro ponto de implicação única (1-UIP), com
+  retrocesso não cronológico;
+- heurística de atividade (VSIDS), memória de fase e reinícios;
+- consultas com suposições: as cláusulas aprendidas em uma consulta continuam valendo
+  nas seguintes, e novas cláusulas podem ser adicionadas entre consultas.
+"""
+import heapq
+
+class Clausula:
+    __slots__ = ('literais', 'aprendida', 'removida')
+
+    def __init__(self, literais, aprendida=False):
+        self.literais = literais
+        self.aprendida = aprendida
+        self.removida = False
+
+class SolucionadorSAT:
+    """
+    Solucionador CDCL incremental. Entre chamadas fica sempre no nível de decisão 0,
+    em que só estão as atribuições implicadas pelas cláusulas.
+    """
+    def __init__(self, max_aprendidas=5000):
+        self.num_variaveis = 0
+        # Por variável (índice 0 não usado): valor (1, -1 ou 0), nível, cláusula razão, atividade e fase salva
+        self.valores = [0]
+        self.niveis = [0]
+        self.razoes = [None]
+        self.atividades = [0.0]
+        self.fases = [-1]
+        # Cláusulas que observam cada literal, no índice 2 * variável + (literal < 0)
+        self.observadores = [[], []]
+        self.clausulas = []
+        self.aprendidas = []
+        self.trilha = []
+        self.inicios_nivel = []  # posição da trilha em que cada nível de decisão começa
+        self.propagados = 0
+        self.heap = []  # (-atividade, variável), com entradas antigas descartadas ao sair
+        self.decidindo_no_heap = True  # False em consultas restritas a `variaveis`, que não usam o heap
+        self.incremento = 1.0
+        self.max_aprendidas = max_aprendidas
+        self.inconsistente = False
+        self.estatisticas = {'consultas': 0, 'decisoes': 0, 'propagacoes': 0, 'conflitos': 0,
+                             'aprendidas': 0, 'reinicios': 0}
+
+    # --- Variáveis e Cláusulas ---
+
+    def nova_variavel(self):
+        self.num_variaveis += 1
+        for lista, inicial in ((self.valores, 0), (self.niveis, 0), (self.razoes, None),
+                               (self.atividades, 0.0), (self.fases, -1)):
+            lista.append(inicial)
+        self.observadores += [[], []]
+        heapq.heappush(self.heap, (0.0, self.num_variaveis))
+        return self.num_variaveis
+
+    def valor(self, literal):
+        """1 se o literal é verdadeiro, -1 se é falso, 0 se não atribuído (no nível atual)."""
+        valor = self.valores[abs(literal)]
+        return valor if literal > 0 else -valor
+
+    def adicionar_clausula(self, literais):
+        """Adiciona uma cláusula (disjunção de literais). Retorna False se a KB ficou inconsistente."""
+        self._retroceder(0)
+        if self.inconsistente:
+            return False
+        literais = list(dict.fromkeys(literais))
+        conjunto = set(literais)
+        restantes = []
+        for literal in literais:
+            valor = self.valor(literal)
+            if -literal in conjunto or valor > 0:
+                return True  # tautologia, ou já satisfeita no nível 0
+            if valor == 0:
+                restantes.append(literal)
+        if not restantes:
+            self.inconsistente = True
+        elif len(restantes) == 1:
+            self._atribuir(restantes[0], None)
+            self.inconsistente = self._propagar() is not None
+        else:
+            clausula = Clausula(restantes)
+            self.clausulas.append(clausula)
+            self._observar(clausula)
+        return not self.inconsistente
+
+    def _observar(self, clausula):
+        for literal in clausula.literais[:2]:
+            self.observadores[2 * abs(literal) + (literal < 0)].append(clausula)
+
+    # --- Propagação e Aprendizado ---
+
+    def _atribuir(self, literal, razao):
+        variavel = abs(literal)
+        self.valores[variavel] = 1 if literal > 0 else -1
+        self.niveis[variavel] = len(self.inicios_nivel)
+        self.razoes[variavel] = razao
+        self.trilha.append(literal)
+
+    def _propagar(self):
+        """Propagação unitária com literais observados. Retorna a cláusula em conflito ou None."""
+        valores, observadores, trilha = self.valores, self.observadores, self.trilha
+        while self.propagados < len(trilha):
+            falso = -trilha[self.propagados]
+            self.propagados += 1
+            self.estatisticas['propagacoes'] += 1
+            lista = observadores[2 * abs(falso) + (falso < 0)]
+            i = j = 0
+            conflito = None
+            while i < len(lista):
+                clausula = lista[i]
+                i += 1
+                if clausula.removida:
+                    continue
+                literais = clausula.literais
+                if literais[0] == falso:
+                    literais[0], literais[1] = literais[1], falso
+                primeiro = literais[0]
+                valor_primeiro = valores[abs(primeiro)] if primeiro > 0 else -valores[abs(primeiro)]
+                if valor_primeiro > 0:
+                    lista[j] = clausula
+                    j += 1
+                    continue
+                # Procura outro literal não falso para observar no lugar de `falso`
+                for k in range(2, len(literais)):
+                    literal = literais[k]
+                    if (valores[abs(literal)] if literal > 0 else -valores[abs(literal)]) >= 0:
+                        literais[1], literais[k] = literal, falso
+                        observadores[2 * abs(literal) + (literal < 0)].append(clausula)
+                        break
+                else:
+                    lista[j] = clausula
+                    j += 1
+                    if valor_primeiro < 0:
+                        conflito = clausula
+                        while i < len(lista):
+                            lista[j] = lista[i]
+                            i += 1
+                            j += 1
+                    else:
+                        self._atribuir(primeiro, clausula)
+            del lista[j:]
+            if conflito is not None:
+                self.propagados = len(trilha)
+                return conflito
+        return None
+
+    def _analisar(self, conflito):
+        """
+        Resolve a cláusula em conflito com as razões até restar um só literal do nível
+        atual (1-UIP). Retorna (cláusula aprendida, nível de retrocesso); o literal
+        afirmado fica na posição 0 e o de maior nível entre os outros na posição 1.
+        """
+        nivel_atual = len(self.inicios_nivel)
+        vistos = set()
+        aprendida = [0]
+        pendentes_nivel = 0
+        literal = 0
+        indice = len(self.trilha) - 1
+        clausula = conflito
+        while True:
+            for q in clausula.literais:
+                variavel = abs(q)
+                if q == literal or variavel in vistos or self.niveis[variavel] == 0:
+                    continue
+                vistos.add(variavel)
+                self._aumentar_atividade(variavel)
+                if self.niveis[variavel] == nivel_atual:
+                    pendentes_nivel += 1
+                else:
+                    aprendida.append(q)
+            while abs(self.trilha[indice]) not in vistos:
+                indice -= 1
+            literal = self.trilha[indice]
+            indice -= 1
+            pendentes_nivel -= 1
+            if pendentes_nivel == 0:
+                break
+            clausula = self.razoes[abs(literal)]
+        aprendida[0] = -literal
+        if len(aprendida) == 1:
+            return aprendida, 0
+        maior = max(range(1, len(aprendida)), key=lambda k: self.niveis[abs(aprendida[k])])
+        aprendida[1], aprendida[maior] = aprendida[maior], aprendida[1]
+        return aprendida, self.niveis[abs(aprendida[1])]
+
+    def _aumentar_atividade(self, variavel):
+        self.atividades[variavel] += self.incremento
+        if self.atividades[variavel] > 1e100:
+            self.atividades = [atividade * 1e-100 for atividade in self.atividades]
+            self.incremento *= 1e-100
+            self._reconstruir_heap()
+
+    def _retroceder(self, nivel):
+        if len(self.inicios_nivel) <= nivel:
+            return
+        inicio = self.inicios_nivel[nivel]
+        for literal in self.trilha[inicio:]:
+            variavel = abs(literal)
+            self.fases[variavel] = self.valores[variavel]
+            self.valores[variavel] = 0
+            self.razoes[variavel] = None
+            if self.decidindo_no_heap:
+                heapq.heappush(self.heap, (-self.atividades[variavel], variavel))
+        del self.trilha[inicio:]
+        del self.inicios_nivel[nivel:]
+        self.propagados = inicio
+
+    def _reduzir_aprendidas(self):
+        """No nível 0, descarta a metade mais longa das cláusulas aprendidas não binárias."""
+        longas = sorted((c for c in self.aprendidas if len(c.literais) > 2), key=lambda c: len(c.literais))
+        for clausula in longas[len(longas) // 2:]:
+            clausula.removida = True
+        self.aprendidas = [c for c in self.aprendidas if not c.removida]
+
+    def _reconstruir_heap(self):
+        self.heap = [(-self.atividades[v], v) for v in range(1, self.num_variaveis + 1) if self.valores[v] == 0]
+        heapq.heapify(self.heap)
+
+    def _escolher_variavel(self, variaveis):
+        valores = self.valores
+        if variaveis is not None:
+            livres = [v for v in variaveis if valores[v] == 0]
+            return max(livres, key=self.atividades.__getitem__) if livres else 0
+        while self.heap:
+            _, variavel = heapq.heappop(self.heap)
+            if valores[variavel] == 0:
+                return variavel
+        return 0
+
+    # --- Consultas ---
+
+    def resolver(self, suposicoes=(), variaveis=None):
+        """
+        True se as cláusulas e as `suposicoes` (literais) são satisfatíveis juntas. Com
+        `variaveis`, só elas recebem decisões: basta quando as demais variáveis estão em
+        componentes independentes e satisfatíveis das cláusulas.
+        """
+        self.estatisticas['consultas'] += 1
+        self._retroceder(0)
+        if self.inconsistente:
+            return False
+        if variaveis is None and not self.decidindo_no_heap:
+            self._reconstruir_heap()  # as variáveis liberadas nas consultas restritas ficaram fora do heap
+        self.decidindo_no_heap = variaveis is None
+        limite_reinicio = 100
+        conflitos = 0
+        while True:
+            conflito = self._propagar()
+            if conflito is not None:
+                self.estatisticas['conflitos'] += 1
+                if not self.inicios_nivel:
+                    self.inconsistente = True
+                    return False
+                aprendida, nivel = self._analisar(conflito)
+                self._retroceder(nivel)
+                if len(aprendida) == 1:
+                    self._atribuir(aprendida[0], None)
+                else:
+                    clausula = Clausula(aprendida, aprendida=True)
+                    self.aprendidas.append(clausula)
+                    self._observar(clausula)
+                    self._atribuir(aprendida[0], clausula)
+                self.estatisticas['aprendidas'] += 1
+                self.incremento /= 0.95
+                conflitos += 1
+                continue
+            if len(self.heap) > 4 * self.num_variaveis + 64:
+                self._reconstruir_heap()
+            if conflitos >= limite_reinicio:
+                self.estatisticas['reinicios'] += 1
+                self._retroceder(0)
+                limite_reinicio = int(limite_reinicio * 1.5)
+                conflitos = 0
+                if len(self.aprendidas) > self.max_aprendidas:
+                    self._reduzir_aprendidas()
+                continue
+            nivel = len(self.inicios_nivel)
+            if nivel < len(suposicoes):
+                # Cada suposição ocupa um nível próprio, como uma decisão
+                literal = suposicoes[nivel]
+                if self.valor(literal) < 0:
+                    self._retroceder(0)
+                    return False
+                self.inicios_nivel.append(len(self.trilha))
+                if self.valor(literal) == 0:
+                    self._atribuir(literal, None)
+                continue
+            variavel = self._escolher_variavel(variaveis)
+            if variavel == 0:
+                self._retroceder(0)
+                return True
+            self.estatisticas['decisoes'] += 1
+            self.inicios_nivel.append(len(self.trilha))
+            self._atribuir(variavel if self.fases[variavel] > 0 else -variavel, None)
+
+    def implica(self, literal, variaveis=None):
+        """True se as cláusulas implicam `literal`, isto é, se elas e ¬literal são insatisfatíveis."""
+        if self.inconsistente:
+            return True
+        valor = self.valor(literal)
+        if valor != 0:
+            return valor > 0  # fixado no nível 0 pela propagação
+        return not self.resolver([-literal], variaveis)
@@ -0,0 +1,233 @@
+"""
+PROJETO 5 (ESTRUTURA): CSPs EM ÁRVORE E CONDICIONAMENTO POR CUTSET
+
+Quando o grafo de restrições é uma árvore (ou floresta), o CSP é resolvido em tempo
+linear: consistência de arco direcional das folhas para a raiz e atribuição da raiz
+para as folhas, sem nenhum backtrack. Para grafos quase em árvore, escolhe-se um
+cutset de ciclos (variáveis cuja remoção deixa uma floresta): o cutset é resolvido por
+backtracking com Forward Checking, sobre os domínios e a trilha do motor
+(`csp_motor.py`), e o restante é resolvido pelo solver de árvore a cada atribuição
+completa do cutset.
+"""
+import heapq
+import time
+from collections import deque
+
+from csp_motor import DominiosBitset, backtracking_search, forward_check, novas_estatisticas, revisar
+
+# --- Análise da Estrutura do Grafo ---
+
+def encontrar_cutset(variaveis, restricoes):
+    """
+    Cutset de ciclos guloso: remove repetidamente as variáveis de grau <= 1 (que não
+    estão em ciclos) e, enquanto sobrar algum ciclo, move para o cutset a variável de
+    maior grau restante. Retorna a lista do cutset na ordem de escolha.
+    """
+    grau = {var: len(restricoes[var]) for var in variaveis}
+    removido = set()
+    folhas = deque(var for var in variaveis if grau[var] <= 1)
+    heap = [(-grau[var], indice, var) for indice, var in enumerate(variaveis)]
+    heapq.heapify(heap)
+    indice = {var: i for i, var in enumerate(variaveis)}
+    cutset = []
+
+    def remover(var):
+        removido.add(var)
+        for vizinho in restricoes[var]:
+            if vizinho not in removido:
+                grau[vizinho] -= 1
+                if grau[vizinho] == 1:
+                    folhas.append(vizinho)
+                else:
+                    heapq.heappush(heap, (-grau[vizinho], indice[vizinho], vizinho))
+
+    while True:
+        while folhas:
+            var = folhas.popleft()
+            if var not in removido:
+                remover(var)
+        # Entradas com grau desatualizado são descartadas ao sair do heap
+        while heap and (heap[0][2] in removido or -heap[0][0] != grau[heap[0][2]]):
+            heapq.heappop(heap)
+        if not heap:
+            return cutset
+        _, _, var = heapq.heappop(heap)
+        cutset.append(var)
+        remover(var)
+
+def estimar_largura_arvore(variaveis, restricoes, limite=50):
+    """
+    Limite superior da largura de árvore (tree-width) pela eliminação de menor grau.
+    A eliminação para quando o grau passa de `limite`; retorna (largura, limitada).
+    """
+    vizinhos = {var: set(restricoes[var]) for var in variaveis}
+    heap = [(len(vizinhos[var]), indice, var) for indice, var in enumerate(variaveis)]
+    heapq.heapify(heap)
+    indice = {var: i for i, var in enumerate(variaveis)}
+    largura = 0
+    while heap:
+        grau, _, var = heapq.heappop(heap)
+        if var not in vizinhos or grau != len(vizinhos[var]):
+            continue
+        largura = max(largura, grau)
+        if largura > limite:
+            return largura, True
+        # Eliminar `var` liga todos os seus vizinhos entre si
+        adjacentes = vizinhos.pop(var)
+        for u in adjacentes:
+            vizinhos[u].discard(var)
+            vizinhos[u] |= adjacentes - {u}
+            heapq.heappush(heap, (len(vizinhos[u]), indice[u], u))
+    return largura, False
+
+def analisar_estrutura(variaveis, restricoes, limite_largura=50):
+    """Resumo da estrutura: arestas, se é floresta, cutset de ciclos e largura de árvore estimada."""
+    num_arestas = sum(len(restricoes[var]) for var in variaveis) // 2
+    cutset = encontrar_cutset(variaveis, restricoes)
+    largura, limitada = estimar_largura_arvore(variaveis, restricoes, limite_largura)
+    return {'variaveis': len(variaveis), 'arestas': num_arestas, 'floresta': not cutset,
+            'cutset': cutset, 'tamanho_cutset': len(cutset), 'largura_arvore': largura,
+            'largura_limitada': limitada}
+
+# --- Solver de Árvore ---
+
+def ordem_floresta(variaveis, restricoes, excluidos=()):
+    """
+    Ordem de busca em largura de cada árvore da floresta obtida ao remover `excluidos`:
+    lista de (variável, pai), com pai None nas raízes.
+    """
+    excluidos = set(excluidos)
+    visitado = set(excluidos)
+    ordem = []
+    for raiz in variaveis:
+        if raiz in visitado:
+            continue
+        visitado.add(raiz)
+        ordem.append((raiz, None))
+        fila = deque([raiz])
+        while fila:
+            var = fila.popleft()
+            for vizinho in restricoes[var]:
+                if vizinho not in visitado:
+                    visitado.add(vizinho)
+                    ordem.append((vizinho, var))
+                    fila.append(vizinho)
+    return ordem
+
+def resolver_floresta(ordem, dominios, estatisticas):
+    """
+    Consistência de arco direcional (de cada filho para o pai, das folhas para a raiz)
+    seguida da atribuição da raiz para as folhas. As podas entram na trilha de
+    `dominios`. Retorna a atribuição das variáveis de `ordem` ou None.
+    """
+    residuos = {}
+    for var, pai in reversed(ordem):
+        if pai is not None:
+            revisar(pai, var, dominios, residuos, estatisticas)
+            if not dominios.mascara[pai]:
+                return None
+    atribuicao = {}
+    for var, pai in ordem:
+        mascara = dominios.mascara[var]
+        if pai is not None:
+            mascara &= ~(1 << dominios.indice_valor[atribuicao[pai]])
+        # Após a consistência direcional sempre sobra um valor compatível com o pai
+        estatisticas['nos'] += 1
+        atribuicao[var] = dominios.valores[(mascara & -mascara).bit_length() - 1]
+    return atribuicao
+
+# --- Condicionamento por Cutset ---
+
+def _backtracking_cutset(indice, cutset, atribuicao, dominios, restricoes, ordem, estatisticas):
+    if indice == len(cutset):
+        marca = dominios.marcar()
+        resto = resolver_floresta(ordem, dominios, estatisticas)
+        dominios.desfazer(marca)
+        if resto is None:
+            return None
+        atribuicao.update(resto)
+        return atribuicao
+
+    var = cutset[indice]
+    for valor in dominios.valores_de(var):
+        marca = dominios.marcar()
+        estatisticas['nos'] += 1
+        atribuicao[var] = valor
+        dominios.restringir(var, 1 << dominios.indice_valor[valor])
+        # Forward Checking condiciona os domínios da floresta (e do restante do cutset)
+        if forward_check(var, valor, dominios, restricoes, estatisticas):
+            resultado = _backtracking_cutset(indice + 1, cutset, atribuicao, dominios, restricoes, ordem,
+                                             estatisticas)
+            if resultado is not None:
+                return resultado
+        dominios.desfazer(marca)
+        del atribuicao[var]
+        estatisticas['backtracks'] += 1
+    return None
+
+def resolver_com_cutset(atribuicao, variaveis, dominios, restricoes, cutset, estatisticas=None):
+    """
+    Resolve o CSP condicionando em `cutset` (vazio se o grafo já for uma floresta).
+    Variáveis já presentes em `atribuicao` têm o domínio fixado no valor dado.
+    """
+    if estatisticas is None:
+        estatisticas = novas_estatisticas()
+    if not isinstance(dominios, DominiosBitset):
+        dominios = DominiosBitset(variaveis, dominios)
+    tempo_inicial = time.perf_counter()
+    for var, valor in atribuicao.items():
+        dominios.restringir(var, dominios.mascara[var] & (1 << dominios.indice_valor[valor]))
+    resultado = None
+    if all(dominios.mascara[var] for var in variaveis):
+        ordem = ordem_floresta(variaveis, restricoes, excluidos=cutset)
+        resultado = _backtracking_cutset(0, list(cutset), dict(atribuicao), dominios, restricoes, ordem,
+                                         estatisticas)
+    if resultado is not None:
+        atribuicao.update(resultado)
+        resultado = atribuicao
+    estatisticas['tempo'] += time.perf_counter() - tempo_inicial
+    return resultado
+
+def resolver_por_estrutura(atribuicao, variaveis, dominios, restricoes, estatisticas=None, max_cutset=20,
+                           **configuracao):
+    """
+    Escolhe a rota pela estrutura do grafo: 'arvore' se for uma floresta, 'cutset' se
+    o cutset de ciclos tiver até `max_cutset` variáveis e 'backtracking' (motor, com os
+    parâmetros de `configuracao`) nos demais casos. As estatísticas recebem 'rota'
+    e 'tamanho_cutset'.
+    """
+    if estatisticas is None:
+        estatisticas = novas_estatisticas()
+    cutset = encontrar_cutset(variaveis, restricoes)
+    estatisticas['tamanho_cutset'] = len(cutset)
+    if len(cutset) > max_cutset:
+        estatisticas['rota'] = 'backtracking'
+        return backtracking_search(atribuicao, variaveis, dominios, restricoes, estatisticas=estatisticas,
+                                   **configuracao)
+    estatisticas['rota'] = 'cutset' if cutset else 'arvore'
+    return resolver_com_cutset(atribuicao, variaveis, dominios, restricoes, cutset, estatisticas)
+
+# --- BLOCO PRINCIPAL DE EXECUÇÃO ---
+
+if __name__ == "__main__":
+    from csp_instancias import gerar_arvore_aleatoria
+
+    NUM_VERTICES = 20000
+    NUM_CORES = 3
+    SEMENTE = 42
+
+    print(f"{'Instância':<18} | {'Floresta':>8} | {'Cutset':>6} | {'Largura':>7} | {'Rota':<12} | "
+          f"{'Resolvido':>9} | {'Nós':>9} | {'Tempo (s)':>9} | {'Nós (motor)':>11} | {'Tempo motor (s)':>15}")
+    for arestas_extras in (0, 5, 15, 40):
+        variaveis, dominios, restricoes = gerar_arvore_aleatoria(NUM_VERTICES, arestas_extras, NUM_CORES, SEMENTE)
+        estrutura = analisar_estrutura(variaveis, restricoes)
+        estatisticas = novas_estatisticas()
+        solucao = resolver_por_estrutura({}, variaveis, dominios, restricoes, estatisticas)
+        estatisticas_motor = novas_estatisticas()
+        backtracking_search({}, variaveis, dominios, restricoes, estatisticas=estatisticas_motor,
+                            heuristica='mrv_grau', limite_nos=200000)
+        largura = f"{'>' if estrutura['largura_limitada'] else ''}{estrutura['largura_arvore']}"
+        print(f"{f'arvore+{arestas_extras}':<18} | {'sim' if estrutura['floresta'] else 'não':>8} | "
+              f"{estrutura['tamanho_cutset']:>6} | {largura:>7} | {estatisticas['rota']:<12} | "
+              f"{'sim' if solucao else 'não':>9} | {estatisticas['nos']:>9} | {estatisticas['tempo']:>9.3f} | "
+              f"{estatisticas_motor['nos']:>11} | {estatisticas_motor['tempo']:>15.3f}")
@@ -0,0 +1,120 @@
+"""
+PROJETO 5 (ANÁLISE): BANCADA DE TESTES DO MOTOR DE CSP
+
+Resolve instâncias grandes de coloração de grafos (arquivos DIMACS e grafos gerados
+com semente), sem visualização, com cada combinação de heurística e nível de
+propagação. Para cada execução registra tempo, nós, backtracks, verificações de
+restrição e podas da propagação, imprime uma tabela e grava os resultados em CSV.
+"""
+import csv
+import os
+
+from csp_instancias import carregar_dimacs, gerar_grafo_aleatorio, gerar_grafo_geometrico
+from csp_motor import backtracking_search, novas_estatisticas, resolver_por_componentes
+
+CAMPOS_RESULTADO = ['instancia', 'variaveis', 'arestas', 'heuristica', 'ordenacao_valores', 'propagacao',
+                    'backjumping', 'capacidade_nogoods', 'por_componentes', 'componentes', 'resolvido',
+                    'interrompida', 'tempo', 'nos',
+                    'tempo_por_no', 'backtracks', 'verificacoes', 'podas', 'backjumps',
+                    'distancia_media_salto', 'distancia_salto_max', 'nogoods_aprendidos',
+                    'taxa_acerto_nogoods']
+
+def validar_solucao(solucao, restricoes):
+    """Confere se nenhum par de vizinhos recebeu a mesma cor."""
+    return all(solucao[u] != solucao[v] for u in restricoes for v in restricoes[u])
+
+def executar_configuracao(nome, variaveis, dominios, restricoes, limite_nos=None, **configuracao):
+    """
+    Resolve uma instância com uma configuração do motor e retorna uma linha de resultados.
+    Com `por_componentes=True` na configuração, usa `resolver_por_componentes`.
+    """
+    estatisticas = novas_estatisticas()
+    resolver = resolver_por_componentes if configuracao.get('por_componentes') else backtracking_search
+    parametros = {chave: valor for chave, valor in configuracao.items() if chave != 'por_componentes'}
+    solucao = resolver({}, variaveis, dominios, restricoes, estatisticas=estatisticas,
+                       limite_nos=limite_nos, **parametros)
+    if solucao is not None and not validar_solucao(solucao, restricoes):
+        raise AssertionError(f"Solução inválida para {nome} com {configuracao}")
+    linha = {
+        'instancia': nome,
+        'variaveis': len(variaveis),
+        'arestas': sum(len(v) for v in restricoes.values()) // 2,
+        'resolvido': solucao is not None,
+    }
+    linha.update(configuracao)
+    linha.update(estatisticas)
+    linha['tempo_por_no'] = estatisticas['tempo'] / max(estatisticas['nos'], 1)
+    linha['distancia_media_salto'] = estatisticas['distancia_salto_total'] / max(estatisticas['falhas'], 1)
+    linha['taxa_acerto_nogoods'] = estatisticas['nogoods_acertos'] / max(estatisticas['nogoods_consultas'], 1)
+    return linha
+
+def executar_bancada(instancias, configuracoes, limite_nos=None, arquivo_csv=None):
+    """
+    Executa todas as configurações em todas as instâncias.
+    `instancias` é uma lista de (nome, variaveis, dominios, restricoes); `configuracoes`
+    é uma lista de dicionários com os parâmetros do motor (heuristica, propagacao, ...).
+    """
+    resultados = []
+    print(f"{'Instância':<24} | {'Heurística':<13} | {'Valores':<7} | {'Propagação':<10} | {'Status':<10} | "
+          f"{'Tempo (s)':>9} | {'Nós':>9} | {'µs/nó':>7} | {'Backtracks':>10} | {'Verificações':>12} | {'Podas':>9} | "
+          f"{'CBJ':>3} | {'Salto médio':>11} | {'Acerto NG':>9} | {'Comp.':>6}")
+    for nome, variaveis, dominios, restricoes in instancias:
+        for configuracao in configuracoes:
+            linha = executar_configuracao(nome, variaveis, dominios, restricoes, limite_nos, **configuracao)
+            resultados.append(linha)
+            status = 'resolvido' if linha['resolvido'] else ('limite' if linha['interrompida'] else 'insolúvel')
+            print(f"{nome:<24} | {linha.get('heuristica', 'mrv'):<13} | {linha.get('ordenacao_valores', 'fixa'):<7} | "
+                  f"{linha.get('propagacao', 'fc'):<10} | {status:<10} | {linha['tempo']:>9.3f} | {linha['nos']:>9} | "
+                  f"{linha['tempo_por_no'] * 1e6:>7.1f} | {linha['backtracks']:>10} | "
+                  f"{linha['verificacoes']:>12} | {linha['podas']:>9} | "
+                  f"{'sim' if linha.get('backjumping') else 'não':>3} | {linha['distancia_media_salto']:>11.2f} | "
+                  f"{linha['taxa_acerto_nogoods']:>9.1%} | {linha.get('componentes', 1):>6}")
+
+    if arquivo_csv:
+        with open(arquivo_csv, 'w', newline='') as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS_RESULTADO, extrasaction='ignore')
+            escritor.writeheader()
+            escritor.writerows(resultados)
+        print(f"\nResultados gravados em {arquivo_csv}")
+    return resultados
+
+# --- BLOCO PRINCIPAL DE EXECUÇÃO ---
+
+if __name__ == "__main__":
+    NUM_CORES = 4
+    SEMENTE = 42
+    LIMITE_NOS = 200000
+    # Arquivos DIMACS (.col) opcionais, ex.: ['instancias/le450_15a.col']
+    ARQUIVOS_DIMACS = []
+    ARQUIVO_RESULTADOS = 'resultados_csp.csv'
+
+    instancias = []
+    for caminho in ARQUIVOS_DIMACS:
+        instancias.append((os.path.basename(caminho), *carregar_dimacs(caminho, NUM_CORES)))
+    for num_vertices in (1000, 5000):
+        instancias.append((f"aleatorio-{num_vertices}", *gerar_grafo_aleatorio(num_vertices, 4.0, NUM_CORES, SEMENTE)))
+        variaveis, dominios, restricoes, _ = gerar_grafo_geometrico(num_vertices, 4.0, NUM_CORES, SEMENTE)
+        instancias.append((f"geometrico-{num_vertices}", variaveis, dominios, restricoes))
+        # Grau médio baixo: muitos componentes desconexos (regiões isoladas do mapa)
+        instancias.append((f"esparso-{num_vertices}", *gerar_grafo_aleatorio(num_vertices, 1.5, NUM_CORES, SEMENTE)))
+
+    configuracoes = [
+        {'heuristica': heuristica, 'ordenacao_valores': ordenacao, 'propagacao': propagacao}
+        for heuristica in ('estatica', 'mrv_varredura', 'mrv', 'mrv_grau')
+        for ordenacao in ('fixa', 'lcv')
+        for propagacao in ('nenhuma', 'fc', 'mac')
+    ]
+    # Backjumping (com e sem armazém de nogoods) para as heurísticas incrementais
+    configuracoes += [
+        {'heuristica': heuristica, 'propagacao': 'fc', 'backjumping': True, 'capacidade_nogoods': capacidade}
+        for heuristica in ('mrv', 'mrv_grau')
+        for capacidade in (0, 2000)
+    ]
+
+    # Decomposição em componentes conexos, com os componentes grandes em paralelo
+    configuracoes += [
+        {'heuristica': 'mrv', 'propagacao': propagacao, 'por_componentes': True}
+        for propagacao in ('fc', 'mac')
+    ]
+
+    executar_bancada(instancias, configuracoes, limite_nos=LIMITE_NOS, arquivo_csv=ARQUIVO_RESULTADOS)
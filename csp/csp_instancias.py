@@ -0,0 +1,108 @@
+"""
+PROJETO 5 (INSTÂNCIAS): COLORAÇÃO DE GRAFOS PARA O MOTOR DE CSP
+
+Carrega instâncias no formato DIMACS (.col) e gera grafos aleatórios e geométricos
+com semente, todos no mesmo formato usado por `csp_mapa_visual.py`:
+(variaveis, dominios, restricoes), com `restricoes` mapeando cada variável à lista
+de vizinhos que devem receber uma cor diferente.
+"""
+import math
+import random
+
+def montar_csp(vertices, arestas, num_cores):
+    """Monta (variaveis, dominios, restricoes) a partir de uma lista de vértices e arestas."""
+    variaveis = list(vertices)
+    vizinhos = {v: set() for v in variaveis}
+    for u, v in arestas:
+        if u != v:
+            vizinhos[u].add(v)
+            vizinhos[v].add(u)
+    cores = list(range(num_cores))
+    dominios = {v: list(cores) for v in variaveis}
+    restricoes = {v: sorted(vizinhos[v]) for v in variaveis}
+    return variaveis, dominios, restricoes
+
+# --- Formato DIMACS ---
+
+def carregar_dimacs(caminho, num_cores):
+    """
+    Lê um arquivo DIMACS de coloração (.col): linhas 'c' são comentários, 'p edge N M'
+    declara o grafo e cada 'e u v' é uma aresta. Os vértices são os inteiros 1..N.
+    """
+    num_vertices = None
+    arestas = []
+    with open(caminho) as arquivo:
+        for numero_linha, linha in enumerate(arquivo, start=1):
+            campos = linha.split()
+            if not campos or campos[0] == 'c':
+                continue
+            if campos[0] == 'p':
+                num_vertices = int(campos[2])
+            elif campos[0] == 'e':
+                arestas.append((int(campos[1]), int(campos[2])))
+            else:
+                raise ValueError(f"{caminho}:{numero_linha}: linha DIMACS inválida: {linha.strip()!r}")
+    if num_vertices is None:
+        raise ValueError(f"{caminho}: linha 'p edge N M' não encontrada")
+    return montar_csp(range(1, num_vertices + 1), arestas, num_cores)
+
+def salvar_dimacs(caminho, variaveis, restricoes, comentario=None):
+    """Grava o grafo de restrições em formato DIMACS (as variáveis viram 1..N, na ordem dada)."""
+    numero = {var: i for i, var in enumerate(variaveis, start=1)}
+    arestas = [(numero[u], numero[v]) for u in variaveis for v in restricoes[u] if numero[u] < numero[v]]
+    with open(caminho, 'w') as arquivo:
+        if comentario:
+            arquivo.write(f"c {comentario}\n")
+        arquivo.write(f"p edge {len(variaveis)} {len(arestas)}\n")
+        for u, v in arestas:
+            arquivo.write(f"e {u} {v}\n")
+
+# --- Geradores com Semente ---
+
+def gerar_grafo_aleatorio(num_vertices, grau_medio, num_cores, semente=None):
+    """Grafo aleatório G(n, m) com m = n * grau_medio / 2 arestas distintas."""
+    rng = random.Random(semente)
+    num_arestas = min(int(num_vertices * grau_medio / 2), num_vertices * (num_vertices - 1) // 2)
+    arestas = set()
+    while len(arestas) < num_arestas:
+        u, v = rng.sample(range(num_vertices), 2)
+        arestas.add((min(u, v), max(u, v)))
+    return montar_csp(range(num_vertices), sorted(arestas), num_cores)
+
+def gerar_arvore_aleatoria(num_vertices, arestas_extras, num_cores, semente=None):
+    """
+    Árvore aleatória (cada vértice liga-se a um anterior sorteado) mais `arestas_extras`
+    arestas aleatórias, que criam ciclos: grafos "quase em árvore".
+    """
+    rng = random.Random(semente)
+    arestas = {(rng.randrange(v), v) for v in range(1, num_vertices)}
+    num_arestas = min(len(arestas) + arestas_extras, num_vertices * (num_vertices - 1) // 2)
+    while len(arestas) < num_arestas:
+        u, v = rng.sample(range(num_vertices), 2)
+        arestas.add((min(u, v), max(u, v)))
+    return montar_csp(range(num_vertices), sorted(arestas), num_cores)
+
+def gerar_grafo_geometrico(num_vertices, grau_medio, num_cores, semente=None):
+    """
+    Grafo geométrico aleatório: pontos uniformes no quadrado unitário, ligados quando
+    a distância é menor que o raio que produz, em média, `grau_medio` vizinhos. Parecido
+    com mapas reais (planar na maior parte). Retorna também as coordenadas dos vértices.
+    """
+    rng = random.Random(semente)
+    raio = math.sqrt(grau_medio / (math.pi * num_vertices))
+    coordenadas = {v: (rng.random(), rng.random()) for v in range(num_vertices)}
+
+    # Grade com células do tamanho do raio: só as 9 células vizinhas precisam ser comparadas
+    celulas = {}
+    for v, (x, y) in coordenadas.items():
+        celulas.setdefault((int(x / raio), int(y / raio)), []).append(v)
+    arestas = []
+    for (cx, cy), membros in celulas.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for v in celulas.get((cx + dx, cy + dy), ()):
+                    for u in membros:
+                        if u < v and math.dist(coordenadas[u], coordenadas[v]) < raio:
+                            arestas.append((u, v))
+    variaveis, dominios, restricoes = montar_csp(range(num_vertices), arestas, num_cores)
+    return variaveis, dominios, restricoes, coordenadas
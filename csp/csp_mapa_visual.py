@@ -5,12 +5,12 @@ Este script resolve o problema da Coloração de Mapas (Austrália) com uma
 visualização gráfica do algoritmo de Backtracking, MRV e Forward Checking.
 """
 
-import copy
-import time
 import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 
+from csp_motor import backtracking_search, comparar_niveis_propagacao, componentes_conexos, resolver_por_componentes
+
 def preparar_visualizacao(coordenadas, restricoes, titulo):
     """Configura a janela e desenha o grafo base do mapa."""
     plt.ion()
@@ -60,52 +60,22 @@ def desenhar_passo_csp(ax, coordenadas, atribuicao, dominios, status_texto):
     plt.draw()
     plt.pause(0.8)
 
-def backtracking_search_visual(atribuicao, variaveis, dominios, restricoes, ax, coordenadas):
-    """Implementação do Backtracking com chamadas de visualização."""
-    
-    # Condição de parada: sucesso!
-    if len(atribuicao) == len(variaveis):
-        return atribuicao
-
-    var = selecionar_variavel_mrv(atribuicao, variaveis, dominios)
-
-    # Tenta cada valor no domínio da variável
-    for valor in dominios[var]:
-        dominios_locais = copy.deepcopy(dominios)
-        atribuicao[var] = valor
-        
-        status = f"Tentando {var} = {valor}"
-        desenhar_passo_csp(ax, coordenadas, atribuicao, dominios_locais, status)
-
-        # Forward Checking
-        if forward_check(var, valor, dominios_locais, restricoes):
-            status = f"Forward Checking OK para {var} = {valor}. Propagando restrições..."
-            desenhar_passo_csp(ax, coordenadas, atribuicao, dominios_locais, status)
-            
-            resultado = backtracking_search_visual(atribuicao, variaveis, dominios_locais, restricoes, ax, coordenadas)
-            
-            if resultado is not None:
-                return resultado
-        
-        # Backtrack
-        del atribuicao[var]
-        status = f"Backtrack! Conflito com {var} = {valor}. Desfazendo atribuição."
-        desenhar_passo_csp(ax, coordenadas, atribuicao, dominios, status)
-
-    return None
-
-# --- Funções Lógicas do CSP (sem alteração) ---
-def selecionar_variavel_mrv(atribuicao, variaveis, dominios):
-    variaveis_nao_atribuidas = [v for v in variaveis if v not in atribuicao]
-    return min(variaveis_nao_atribuidas, key=lambda var: len(dominios[var]))
-
-def forward_check(var, valor, dominios, restricoes):
-    for vizinho in restricoes[var]:
-        if valor in dominios[vizinho]:
-            dominios[vizinho].remove(valor)
-            if not dominios[vizinho]:
-                return False
-    return True
+def backtracking_search_visual(atribuicao, variaveis, dominios, restricoes, ax, coordenadas, propagacao='fc',
+                               heuristica='mrv', ordenacao_valores='fixa'):
+    """Backtracking do motor (csp_motor.py) com chamadas de visualização a cada evento."""
+    nome_propagacao = {'nenhuma': "Consistência", 'fc': "Forward Checking", 'mac': "Arc Consistency (MAC)"}[propagacao]
+    mensagens = {
+        'tentando': "Tentando {var} = {valor}",
+        'propagacao_ok': nome_propagacao + " OK para {var} = {valor}. Propagando restrições...",
+        'backtrack': "Backtrack! Conflito com {var} = {valor}. Desfazendo atribuição.",
+    }
+
+    def observador(evento, var, valor, atribuicao, dominios_atuais):
+        status = mensagens[evento].format(var=var, valor=valor)
+        desenhar_passo_csp(ax, coordenadas, atribuicao, dominios_atuais.como_listas(), status)
+
+    return backtracking_search(atribuicao, variaveis, dominios, restricoes, observador, propagacao=propagacao,
+                               heuristica=heuristica, ordenacao_valores=ordenacao_valores)
 
 # --- Bloco Principal de Execução ---
 if __name__ == "__main__":
@@ -121,12 +91,28 @@ if __name__ == "__main__":
         'NSW': (7, 3.5), 'V': (6.5, 1.5), 'T': (7.5, 0.5)
     }
 
+    # Nível de propagação usado na animação: 'nenhuma', 'fc' ou 'mac'
+    PROPAGACAO = 'fc'
+    # Heurística de variável ('estatica', 'mrv', 'mrv_grau') e ordenação de valores ('fixa', 'lcv')
+    HEURISTICA = 'mrv'
+    ORDENACAO_VALORES = 'fixa'
+
     print("--- Problema de Coloração de Mapas (Austrália) ---")
-    
+    print("\nComparação dos níveis de propagação (sem visualização):")
+    comparar_niveis_propagacao(variaveis, dominios, restricoes)
+
+    # Regiões sem restrições entre si (como a Tasmânia) podem ser resolvidas separadamente
+    componentes = componentes_conexos(variaveis, restricoes)
+    print(f"\nComponentes conexos: {' | '.join(', '.join(c) for c in componentes)}")
+    solucao_componentes = resolver_por_componentes({}, variaveis, dominios, restricoes, propagacao=PROPAGACAO,
+                                                   heuristica=HEURISTICA, ordenacao_valores=ORDENACAO_VALORES)
+    print(f"Resolução por componentes: {'solução encontrada' if solucao_componentes else 'sem solução'}")
+
     fig, ax = preparar_visualizacao(coordenadas, restricoes, "Projeto 5: CSP - Coloração de Mapas")
     desenhar_passo_csp(ax, coordenadas, {}, dominios, "Estado Inicial")
     
-    solucao = backtracking_search_visual({}, variaveis, dominios, restricoes, ax, coordenadas)
+    solucao = backtracking_search_visual({}, variaveis, dominios, restricoes, ax, coordenadas, PROPAGACAO,
+                                         HEURISTICA, ORDENACAO_VALORES)
 
     if solucao:
         status_final = "Solução Encontrada!"
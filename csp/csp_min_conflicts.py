@@ -0,0 +1,185 @@
+"""
+PROJETO 5 (BUSCA LOCAL): MIN-CONFLICTS PARA COLORAÇÃO DE MAPAS GRANDES
+
+Para grafos com centenas de milhares de vértices, a busca completa do backtracking
+não é viável. Este solver de busca local usa os mesmos dicionários
+(variaveis, dominios, restricoes) de `csp_mapa_visual.py` e:
+- mantém o conjunto de variáveis em conflito, com sorteio em O(1);
+- atualiza a contagem de conflitos só na vizinhança da variável alterada;
+- usa lista tabu (variável, valor) para não desfazer movimentos recentes;
+- faz passeios aleatórios com uma pequena probabilidade para escapar de platôs.
+"""
+import random
+import time
+
+class ConjuntoIndexado:
+    """Conjunto com inserção, remoção e sorteio de elemento em O(1)."""
+    def __init__(self):
+        self.itens = []
+        self.posicao = {}
+
+    def __len__(self):
+        return len(self.itens)
+
+    def __contains__(self, item):
+        return item in self.posicao
+
+    def adicionar(self, item):
+        if item not in self.posicao:
+            self.posicao[item] = len(self.itens)
+            self.itens.append(item)
+
+    def remover(self, item):
+        posicao = self.posicao.pop(item, None)
+        if posicao is None:
+            return
+        ultimo = self.itens.pop()
+        if posicao < len(self.itens):
+            self.itens[posicao] = ultimo
+            self.posicao[ultimo] = posicao
+
+    def sortear(self, rng):
+        return self.itens[rng.randrange(len(self.itens))]
+
+def contar_valores_vizinhos(var, atribuicao, restricoes):
+    """Quantos vizinhos de `var` usam cada valor."""
+    contagem = {}
+    for vizinho in restricoes[var]:
+        valor = atribuicao.get(vizinho)
+        if valor is not None:
+            contagem[valor] = contagem.get(valor, 0) + 1
+    return contagem
+
+def atribuicao_inicial_gulosa(variaveis, dominios, restricoes, rng):
+    """Atribui cada variável, em ordem, ao valor com menos conflitos com as já atribuídas."""
+    atribuicao = {}
+    for var in variaveis:
+        contagem = contar_valores_vizinhos(var, atribuicao, restricoes)
+        menor = min(contagem.get(valor, 0) for valor in dominios[var])
+        atribuicao[var] = rng.choice([valor for valor in dominios[var] if contagem.get(valor, 0) == menor])
+    return atribuicao
+
+def min_conflicts(variaveis, dominios, restricoes, max_passos=1_000_000, limite_segundos=None,
+                  tenure_tabu=10, prob_passeio=0.05, semente=None, amostrar_a_cada=1000):
+    """
+    Busca local Min-Conflicts com lista tabu e passeio aleatório.
+
+    Retorna (atribuicao, estatisticas). A atribuição é uma solução se
+    estatisticas['conflitos'] == 0. As estatísticas incluem os passos, o tempo,
+    o tempo até zerar os conflitos e `historico`, uma lista de
+    (segundos, passo, conflitos) amostrada a cada `amostrar_a_cada` passos.
+    """
+    rng = random.Random(semente)
+    tempo_inicial = time.perf_counter()
+    atribuicao = atribuicao_inicial_gulosa(variaveis, dominios, restricoes, rng)
+
+    # Conflitos por variável e total de arestas em conflito
+    conflitos_var = {}
+    em_conflito = ConjuntoIndexado()
+    for var in variaveis:
+        valor = atribuicao[var]
+        conflitos_var[var] = sum(1 for vizinho in restricoes[var] if atribuicao[vizinho] == valor)
+        if conflitos_var[var]:
+            em_conflito.adicionar(var)
+    total_conflitos = sum(conflitos_var.values()) // 2
+    melhor_total = total_conflitos
+
+    tabu_ate = {}  # (variável, valor) -> passo até o qual o movimento é proibido
+    historico = [(time.perf_counter() - tempo_inicial, 0, total_conflitos)]
+    estatisticas = {'passos': 0, 'conflitos': total_conflitos, 'tempo': 0.0, 'tempo_ate_zero': None,
+                    'passeios_aleatorios': 0, 'historico': historico}
+
+    passo = 0
+    while em_conflito and passo < max_passos:
+        if limite_segundos is not None and passo % 1000 == 0 and time.perf_counter() - tempo_inicial > limite_segundos:
+            break
+        passo += 1
+        var = em_conflito.sortear(rng)
+        valor_atual = atribuicao[var]
+        contagem = contar_valores_vizinhos(var, atribuicao, restricoes)
+
+        if rng.random() < prob_passeio:
+            novo_valor = rng.choice(dominios[var])
+            estatisticas['passeios_aleatorios'] += 1
+        else:
+            # Melhor valor não tabu; um valor tabu só é aceito se levar a um novo recorde (aspiração)
+            melhor_custo = None
+            candidatos = []
+            for valor in dominios[var]:
+                custo = contagem.get(valor, 0)
+                tabu = valor != valor_atual and tabu_ate.get((var, valor), 0) > passo
+                if tabu and total_conflitos - contagem.get(valor_atual, 0) + custo >= melhor_total:
+                    continue
+                if melhor_custo is None or custo < melhor_custo:
+                    melhor_custo, candidatos = custo, [valor]
+                elif custo == melhor_custo:
+                    candidatos.append(valor)
+            if not candidatos:
+                continue
+            novo_valor = rng.choice(candidatos)
+
+        if novo_valor == valor_atual:
+            continue
+
+        # Aplica o movimento atualizando só a vizinhança de `var`
+        atribuicao[var] = novo_valor
+        tabu_ate[(var, valor_atual)] = passo + tenure_tabu
+        total_conflitos += contagem.get(novo_valor, 0) - contagem.get(valor_atual, 0)
+        for vizinho in restricoes[var]:
+            valor_vizinho = atribuicao[vizinho]
+            if valor_vizinho == valor_atual:
+                conflitos_var[vizinho] -= 1
+                if not conflitos_var[vizinho]:
+                    em_conflito.remover(vizinho)
+            elif valor_vizinho == novo_valor:
+                conflitos_var[vizinho] += 1
+                em_conflito.adicionar(vizinho)
+        conflitos_var[var] = contagem.get(novo_valor, 0)
+        if conflitos_var[var]:
+            em_conflito.adicionar(var)
+        else:
+            em_conflito.remover(var)
+        melhor_total = min(melhor_total, total_conflitos)
+
+        if passo % amostrar_a_cada == 0:
+            historico.append((time.perf_counter() - tempo_inicial, passo, total_conflitos))
+
+    estatisticas['tempo'] = time.perf_counter() - tempo_inicial
+    estatisticas['passos'] = passo
+    estatisticas['conflitos'] = total_conflitos
+    if total_conflitos == 0:
+        estatisticas['tempo_ate_zero'] = estatisticas['tempo']
+    if historico[-1][1] != passo:
+        historico.append((estatisticas['tempo'], passo, total_conflitos))
+    return atribuicao, estatisticas
+
+# --- BLOCO PRINCIPAL DE EXECUÇÃO ---
+
+if __name__ == "__main__":
+    from csp_instancias import gerar_grafo_aleatorio, gerar_grafo_geometrico
+
+    NUM_VERTICES = 100_000
+    NUM_CORES = 4
+    SEMENTE = 42
+
+    print(f"Gerando grafos com {NUM_VERTICES} vértices...")
+    # Grau médio 4 é fácil para 4 cores; grau médio 7 fica mais perto do limiar de colorabilidade.
+    # Grafos geométricos têm regiões localmente densas: com 100 mil pontos quase sempre há alguma
+    # clique maior que o número de cores, e o histórico mostra o platô de conflitos residuais
+    instancias = [
+        ('aleatorio-grau4', *gerar_grafo_aleatorio(NUM_VERTICES, 4.0, NUM_CORES, SEMENTE)),
+        ('aleatorio-grau7', *gerar_grafo_aleatorio(NUM_VERTICES, 7.0, NUM_CORES, SEMENTE)),
+        ('geometrico-grau3', *gerar_grafo_geometrico(NUM_VERTICES, 3.0, NUM_CORES + 1, SEMENTE)[:3]),
+    ]
+
+    for nome, variaveis, dominios, restricoes in instancias:
+        print(f"\n--- Min-Conflicts: grafo {nome} ({NUM_VERTICES} vértices, {len(dominios[variaveis[0]])} cores) ---")
+        solucao, estatisticas = min_conflicts(variaveis, dominios, restricoes, max_passos=2_000_000,
+                                              limite_segundos=120, semente=SEMENTE, amostrar_a_cada=10_000)
+        print(f"{'Tempo (s)':>10} | {'Passo':>10} | {'Conflitos':>10}")
+        for segundos, passo, conflitos in estatisticas['historico']:
+            print(f"{segundos:>10.3f} | {passo:>10} | {conflitos:>10}")
+        if estatisticas['tempo_ate_zero'] is not None:
+            print(f"Zero conflitos em {estatisticas['tempo_ate_zero']:.3f} s ({estatisticas['passos']} passos).")
+        else:
+            print(f"Parou com {estatisticas['conflitos']} conflitos após {estatisticas['passos']} passos.")
@@ -0,0 +1,667 @@
+"""
+PROJETO 5 (MOTOR): BACKTRACKING PARA CSPs BINÁRIOS DE DIFERENÇA
+
+Núcleo de busca usado por `csp_mapa_visual.py`, sem nenhuma dependência gráfica.
+Os domínios são bitsets (inteiros do Python) sobre uma lista fixa de valores, e as
+remoções feitas pela propagação são registradas em uma trilha e desfeitas no
+backtrack, em vez de copiar todos os domínios a cada valor testado.
+
+Níveis de propagação disponíveis (parâmetro `propagacao`):
+- 'nenhuma': backtracking simples, apenas verifica os vizinhos já atribuídos;
+- 'fc': Forward Checking, poda os vizinhos diretos da variável atribuída;
+- 'mac': Maintaining Arc Consistency, roda AC-3 a partir da variável atribuída,
+  com cache de suportes residuais (no estilo do AC-2001).
+
+Com `backjumping=True` ('nenhuma' ou 'fc'), a busca usa Conflict-Directed Backjumping
+e pode reaproveitar falhas aprendidas em um armazém limitado de nogoods.
+
+`resolver_por_componentes` separa o grafo de restrições em componentes conexos e
+resolve cada um independentemente (os grandes em paralelo, em um pool de processos).
+"""
+import heapq
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+# --- Domínios como Bitsets com Trilha de Desfazer ---
+
+class DominiosBitset:
+    """
+    Domínios de todas as variáveis, cada um representado por um inteiro cujo bit i
+    indica se `valores[i]` ainda é possível. Toda remoção empilha (variável, máscara
+    anterior) na trilha, e `desfazer` restaura o estado de qualquer marca anterior.
+    Se `ao_alterar` for definido, ele é chamado com a variável a cada alteração
+    (inclusive ao desfazer), para manter estruturas incrementais em dia.
+    """
+    def __init__(self, variaveis, dominios):
+        # Valores na ordem em que aparecem pela primeira vez: a ordem dos bits
+        # é a ordem em que a busca testa os valores
+        self.valores = []
+        self.indice_valor = {}
+        for var in variaveis:
+            for valor in dominios[var]:
+                if valor not in self.indice_valor:
+                    self.indice_valor[valor] = len(self.valores)
+                    self.valores.append(valor)
+        self.mascara = {var: self.mascara_de(dominios[var]) for var in variaveis}
+        self.trilha = []
+        self.ao_alterar = None
+
+    def mascara_de(self, valores):
+        """Converte uma coleção de valores em máscara de bits."""
+        mascara = 0
+        for valor in valores:
+            mascara |= 1 << self.indice_valor[valor]
+        return mascara
+
+    def valores_da_mascara(self, mascara):
+        """Lista os valores de uma máscara, na ordem dos bits."""
+        valores = []
+        while mascara:
+            bit = mascara & -mascara
+            valores.append(self.valores[bit.bit_length() - 1])
+            mascara ^= bit
+        return valores
+
+    def valores_de(self, var):
+        return self.valores_da_mascara(self.mascara[var])
+
+    def tamanho(self, var):
+        return self.mascara[var].bit_count()
+
+    def contem(self, var, valor):
+        return bool(self.mascara[var] >> self.indice_valor[valor] & 1)
+
+    def restringir(self, var, mascara):
+        """Substitui o domínio de `var` por `mascara`, registrando a alteração na trilha."""
+        if mascara != self.mascara[var]:
+            self.trilha.append((var, self.mascara[var]))
+            self.mascara[var] = mascara
+            if self.ao_alterar: self.ao_alterar(var)
+
+    def remover(self, var, valor):
+        """Remove `valor` do domínio de `var`, registrando a alteração na trilha."""
+        bit = 1 << self.indice_valor[valor]
+        mascara = self.mascara[var]
+        if mascara & bit:
+            self.trilha.append((var, mascara))
+            self.mascara[var] = mascara ^ bit
+            if self.ao_alterar: self.ao_alterar(var)
+
+    def marcar(self):
+        """Marca o ponto atual da trilha para um futuro `desfazer`."""
+        return len(self.trilha)
+
+    def desfazer(self, marca):
+        """Restaura todos os domínios alterados desde `marca`."""
+        trilha = self.trilha
+        while len(trilha) > marca:
+            var, mascara = trilha.pop()
+            self.mascara[var] = mascara
+            if self.ao_alterar: self.ao_alterar(var)
+
+    def como_listas(self):
+        """Domínios no formato original (dicionário de listas), usado para desenhar."""
+        return {var: self.valores_da_mascara(mascara) for var, mascara in self.mascara.items()}
+
+# --- Funções Lógicas do CSP ---
+
+def novas_estatisticas():
+    """Contadores de desempenho preenchidos pela busca."""
+    return {'nos': 0, 'backtracks': 0, 'verificacoes': 0, 'podas': 0, 'tempo': 0.0, 'interrompida': False,
+            # Backjumping: falhas (domínio esgotado), saltos de mais de um nível e distância dos saltos
+            'falhas': 0, 'backjumps': 0, 'distancia_salto_total': 0, 'distancia_salto_max': 0,
+            # Nogoods: consultas ao armazém, acertos (valor descartado), aprendidos e descartados
+            'nogoods_consultas': 0, 'nogoods_acertos': 0, 'nogoods_aprendidos': 0, 'nogoods_descartados': 0}
+
+class LimiteDeNosAtingido(Exception):
+    """Interrompe a busca quando o limite de nós é ultrapassado."""
+
+def selecionar_variavel_mrv(atribuicao, variaveis, dominios):
+    variaveis_nao_atribuidas = [v for v in variaveis if v not in atribuicao]
+    return min(variaveis_nao_atribuidas, key=dominios.tamanho)
+
+# Heurísticas de variável: 'estatica' segue a ordem de `variaveis`; 'mrv' escolhe o menor
+# domínio (empate pela ordem de `variaveis`); 'mrv_grau' desempata pelo maior número de
+# vizinhos ainda não atribuídos; 'mrv_varredura' é o MRV original, que reescaneia todas as
+# variáveis a cada nó (O(V)), mantido como referência de comparação.
+HEURISTICAS_VARIAVEL = ('estatica', 'mrv', 'mrv_grau', 'mrv_varredura')
+
+class OrdemVariaveis:
+    """
+    Mantém as variáveis não atribuídas em um heap ordenado pela chave da heurística
+    (tamanho do domínio, grau dinâmico, posição), atualizado a cada alteração de domínio
+    ou atribuição. Entradas desatualizadas são descartadas de forma preguiçosa, de modo
+    que escolher a próxima variável custa O(log V) amortizado, e não O(V).
+    """
+    def __init__(self, heuristica, variaveis, dominios, restricoes, atribuicao):
+        self.heuristica = heuristica
+        self.variaveis = variaveis
+        self.dominios = dominios
+        self.restricoes = restricoes
+        self.atribuicao = atribuicao
+        self.posicao = {var: i for i, var in enumerate(variaveis)}
+        self.grau = {var: sum(1 for vizinho in restricoes[var] if vizinho not in atribuicao) for var in variaveis}
+        self.chave = {var: self._calcular_chave(var) for var in variaveis}
+        self._reconstruir_heap()
+
+    def _calcular_chave(self, var):
+        if self.heuristica == 'estatica':
+            return (self.posicao[var],)
+        if self.heuristica == 'mrv_grau':
+            return (self.dominios.tamanho(var), -self.grau[var], self.posicao[var])
+        return (self.dominios.tamanho(var), self.posicao[var])
+
+    def _reconstruir_heap(self):
+        self.heap = [(self.chave[var], var) for var in self.variaveis if var not in self.atribuicao]
+        heapq.heapify(self.heap)
+
+    def alterado(self, var):
+        """Recalcula a chave de `var` após uma mudança no seu domínio ou grau."""
+        chave = self._calcular_chave(var)
+        if chave != self.chave[var]:
+            self.chave[var] = chave
+            if var not in self.atribuicao:
+                heapq.heappush(self.heap, (chave, var))
+                if len(self.heap) > 4 * len(self.variaveis) + 64:
+                    self._reconstruir_heap()
+
+    def atribuir(self, var):
+        """Deve ser chamado logo após `var` entrar na atribuição."""
+        if self.heuristica == 'mrv_grau':
+            for vizinho in self.restricoes[var]:
+                self.grau[vizinho] -= 1
+                self.alterado(vizinho)
+
+    def desatribuir(self, var):
+        """Deve ser chamado logo após `var` sair da atribuição."""
+        if self.heuristica == 'mrv_grau':
+            for vizinho in self.restricoes[var]:
+                self.grau[vizinho] += 1
+                self.alterado(vizinho)
+        self.chave[var] = self._calcular_chave(var)
+        if self.heuristica != 'mrv_varredura':  # a varredura não usa o heap
+            heapq.heappush(self.heap, (self.chave[var], var))
+
+    def selecionar(self):
+        """Retorna a próxima variável a atribuir, segundo a heurística."""
+        if self.heuristica == 'mrv_varredura':
+            return selecionar_variavel_mrv(self.atribuicao, self.variaveis, self.dominios)
+        heap = self.heap
+        while True:
+            chave, var = heap[0]
+            if var not in self.atribuicao and self.chave[var] == chave:
+                return var
+            heapq.heappop(heap)
+
+# Ordenação de valores: 'fixa' testa na ordem dos domínios; 'lcv' (Least Constraining
+# Value) testa primeiro os valores que menos podam os domínios dos vizinhos não atribuídos.
+ORDENACOES_VALORES = ('fixa', 'lcv')
+
+def ordenar_valores_lcv(var, atribuicao, dominios, restricoes):
+    """Ordena os valores de `var` pelo número de podas que causariam nos vizinhos (empate: ordem original)."""
+    vizinhos_livres = [dominios.mascara[v] for v in restricoes[var] if v not in atribuicao]
+    valores = dominios.valores_de(var)
+    def podas(valor):
+        bit = 1 << dominios.indice_valor[valor]
+        return sum(1 for mascara in vizinhos_livres if mascara & bit)
+    return sorted(valores, key=podas)
+
+def consistente_com_atribuicao(var, valor, atribuicao, restricoes, estatisticas):
+    """Verifica `var = valor` contra os vizinhos já atribuídos (usado sem propagação)."""
+    for vizinho in restricoes[var]:
+        if vizinho in atribuicao:
+            estatisticas['verificacoes'] += 1
+            if atribuicao[vizinho] == valor:
+                return False
+    return True
+
+def forward_check(var, valor, dominios, restricoes, estatisticas=None):
+    for vizinho in restricoes[var]:
+        if estatisticas is not None: estatisticas['verificacoes'] += 1
+        if dominios.contem(vizinho, valor):
+            dominios.remover(vizinho, valor)
+            if estatisticas is not None: estatisticas['podas'] += 1
+            if not dominios.mascara[vizinho]:
+                return False
+    return True
+
+def revisar(xi, xj, dominios, residuos, estatisticas):
+    """
+    Remove de D(xi) os valores sem suporte em D(xj) para a restrição xi != xj.
+    O último suporte encontrado para cada valor fica em `residuos` e é testado
+    primeiro: enquanto continuar em D(xj), o valor é aceito com uma única verificação.
+    Retorna True se D(xi) foi alterado.
+    """
+    mascara_i = dominios.mascara[xi]
+    mascara_j = dominios.mascara[xj]
+    nova_mascara = mascara_i
+    restantes = mascara_i
+    while restantes:
+        bit = restantes & -restantes
+        restantes ^= bit
+        estatisticas['verificacoes'] += 1
+        residuo = residuos.get((xi, xj, bit))
+        if residuo is not None and mascara_j & residuo:
+            continue
+        # Qualquer valor de xj diferente do valor de xi é um suporte
+        suportes = mascara_j & ~bit
+        if suportes:
+            residuos[(xi, xj, bit)] = suportes & -suportes
+        else:
+            nova_mascara ^= bit
+    if nova_mascara != mascara_i:
+        estatisticas['podas'] += (mascara_i ^ nova_mascara).bit_count()
+        dominios.restringir(xi, nova_mascara)
+        return True
+    return False
+
+def ac3(dominios, restricoes, arcos, atribuicao, residuos, estatisticas):
+    """
+    Propaga consistência de arco a partir da fila inicial `arcos` (pares (xi, xj)).
+    Retorna False se algum domínio ficar vazio.
+    """
+    fila = deque(arcos)
+    na_fila = set(fila)
+    while fila:
+        arco = fila.popleft()
+        na_fila.discard(arco)
+        xi, xj = arco
+        if revisar(xi, xj, dominios, residuos, estatisticas):
+            if not dominios.mascara[xi]:
+                return False
+            for xk in restricoes[xi]:
+                if xk != xj and xk not in atribuicao and (xk, xi) not in na_fila:
+                    fila.append((xk, xi))
+                    na_fila.add((xk, xi))
+    return True
+
+def propagar(var, valor, atribuicao, dominios, restricoes, busca):
+    """Aplica o nível de propagação escolhido após `var = valor`."""
+    nivel = busca['propagacao']
+    estatisticas = busca['estatisticas']
+    if nivel == 'nenhuma':
+        return consistente_com_atribuicao(var, valor, atribuicao, restricoes, estatisticas)
+    if nivel == 'fc':
+        return forward_check(var, valor, dominios, restricoes, estatisticas)
+    # MAC: o domínio da variável atribuída passa a ser só o valor escolhido
+    dominios.restringir(var, 1 << dominios.indice_valor[valor])
+    arcos = [(vizinho, var) for vizinho in restricoes[var] if vizinho not in atribuicao]
+    return ac3(dominios, restricoes, arcos, atribuicao, busca['residuos'], estatisticas)
+
+NIVEIS_PROPAGACAO = ('nenhuma', 'fc', 'mac')
+
+# --- Conflict-Directed Backjumping e Nogoods ---
+
+_AUSENTE = object()
+
+class ArmazemNogoods:
+    """
+    Nogoods aprendidos: conjuntos de pares (variável, valor) que não podem fazer parte
+    de nenhuma solução. A capacidade é limitada e o nogood usado há mais tempo é
+    descartado primeiro (LRU). Um índice por par permite consultar só os nogoods
+    que mencionam o valor sendo testado.
+    """
+    def __init__(self, capacidade, tamanho_maximo):
+        self.capacidade = capacidade
+        self.tamanho_maximo = tamanho_maximo
+        self.nogoods = OrderedDict()
+        self.indice = {}
+
+    def aprender(self, pares, estatisticas):
+        if not pares or len(pares) > self.tamanho_maximo:
+            return
+        nogood = frozenset(pares)
+        if nogood in self.nogoods:
+            self.nogoods.move_to_end(nogood)
+            return
+        self.nogoods[nogood] = None
+        for par in nogood:
+            self.indice.setdefault(par, set()).add(nogood)
+        estatisticas['nogoods_aprendidos'] += 1
+        if len(self.nogoods) > self.capacidade:
+            antigo, _ = self.nogoods.popitem(last=False)
+            for par in antigo:
+                mencionam = self.indice[par]
+                mencionam.discard(antigo)
+                if not mencionam:
+                    del self.indice[par]
+            estatisticas['nogoods_descartados'] += 1
+
+    def violado(self, var, valor, atribuicao, estatisticas):
+        """Se `var = valor` completa um nogood, retorna as demais variáveis dele; senão None."""
+        estatisticas['nogoods_consultas'] += 1
+        for nogood in self.indice.get((var, valor), ()):
+            if all(atribuicao.get(v, _AUSENTE) == x for v, x in nogood if v != var):
+                self.nogoods.move_to_end(nogood)
+                estatisticas['nogoods_acertos'] += 1
+                return {v for v, _ in nogood if v != var}
+        return None
+
+def propagar_com_explicacao(var, valor, atribuicao, dominios, restricoes, busca, podados):
+    """
+    Propagação do CBJ: retorna None se `var = valor` for aceito, ou o conjunto de
+    variáveis passadas que explicam a falha. No Forward Checking, cada vizinho podado
+    registra `var` em busca['passado_fc'] (e em `podados`, para desfazer depois).
+    """
+    estatisticas = busca['estatisticas']
+    if busca['propagacao'] == 'nenhuma':
+        for vizinho in restricoes[var]:
+            if vizinho in atribuicao and vizinho != var:
+                estatisticas['verificacoes'] += 1
+                if atribuicao[vizinho] == valor:
+                    return {vizinho}
+        return None
+
+    passado_fc = busca['passado_fc']
+    for vizinho in restricoes[var]:
+        estatisticas['verificacoes'] += 1
+        if dominios.contem(vizinho, valor):
+            dominios.remover(vizinho, valor)
+            estatisticas['podas'] += 1
+            passado_fc[vizinho].append(var)
+            podados.append(vizinho)
+            if not dominios.mascara[vizinho]:
+                # O domínio do vizinho foi esvaziado por todas as variáveis que o podaram
+                return set(passado_fc[vizinho]) - {var}
+    return None
+
+def _backtracking_cbj(atribuicao, variaveis, dominios, restricoes, busca):
+    """
+    Backtracking com Conflict-Directed Backjumping (FC-CBJ). Retorna (solucao, None) em
+    caso de sucesso ou (None, conjunto_conflito) em caso de falha: quem recebe um
+    conjunto que não o menciona desiste dos valores restantes e repassa o conjunto
+    para cima, saltando direto para a variável culpada mais recente.
+    """
+    if len(atribuicao) == len(variaveis):
+        return atribuicao, None
+
+    observador = busca['observador']
+    estatisticas = busca['estatisticas']
+    ordem = busca['ordem']
+    nogoods = busca['nogoods']
+    profundidade = busca['profundidade']
+    var = ordem.selecionar()
+    profundidade[var] = len(atribuicao)
+    if busca['lcv']:
+        valores = ordenar_valores_lcv(var, atribuicao, dominios, restricoes)
+    else:
+        valores = dominios.valores_de(var)
+
+    conflito = set()
+    for valor in valores:
+        estatisticas['nos'] += 1
+        if busca['limite_nos'] is not None and estatisticas['nos'] > busca['limite_nos']:
+            raise LimiteDeNosAtingido()
+        if nogoods is not None:
+            culpados = nogoods.violado(var, valor, atribuicao, estatisticas)
+            if culpados is not None:
+                conflito |= culpados
+                continue
+
+        marca = dominios.marcar()
+        podados = []
+        atribuicao[var] = valor
+        ordem.atribuir(var)
+        if observador: observador('tentando', var, valor, atribuicao, dominios)
+
+        culpados = propagar_com_explicacao(var, valor, atribuicao, dominios, restricoes, busca, podados)
+        salto = None
+        if culpados is None:
+            if observador: observador('propagacao_ok', var, valor, atribuicao, dominios)
+            solucao, conflito_filho = _backtracking_cbj(atribuicao, variaveis, dominios, restricoes, busca)
+            if solucao is not None:
+                return solucao, None
+            if var in conflito_filho:
+                conflito |= conflito_filho - {var}
+            else:
+                # Esta variável não tem culpa da falha: o salto passa direto por ela
+                salto = conflito_filho
+        else:
+            conflito |= culpados
+
+        dominios.desfazer(marca)
+        for vizinho in podados:
+            busca['passado_fc'][vizinho].pop()
+        del atribuicao[var]
+        ordem.desatribuir(var)
+        estatisticas['backtracks'] += 1
+        if observador: observador('backtrack', var, valor, atribuicao, dominios)
+        if salto is not None:
+            return None, salto
+
+    # Domínio esgotado: a falha é explicada pelos conflitos e por quem podou esta variável
+    conflito |= set(busca['passado_fc'][var])
+    estatisticas['falhas'] += 1
+    if conflito:
+        distancia = profundidade[var] - max(profundidade[v] for v in conflito)
+        estatisticas['distancia_salto_total'] += distancia
+        estatisticas['distancia_salto_max'] = max(estatisticas['distancia_salto_max'], distancia)
+        if distancia > 1:
+            estatisticas['backjumps'] += 1
+    if nogoods is not None:
+        nogoods.aprender([(v, atribuicao[v]) for v in conflito], estatisticas)
+    return None, conflito
+
+def backtracking_search(atribuicao, variaveis, dominios, restricoes, observador=None,
+                        propagacao='fc', estatisticas=None, heuristica='mrv', limite_nos=None,
+                        ordenacao_valores='fixa', backjumping=False, capacidade_nogoods=0,
+                        tamanho_max_nogood=8):
+    """
+    Backtracking com a heurística de variável escolhida (ver HEURISTICAS_VARIAVEL), a
+    ordenação de valores escolhida ('fixa' ou 'lcv') e o nível de propagação escolhido
+    ('nenhuma', 'fc' ou 'mac').
+
+    `dominios` pode ser o dicionário de listas original ou um DominiosBitset. Se
+    `observador` for informado, ele é chamado como observador(evento, var, valor,
+    atribuicao, dominios) nos eventos 'tentando', 'propagacao_ok' e 'backtrack'.
+    Se `estatisticas` (ver novas_estatisticas) for informado, recebe o número de nós,
+    de backtracks, de verificações de restrição, de valores podados pela propagação e
+    o tempo de parede da busca. Com `limite_nos`, a busca é interrompida ao ultrapassar
+    esse número de nós: retorna None e marca estatisticas['interrompida'].
+
+    Com `backjumping=True` (propagação 'nenhuma' ou 'fc'), usa Conflict-Directed
+    Backjumping; se `capacidade_nogoods` > 0, as falhas aprendidas (até
+    `tamanho_max_nogood` variáveis) são guardadas e reaproveitadas em outros ramos.
+    As estatísticas passam a incluir distância dos saltos e acertos de nogoods.
+    """
+    if propagacao not in NIVEIS_PROPAGACAO:
+        raise ValueError(f"Nível de propagação desconhecido: {propagacao!r} (opções: {', '.join(NIVEIS_PROPAGACAO)})")
+    if heuristica not in HEURISTICAS_VARIAVEL:
+        raise ValueError(f"Heurística desconhecida: {heuristica!r} (opções: {', '.join(HEURISTICAS_VARIAVEL)})")
+    if ordenacao_valores not in ORDENACOES_VALORES:
+        raise ValueError(f"Ordenação de valores desconhecida: {ordenacao_valores!r} "
+                         f"(opções: {', '.join(ORDENACOES_VALORES)})")
+    if backjumping and propagacao == 'mac':
+        raise ValueError("Backjumping está disponível apenas com propagação 'nenhuma' ou 'fc'")
+    if not isinstance(dominios, DominiosBitset):
+        dominios = DominiosBitset(variaveis, dominios)
+    ordem = OrdemVariaveis(heuristica, variaveis, dominios, restricoes, atribuicao)
+    # Só as chaves baseadas em MRV dependem do tamanho dos domínios
+    dominios.ao_alterar = ordem.alterado if heuristica in ('mrv', 'mrv_grau') else None
+    # A recursão desce um nível por variável: grafos grandes precisam de mais pilha
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), len(variaveis) + 1000))
+    busca = {
+        'propagacao': propagacao,
+        'ordem': ordem,
+        'lcv': ordenacao_valores == 'lcv',
+        'limite_nos': limite_nos,
+        'observador': observador,
+        'estatisticas': estatisticas if estatisticas is not None else novas_estatisticas(),
+        'residuos': {},
+        'passado_fc': {var: [] for var in variaveis},
+        'profundidade': {},
+        'nogoods': ArmazemNogoods(capacidade_nogoods, tamanho_max_nogood) if capacidade_nogoods > 0 else None,
+    }
+    tempo_inicial = time.perf_counter()
+    resultado = None
+    # No MAC, o problema é tornado arco-consistente antes da primeira atribuição
+    try:
+        if propagacao != 'mac' or ac3(dominios, restricoes,
+                                     [(xi, xj) for xi in variaveis if xi not in atribuicao for xj in restricoes[xi]],
+                                     atribuicao, busca['residuos'], busca['estatisticas']):
+            if backjumping:
+                resultado, _ = _backtracking_cbj(atribuicao, variaveis, dominios, restricoes, busca)
+            else:
+                resultado = _backtracking(atribuicao, variaveis, dominios, restricoes, busca)
+    except LimiteDeNosAtingido:
+        busca['estatisticas']['interrompida'] = True
+    finally:
+        dominios.ao_alterar = None
+    busca['estatisticas']['tempo'] += time.perf_counter() - tempo_inicial
+    return resultado
+
+def _backtracking(atribuicao, variaveis, dominios, restricoes, busca):
+    # Condição de parada: sucesso!
+    if len(atribuicao) == len(variaveis):
+        return atribuicao
+
+    observador = busca['observador']
+    estatisticas = busca['estatisticas']
+    ordem = busca['ordem']
+    var = ordem.selecionar()
+    if busca['lcv']:
+        valores = ordenar_valores_lcv(var, atribuicao, dominios, restricoes)
+    else:
+        valores = dominios.valores_de(var)
+
+    # Tenta cada valor do domínio atual (fixado antes de a propagação alterá-lo)
+    for valor in valores:
+        marca = dominios.marcar()
+        estatisticas['nos'] += 1
+        if busca['limite_nos'] is not None and estatisticas['nos'] > busca['limite_nos']:
+            raise LimiteDeNosAtingido()
+        atribuicao[var] = valor
+        ordem.atribuir(var)
+        if observador: observador('tentando', var, valor, atribuicao, dominios)
+
+        if propagar(var, valor, atribuicao, dominios, restricoes, busca):
+            if observador: observador('propagacao_ok', var, valor, atribuicao, dominios)
+            resultado = _backtracking(atribuicao, variaveis, dominios, restricoes, busca)
+            if resultado is not None:
+                return resultado
+
+        # Backtrack: desfaz as podas deste valor em O(podas), sem cópias
+        dominios.desfazer(marca)
+        del atribuicao[var]
+        ordem.desatribuir(var)
+        estatisticas['backtracks'] += 1
+        if observador: observador('backtrack', var, valor, atribuicao, dominios)
+
+    return None
+
+def comparar_niveis_propagacao(variaveis, dominios, restricoes, niveis=NIVEIS_PROPAGACAO):
+    """Resolve o mesmo problema com cada nível de propagação e imprime nós, verificações e tempo."""
+    print(f"{'Propagação':<10} | {'Resolvido':>9} | {'Nós':>10} | {'Verificações':>12} | {'Tempo (s)':>10}")
+    resultados = {}
+    for nivel in niveis:
+        estatisticas = novas_estatisticas()
+        solucao = backtracking_search({}, variaveis, dominios, restricoes, propagacao=nivel, estatisticas=estatisticas)
+        resultados[nivel] = estatisticas
+        print(f"{nivel:<10} | {'sim' if solucao else 'não':>9} | {estatisticas['nos']:>10} | "
+              f"{estatisticas['verificacoes']:>12} | {estatisticas['tempo']:>10.4f}")
+    return resultados
+
+# --- Decomposição em Componentes Conexos ---
+
+def componentes_conexos(variaveis, restricoes):
+    """Separa as variáveis em componentes conexos do grafo de restrições (ordem de `variaveis` mantida)."""
+    componente_de = {}
+    componentes = []
+    for inicio in variaveis:
+        if inicio in componente_de:
+            continue
+        indice = len(componentes)
+        componente_de[inicio] = indice
+        fila = deque([inicio])
+        while fila:
+            var = fila.popleft()
+            for vizinho in restricoes[var]:
+                if vizinho not in componente_de:
+                    componente_de[vizinho] = indice
+                    fila.append(vizinho)
+        componentes.append([])
+    for var in variaveis:
+        componentes[componente_de[var]].append(var)
+    return componentes
+
+def _resolver_componente(atribuicao, variaveis, dominios, restricoes, configuracao):
+    """Resolve um componente isolado; função de módulo para poder rodar em outro processo."""
+    estatisticas = novas_estatisticas()
+    solucao = backtracking_search(atribuicao, variaveis, dominios, restricoes, estatisticas=estatisticas,
+                                  **configuracao)
+    return solucao, estatisticas
+
+def _somar_estatisticas(total, parcial):
+    for chave, valor in parcial.items():
+        if chave == 'distancia_salto_max':
+            total[chave] = max(total[chave], valor)
+        elif chave == 'interrompida':
+            total[chave] = total[chave] or valor
+        elif chave != 'tempo':
+            total[chave] += valor
+
+def resolver_por_componentes(atribuicao, variaveis, dominios, restricoes, estatisticas=None, processos=None,
+                             tamanho_min_paralelo=2000, **configuracao):
+    """
+    Resolve cada componente conexo do grafo de restrições com `backtracking_search`
+    (mesmos parâmetros em `configuracao`) e junta as soluções: o espaço de busca vira
+    a soma dos componentes em vez do produto. Componentes com pelo menos
+    `tamanho_min_paralelo` variáveis são resolvidos em um pool de `processos`
+    processos; os menores, no próprio processo. `limite_nos` vale por componente.
+
+    Retorna a atribuição completa ou None se algum componente não tiver solução.
+    As estatísticas somam as dos componentes; 'tempo' é o tempo de parede total e
+    'componentes' o número de componentes.
+    """
+    if isinstance(dominios, DominiosBitset):
+        dominios = dominios.como_listas()
+    if estatisticas is None:
+        estatisticas = novas_estatisticas()
+    tempo_inicial = time.perf_counter()
+    componentes = componentes_conexos(variaveis, restricoes)
+    estatisticas['componentes'] = len(componentes)
+
+    def subproblema(componente):
+        return ({var: atribuicao[var] for var in componente if var in atribuicao}, componente,
+                {var: dominios[var] for var in componente}, {var: restricoes[var] for var in componente},
+                configuracao)
+
+    grandes = [c for c in componentes if len(c) >= tamanho_min_paralelo]
+    pequenos = [c for c in componentes if len(c) < tamanho_min_paralelo]
+    # Um único componente grande não ganha nada com outro processo
+    if processos == 1 or len(grandes) < 2:
+        pequenos, grandes = componentes, []
+
+    # As soluções só entram em `atribuicao` se todos os componentes forem resolvidos
+    solucoes = {}
+    resultado = atribuicao
+    executor = ProcessPoolExecutor(processos) if grandes else None
+    try:
+        futuros = [executor.submit(_resolver_componente, *subproblema(c)) for c in grandes]
+        # Os componentes pequenos são resolvidos aqui enquanto os grandes rodam no pool
+        for componente in pequenos:
+            solucao, parcial = _resolver_componente(*subproblema(componente))
+            _somar_estatisticas(estatisticas, parcial)
+            if solucao is None:
+                resultado = None
+                break
+            solucoes.update(solucao)
+        for futuro in futuros:
+            if resultado is None:
+                futuro.cancel()
+                continue
+            solucao, parcial = futuro.result()
+            _somar_estatisticas(estatisticas, parcial)
+            if solucao is None:
+                resultado = None
+            else:
+                solucoes.update(solucao)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    if resultado is not None:
+        atribuicao.update(solucoes)
+    estatisticas['tempo'] += time.perf_counter() - tempo_inicial
+    return resultado
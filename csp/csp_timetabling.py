@@ -4,37 +4,122 @@ PROJETO 5 (LABORATÓRIO): CSP - ALOCAÇÃO DE AULAS
 Esta versão final inclui um "laboratório de testes" para experimentar
 diferentes configurações de variáveis, domínios e restrições, e analisar
 o impacto no resultado da busca. (Versão com correção de sintaxe)
+
+Professores, salas e horários são internados como IDs inteiros e cada valor
+(professor, sala, horário) é empacotado em um único inteiro; os domínios são
+arrays NumPy desses códigos. As strings só aparecem ao imprimir.
 """
-import time
-import copy
+import json
+import multiprocessing
 import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
 # --- 1. FUNÇÕES DO MODELO CSP ---
 
+class CodificacaoValores:
+    """
+    IDs de professores, salas e horários e o empacotamento de (professor, sala, horário)
+    no código (p * num_salas + s) * num_horarios + h.
+    """
+    def __init__(self, professores, salas, horarios):
+        self.professores = list(professores)
+        self.salas = list(salas)
+        self.horarios = list(horarios)
+        self.num_horarios = len(self.horarios)
+        self.por_professor = len(self.salas) * self.num_horarios
+        self.total = len(self.professores) * self.por_professor
+
+    def codificar(self, prof_id, sala_id, horario_id):
+        return prof_id * self.por_professor + sala_id * self.num_horarios + horario_id
+
+    def decodificar(self, codigo):
+        """Código -> (prof_id, sala_id, horario_id). Funciona também com arrays NumPy."""
+        return codigo // self.por_professor, codigo // self.num_horarios % len(self.salas), codigo % self.num_horarios
+
+    def como_tupla(self, codigo):
+        """Código -> (professor, sala, horário) com os nomes originais."""
+        prof_id, sala_id, horario_id = self.decodificar(int(codigo))
+        return self.professores[prof_id], self.salas[sala_id], self.horarios[horario_id]
+
+    def como_tuplas(self, atribuicao):
+        """Atribuição com códigos -> atribuição com tuplas de nomes (para imprimir e pontuar)."""
+        return {disciplina: self.como_tupla(codigo) for disciplina, codigo in atribuicao.items()}
+
 def gerar_dominios_iniciais(variaveis, professores, salas, horarios):
-    """Gera o domínio completo para cada disciplina (produto cartesiano)."""
-    dominio_completo = []
-    for prof in professores:
-        for sala in salas:
-            for horario in horarios:
-                dominio_completo.append((prof, sala, horario))
-    return {var: copy.deepcopy(dominio_completo) for var in variaveis}
-
-def aplicar_restricoes_iniciais(dominios, restricoes_duras):
-    """Pré-processa os domínios aplicando restrições unárias e de requisitos."""
-    dominios_podados = copy.deepcopy(dominios)
+    """
+    Gera o domínio completo para cada disciplina (produto cartesiano), já codificado.
+    Todas as disciplinas compartilham o mesmo array (somente leitura), sem cópias.
+    Retorna (codificacao, dominios).
+    """
+    codificacao = CodificacaoValores(professores, salas, horarios)
+    dominio_completo = np.arange(codificacao.total, dtype=np.int64)
+    return codificacao, {var: dominio_completo for var in variaveis}
+
+def aplicar_restricoes_iniciais(dominios, restricoes_duras, codificacao):
+    """
+    Pré-processa os domínios aplicando restrições unárias e de requisitos.
+    'requisito_sala'(disciplina, sala), 'capacitacao_prof'(disciplina, professor) e, se
+    existir, 'horario_permitido'(disciplina, horario) são avaliadas uma vez por sala,
+    professor e horário; a poda dos valores é vetorizada.
+    """
+    decodificados = {}
+    dominios_podados = {}
     for disciplina, valores in dominios.items():
-        valores_validos = []
-        for valor in valores:
-            if restricoes_duras['requisito_sala'](disciplina, valor) and \
-               restricoes_duras['capacitacao_prof'](disciplina, valor):
-                valores_validos.append(valor)
-        dominios_podados[disciplina] = valores_validos
+        # Domínios compartilhados são decodificados uma única vez
+        if id(valores) not in decodificados:
+            decodificados[id(valores)] = codificacao.decodificar(valores)
+        prof_ids, sala_ids, horario_ids = decodificados[id(valores)]
+        prof_ok = np.array([restricoes_duras['capacitacao_prof'](disciplina, prof) for prof in codificacao.professores],
+                           dtype=bool)
+        sala_ok = np.array([restricoes_duras['requisito_sala'](disciplina, sala) for sala in codificacao.salas],
+                           dtype=bool)
+        validos = prof_ok[prof_ids] & sala_ok[sala_ids]
+        if 'horario_permitido' in restricoes_duras:
+            horario_ok = np.array([restricoes_duras['horario_permitido'](disciplina, horario)
+                                   for horario in codificacao.horarios], dtype=bool)
+            validos &= horario_ok[horario_ids]
+        dominios_podados[disciplina] = valores[validos]
     return dominios_podados
 
-def is_consistent(disciplina, valor, atribuicao, restricoes_duras):
-    """Verifica se uma nova atribuição viola alguma RESTRIÇÃO DURA com as já existentes."""
-    return restricoes_duras['recurso_unico'](disciplina, valor, atribuicao)
+class OcupacaoRecursos:
+    """
+    Índices de ocupação (professor, horário) e (sala, horário) da atribuição parcial,
+    em bytearrays indexados pelos IDs. Ocupar, liberar e consultar custam O(1), em vez
+    de percorrer toda a atribuição.
+    """
+    def __init__(self, codificacao):
+        self.codificacao = codificacao
+        self.professores = bytearray(len(codificacao.professores) * codificacao.num_horarios)
+        self.salas = bytearray(len(codificacao.salas) * codificacao.num_horarios)
+
+    def _posicoes(self, valor):
+        prof_id, sala_id, horario_id = self.codificacao.decodificar(valor)
+        num_horarios = self.codificacao.num_horarios
+        return prof_id * num_horarios + horario_id, sala_id * num_horarios + horario_id
+
+    def livre(self, valor):
+        prof, sala = self._posicoes(valor)
+        return not self.professores[prof] and not self.salas[sala]
+
+    def ocupar(self, valor):
+        prof, sala = self._posicoes(valor)
+        self.professores[prof] = 1
+        self.salas[sala] = 1
+
+    def liberar(self, valor):
+        prof, sala = self._posicoes(valor)
+        self.professores[prof] = 0
+        self.salas[sala] = 0
+
+def is_consistent(disciplina, valor, ocupacao):
+    """
+    Verifica se uma nova atribuição viola alguma RESTRIÇÃO DURA com as já existentes:
+    o professor e a sala não podem estar ocupados no mesmo horário.
+    """
+    return ocupacao.livre(valor)
 
 def calcular_penalidade(solucao, restricoes_suaves):
     """Calcula o "score" de uma solução baseado na violação de RESTRIÇÕES SUAVES."""
@@ -46,110 +131,587 @@ def calcular_penalidade(solucao, restricoes_suaves):
         violacoes.extend(v)
     return penalidade, violacoes
 
-def imprimir_passo_terminal(variaveis, atribuicao, melhor_score, status_texto):
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("--- Buscando Melhor Alocação ---")
-    print(f"Melhor Score Encontrado: {melhor_score if melhor_score != float('inf') else 'N/A'}")
-    print(f"Status: {status_texto}\n")
-    print("Atribuição Parcial:")
+# --- Relatórios de Progresso ---
+
+# Sequência ANSI: cursor para o início da tela e limpa até o fim (sem abrir um subprocesso)
+LIMPAR_TELA = "\033[H\033[J"
+
+def imprimir_passo_terminal(variaveis, atribuicao, melhor_score, status_texto, codificacao):
+    linhas = ["--- Buscando Melhor Alocação ---",
+              f"Melhor Score Encontrado: {melhor_score if melhor_score != float('inf') else 'N/A'}",
+              f"Status: {status_texto}\n",
+              "Atribuição Parcial:"]
     for disciplina in variaveis:
         if disciplina in atribuicao:
-            prof, sala, horario = atribuicao[disciplina]
-            print(f"- {disciplina:<10}: Professor {prof:<10} | {sala:<10} | {horario:<10}")
+            prof, sala, horario = codificacao.como_tupla(atribuicao[disciplina])
+            linhas.append(f"- {disciplina:<10}: Professor {prof:<10} | {sala:<10} | {horario:<10}")
         else:
-            print(f"- {disciplina:<10}: (não atribuído)")
-    time.sleep(0.01)
+            linhas.append(f"- {disciplina:<10}: (não atribuído)")
+    print(LIMPAR_TELA + "\n".join(linhas), flush=True)
+
+class RelatorioNulo:
+    """
+    Interface dos relatórios de progresso. A busca chama notificar(evento, var,
+    atribuicao, estado_busca) nos eventos 'tentando', 'solucao' e 'melhor_solucao', e
+    finalizar(estado_busca) no fim. Este não mostra nada (execuções sem terminal).
+    """
+    def notificar(self, evento, var, atribuicao, estado_busca):
+        pass
+
+    def finalizar(self, estado_busca):
+        pass
+
+class RelatorioTerminal(RelatorioNulo):
+    """Redesenha a atribuição parcial no terminal, no máximo `quadros_por_segundo` vezes por segundo."""
+    STATUS = {
+        'tentando': "Tentando {var}...",
+        'solucao': "Solução Válida Encontrada! Score: {score}.",
+        'melhor_solucao': "NOVA MELHOR SOLUÇÃO! Score: {score}",
+    }
+
+    def __init__(self, variaveis, codificacao, quadros_por_segundo=10):
+        self.variaveis = variaveis
+        self.codificacao = codificacao
+        self.intervalo = 1.0 / quadros_por_segundo
+        self.ultimo_quadro = float('-inf')
+
+    def notificar(self, evento, var, atribuicao, estado_busca):
+        agora = time.perf_counter()
+        # Novas melhores soluções sempre aparecem; o resto respeita o limite de quadros
+        if evento != 'melhor_solucao' and agora - self.ultimo_quadro < self.intervalo:
+            return
+        self.ultimo_quadro = agora
+        status = self.STATUS[evento].format(var=var, score=estado_busca['penalidade_parcial'])
+        imprimir_passo_terminal(self.variaveis, atribuicao, estado_busca['melhor_score'], status, self.codificacao)
+
+class RelatorioEventos(RelatorioNulo):
+    """
+    Registro estruturado: cada evento vira uma linha JSON em `caminho` ou, sem arquivo,
+    um dicionário em `eventos`. Com arquivo, a lista só é mantida com
+    `manter_em_memoria=True`, pois guarda um evento por nó da busca.
+    """
+    def __init__(self, caminho=None, manter_em_memoria=None):
+        self.eventos = []
+        self.arquivo = open(caminho, 'w') if caminho else None
+        self.manter_em_memoria = not caminho if manter_em_memoria is None else manter_em_memoria
+        self.tempo_inicial = time.perf_counter()
+
+    def notificar(self, evento, var, atribuicao, estado_busca):
+        registro = {'t': time.perf_counter() - self.tempo_inicial, 'evento': evento, 'var': var,
+                    'atribuidas': len(atribuicao), 'penalidade_parcial': estado_busca['penalidade_parcial'],
+                    'melhor_score': None if estado_busca['melhor_score'] == float('inf') else estado_busca['melhor_score'],
+                    'nos': estado_busca['nos']}
+        if self.manter_em_memoria:
+            self.eventos.append(registro)
+        if self.arquivo:
+            self.arquivo.write(json.dumps(registro) + "\n")
+
+    def finalizar(self, estado_busca):
+        if self.arquivo:
+            self.arquivo.close()
+            self.arquivo = None
+
+def calcular_custos(variaveis, dominios, restricoes_suaves, codificacao):
+    """
+    Custo (penalidade suave) de cada valor de cada disciplina. As restrições suaves
+    somam penalidades por disciplina, então cada (disciplina, valor) é pontuado uma
+    vez. Reordena cada domínio de `dominios` por custo crescente e retorna os custos
+    alinhados a ele.
+    """
+    custos = {}
+    for var in variaveis:
+        custos_var = np.array([calcular_penalidade({var: codificacao.como_tupla(valor)}, restricoes_suaves)[0]
+                               for valor in dominios[var].tolist()])
+        ordem = np.argsort(custos_var, kind='stable')
+        dominios[var] = dominios[var][ordem]
+        custos[var] = custos_var[ordem]
+    return custos
+
+# --- Quebra de Simetria ---
+
+def _refinar(classes, assinaturas):
+    """Divide as classes atuais pelas assinaturas: ficam juntos só os itens com classe e assinatura iguais."""
+    novas = {}
+    return [novas.setdefault((classe, assinatura), len(novas)) for classe, assinatura in zip(classes, assinaturas)]
+
+def _agrupar(classes):
+    grupos = {}
+    for item, classe in enumerate(classes):
+        grupos.setdefault(classe, []).append(item)
+    return list(grupos.values())
+
+def detectar_valores_intercambiaveis(variaveis, dominios, custos, codificacao):
+    """
+    Classes de salas e de horários intercambiáveis: trocar duas salas (ou dois horários)
+    da mesma classe em todos os valores preserva o domínio e os custos de cada disciplina.
+    Os conflitos de professor e de sala não distinguem salas nem horários, então a troca
+    preserva o problema inteiro. Retorna (classes_salas, classes_horarios), listas de
+    listas de IDs em ordem crescente.
+    """
+    num_salas, num_horarios = len(codificacao.salas), codificacao.num_horarios
+    classe_sala = [0] * num_salas
+    classe_horario = [0] * num_horarios
+    for var in variaveis:
+        # Tabela professor x sala x horário com o custo do valor, ou NaN fora do domínio.
+        # Só entram os professores do domínio: as outras linhas seriam NaN em todas as salas
+        prof_ids, sala_ids, horario_ids = codificacao.decodificar(dominios[var])
+        professores, linhas = np.unique(prof_ids, return_inverse=True)
+        tabela = np.full((len(professores), num_salas, num_horarios), np.nan)
+        tabela[linhas, sala_ids, horario_ids] = custos[var]
+        classe_sala = _refinar(classe_sala, [tabela[:, sala, :].tobytes() for sala in range(num_salas)])
+        classe_horario = _refinar(classe_horario, [tabela[:, :, horario].tobytes() for horario in range(num_horarios)])
+        if len(set(classe_sala)) == num_salas and len(set(classe_horario)) == num_horarios:
+            break
+    return _agrupar(classe_sala), _agrupar(classe_horario)
+
+class QuebraSimetria:
+    """
+    Quebra lexicográfica da simetria entre valores intercambiáveis (precedência de
+    valores): dentro de uma classe, uma sala só é usada pela primeira vez depois da
+    sala anterior da classe. As salas ainda livres de uma classe são equivalentes, então
+    basta tentar a primeira delas; o mesmo vale para os horários.
+    """
+    def __init__(self, codificacao, classes_salas, classes_horarios):
+        self.codificacao = codificacao
+        self.classes_salas = classes_salas
+        self.classes_horarios = classes_horarios
+        self.anterior_sala = self._anteriores(classes_salas, len(codificacao.salas))
+        self.anterior_horario = self._anteriores(classes_horarios, codificacao.num_horarios)
+        self.uso_sala = [0] * len(codificacao.salas)
+        self.uso_horario = [0] * codificacao.num_horarios
+
+    @staticmethod
+    def _anteriores(classes, quantidade):
+        anteriores = [-1] * quantidade
+        for classe in classes:
+            for anterior, item in zip(classe, classe[1:]):
+                anteriores[item] = anterior
+        return anteriores
 
-def backtracking_otimizado_terminal(variaveis, atribuicao, variaveis_restantes, dominios, estado_busca, restricoes_duras, restricoes_suaves):
+    def permitido(self, valor):
+        _, sala, horario = self.codificacao.decodificar(valor)
+        anterior = self.anterior_sala[sala]
+        if anterior >= 0 and not self.uso_sala[sala] and not self.uso_sala[anterior]:
+            return False
+        anterior = self.anterior_horario[horario]
+        return anterior < 0 or self.uso_horario[horario] > 0 or self.uso_horario[anterior] > 0
+
+    def ocupar(self, valor):
+        _, sala, horario = self.codificacao.decodificar(valor)
+        self.uso_sala[sala] += 1
+        self.uso_horario[horario] += 1
+
+    def liberar(self, valor):
+        _, sala, horario = self.codificacao.decodificar(valor)
+        self.uso_sala[sala] -= 1
+        self.uso_horario[horario] -= 1
+
+def novo_estado_busca(variaveis, dominios, restricoes_suaves, codificacao, relatorio=None, custos=None,
+                      limite_nos=None, quebrar_simetria=False, limite_segundos=None):
+    """
+    Estado compartilhado da busca branch-and-bound. A penalidade da atribuição parcial
+    é mantida incrementalmente e o limite inferior das disciplinas restantes é a soma
+    dos seus menores custos. Sem `custos` já calculados (ver calcular_custos), eles são
+    calculados aqui. `relatorio` recebe os eventos da busca (padrão: RelatorioNulo).
+    Com `limite_nos` ou `limite_segundos`, a busca para ao atingir esse número de nós ou
+    esse tempo desde 'tempo_inicial' e marca 'interrompida'; com 'parar_na_primeira',
+    para na primeira solução. Cada melhoria entra em 'historico' como (segundos, penalidade).
+    Com `quebrar_simetria`, salas e horários intercambiáveis são detectados e só a
+    primeira sala (horário) livre de cada classe é tentada (ver QuebraSimetria).
+    """
+    if custos is None:
+        custos = calcular_custos(variaveis, dominios, restricoes_suaves, codificacao)
+    simetria = None
+    if quebrar_simetria:
+        simetria = QuebraSimetria(codificacao, *detectar_valores_intercambiaveis(variaveis, dominios, custos, codificacao))
+    custo_minimo = {var: custos[var][0].item() if len(custos[var]) else 0 for var in variaveis}
+    return {
+        'melhor_solucao': None, 'melhor_score': float('inf'),
+        'codificacao': codificacao, 'relatorio': relatorio if relatorio is not None else RelatorioNulo(),
+        'custos': custos, 'custo_minimo': custo_minimo,
+        'penalidade_parcial': 0, 'limite_restante': sum(custo_minimo.values()),
+        'ocupacao': OcupacaoRecursos(codificacao), 'simetria': simetria,
+        'melhor_compartilhado': None,
+        'nos': 0, 'podas_limite': 0, 'podas_simetria': 0, 'limite_nos': limite_nos, 'interrompida': False,
+        'limite_segundos': limite_segundos, 'parar_na_primeira': False,
+        'tempo_inicial': time.time(), 'tempo_melhor_solucao': None, 'historico': [],
+    }
+
+def backtracking_otimizado_terminal(variaveis, atribuicao, variaveis_restantes, dominios, estado_busca):
     if estado_busca['melhor_score'] == 0: return
+    relatorio = estado_busca['relatorio']
+    compartilhado = estado_busca['melhor_compartilhado']
 
     if not variaveis_restantes:
-        score_atual, violacoes = calcular_penalidade(atribuicao, restricoes_suaves)
-        status = f"Solução Válida Encontrada! Score: {score_atual}."
-        imprimir_passo_terminal(variaveis, atribuicao, estado_busca['melhor_score'], status)
-        time.sleep(0.5)
+        score_atual = estado_busca['penalidade_parcial']
+        relatorio.notificar('solucao', None, atribuicao, estado_busca)
         if score_atual < estado_busca['melhor_score']:
             estado_busca['melhor_score'] = score_atual
-            estado_busca['melhor_solucao'] = copy.deepcopy(atribuicao)
-            status = f"NOVA MELHOR SOLUÇÃO! Score: {score_atual}"
-            imprimir_passo_terminal(variaveis, atribuicao, estado_busca['melhor_score'], status)
-            time.sleep(0.5)
+            estado_busca['melhor_solucao'] = dict(atribuicao)
+            estado_busca['tempo_melhor_solucao'] = time.time() - estado_busca['tempo_inicial']
+            estado_busca['historico'].append((estado_busca['tempo_melhor_solucao'], score_atual))
+            if compartilhado is not None:
+                compartilhado.propor(score_atual)
+            relatorio.notificar('melhor_solucao', None, atribuicao, estado_busca)
+        if estado_busca['parar_na_primeira']:
+            estado_busca['interrompida'] = True
         return
 
     var = variaveis_restantes[0]
-    for valor in dominios[var]:
-        if is_consistent(var, valor, atribuicao, restricoes_duras):
+    ocupacao = estado_busca['ocupacao']
+    simetria = estado_busca['simetria']
+    # O limite inferior de `var` é trocado pelo custo real do valor testado
+    estado_busca['limite_restante'] -= estado_busca['custo_minimo'][var]
+    valores = dominios[var].tolist()
+    custos = estado_busca['custos'][var].tolist()
+    # Na busca paralela, a melhor penalidade de qualquer processo também poda
+    melhor = estado_busca['melhor_score']
+    if compartilhado is not None and compartilhado.valor.value < melhor:
+        melhor = compartilhado.valor.value
+    for i, (valor, custo) in enumerate(zip(valores, custos)):
+        # Branch-and-bound: valores em ordem crescente de custo, então os seguintes também são podados
+        if estado_busca['penalidade_parcial'] + custo + estado_busca['limite_restante'] >= melhor:
+            estado_busca['podas_limite'] += len(valores) - i
+            break
+        if simetria is not None and not simetria.permitido(valor):
+            estado_busca['podas_simetria'] += 1
+            continue
+        if is_consistent(var, valor, ocupacao):
+            if estado_busca['limite_nos'] is not None and estado_busca['nos'] >= estado_busca['limite_nos']:
+                estado_busca['interrompida'] = True
+                break
+            # O relógio só é consultado a cada 1024 nós
+            if (estado_busca['limite_segundos'] is not None and not estado_busca['nos'] & 1023 and
+                    time.time() - estado_busca['tempo_inicial'] >= estado_busca['limite_segundos']):
+                estado_busca['interrompida'] = True
+                break
+            estado_busca['nos'] += 1
             atribuicao[var] = valor
-            status = f"Tentando {var}..."
-            imprimir_passo_terminal(variaveis, atribuicao, estado_busca['melhor_score'], status)
-            backtracking_otimizado_terminal(variaveis, atribuicao, variaveis_restantes[1:], dominios, estado_busca, restricoes_duras, restricoes_suaves)
-            if estado_busca['melhor_score'] == 0: return
+            ocupacao.ocupar(valor)
+            if simetria is not None:
+                simetria.ocupar(valor)
+            estado_busca['penalidade_parcial'] += custo
+            relatorio.notificar('tentando', var, atribuicao, estado_busca)
+            backtracking_otimizado_terminal(variaveis, atribuicao, variaveis_restantes[1:], dominios, estado_busca)
+            estado_busca['penalidade_parcial'] -= custo
+            ocupacao.liberar(valor)
+            if simetria is not None:
+                simetria.liberar(valor)
             del atribuicao[var]
+            if estado_busca['melhor_score'] == 0 or estado_busca['interrompida']: break
+            melhor = estado_busca['melhor_score']
+            if compartilhado is not None and compartilhado.valor.value < melhor:
+                melhor = compartilhado.valor.value
+    estado_busca['limite_restante'] += estado_busca['custo_minimo'][var]
+
+def fixar_valores(estado_busca, fixas):
+    """
+    Aplica ao estado as atribuições fixas, uma lista de (disciplina, valor, custo):
+    ocupação, penalidade parcial e limite inferior. Retorna a atribuição parcial.
+    """
+    atribuicao = {}
+    for var, valor, custo in fixas:
+        atribuicao[var] = valor
+        estado_busca['ocupacao'].ocupar(valor)
+        if estado_busca['simetria'] is not None:
+            estado_busca['simetria'].ocupar(valor)
+        estado_busca['penalidade_parcial'] += custo
+        estado_busca['limite_restante'] -= estado_busca['custo_minimo'][var]
+    return atribuicao
+
+# --- Busca Paralela por Divisão de Domínios ---
+
+class LimiteCompartilhado:
+    """
+    Melhor penalidade conhecida por todos os processos, em memória compartilhada.
+    A leitura (valor.value) não usa trava; `propor` só grava se a penalidade for menor.
+    """
+    def __init__(self):
+        self.valor = multiprocessing.RawValue('d', float('inf'))
+        self.tempo = multiprocessing.RawValue('d', 0.0)
+        self.trava = multiprocessing.Lock()
+
+    def propor(self, score):
+        with self.trava:
+            if score < self.valor.value:
+                self.valor.value = score
+                self.tempo.value = time.time()
+
+def dividir_em_subproblemas(variaveis, dominios, estado_busca, profundidade):
+    """
+    Todas as atribuições consistentes das `profundidade` primeiras disciplinas, como
+    listas de (disciplina, valor, custo), das mais baratas para as mais caras. Com
+    quebra de simetria, os prefixos simétricos a outros já ficam de fora.
+    """
+    ocupacao = estado_busca['ocupacao']
+    simetria = estado_busca['simetria']
+    prefixos = []
+
+    def expandir(indice, prefixo, custo_total):
+        if indice == profundidade:
+            prefixos.append((custo_total, list(prefixo)))
+            return
+        var = variaveis[indice]
+        for valor, custo in zip(dominios[var].tolist(), estado_busca['custos'][var].tolist()):
+            if simetria is not None and not simetria.permitido(valor):
+                estado_busca['podas_simetria'] += 1
+                continue
+            if ocupacao.livre(valor):
+                ocupacao.ocupar(valor)
+                if simetria is not None:
+                    simetria.ocupar(valor)
+                prefixo.append((var, valor, custo))
+                expandir(indice + 1, prefixo, custo_total + custo)
+                prefixo.pop()
+                ocupacao.liberar(valor)
+                if simetria is not None:
+                    simetria.liberar(valor)
+
+    expandir(0, [], 0)
+    prefixos.sort(key=lambda item: item[0])
+    return [prefixo for _, prefixo in prefixos]
+
+# Modelo de cada processo do pool, recebido uma única vez pelo inicializador
+_MODELO_TRABALHADOR = {}
+
+def _inicializar_trabalhador(variaveis, dominios, custos, codificacao, compartilhado, classes_intercambiaveis,
+                             prazo=None):
+    _MODELO_TRABALHADOR.update(variaveis=variaveis, dominios=dominios, custos=custos, codificacao=codificacao,
+                               compartilhado=compartilhado, classes_intercambiaveis=classes_intercambiaveis,
+                               prazo=prazo)
+
+def _resolver_subproblema(prefixo):
+    """Resolve, em um processo do pool, o subproblema que começa com `prefixo`."""
+    modelo = _MODELO_TRABALHADOR
+    variaveis, dominios = modelo['variaveis'], modelo['dominios']
+    if modelo['prazo'] is not None and time.time() - modelo['prazo'][0] >= modelo['prazo'][1]:
+        return float('inf'), None, 0, 0, 0, True  # prazo esgotado: nem monta o subproblema
+    estado = novo_estado_busca(variaveis, dominios, None, modelo['codificacao'], custos=modelo['custos'])
+    estado['melhor_compartilhado'] = modelo['compartilhado']
+    if modelo['prazo'] is not None:
+        # Mesmo instante inicial da busca principal: todos os processos param no mesmo prazo
+        estado['tempo_inicial'], estado['limite_segundos'] = modelo['prazo']
+    if modelo['classes_intercambiaveis'] is not None:
+        estado['simetria'] = QuebraSimetria(modelo['codificacao'], *modelo['classes_intercambiaveis'])
+    atribuicao = fixar_valores(estado, prefixo)
+    backtracking_otimizado_terminal(variaveis, atribuicao, variaveis[len(prefixo):], dominios, estado)
+    return (estado['melhor_score'], estado['melhor_solucao'], estado['nos'], estado['podas_limite'],
+            estado['podas_simetria'], estado['interrompida'])
+
+def backtracking_paralelo(variaveis, dominios, estado_busca, processos=None, profundidade=2):
+    """
+    Divide os domínios das `profundidade` primeiras disciplinas em subproblemas e os
+    resolve em um pool de `processos` processos. Os processos compartilham a melhor
+    penalidade (LimiteCompartilhado), então uma solução encontrada em um deles poda
+    imediatamente a busca dos outros. Preenche `estado_busca` como a busca sequencial;
+    o `limite_segundos` do estado vale para todos os processos, contado do seu 'tempo_inicial'.
+    """
+    profundidade = min(profundidade, len(variaveis))
+    prefixos = dividir_em_subproblemas(variaveis, dominios, estado_busca, profundidade)
+    compartilhado = LimiteCompartilhado()
+    simetria = estado_busca['simetria']
+    classes = (simetria.classes_salas, simetria.classes_horarios) if simetria is not None else None
+    prazo = None
+    if estado_busca['limite_segundos'] is not None:
+        prazo = (estado_busca['tempo_inicial'], estado_busca['limite_segundos'])
+    argumentos = (variaveis, dominios, estado_busca['custos'], estado_busca['codificacao'], compartilhado, classes,
+                  prazo)
+    # Lotes de subproblemas por envio: com milhares de prefixos, um envio por prefixo domina o tempo
+    lote = max(1, len(prefixos) // (16 * (processos or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(processos, initializer=_inicializar_trabalhador, initargs=argumentos) as executor:
+        resultados = executor.map(_resolver_subproblema, prefixos, chunksize=lote)
+        for score, solucao, nos, podas, podas_simetria, interrompida in resultados:
+            estado_busca['nos'] += nos
+            estado_busca['podas_limite'] += podas
+            estado_busca['podas_simetria'] += podas_simetria
+            estado_busca['interrompida'] = estado_busca['interrompida'] or interrompida
+            if score < estado_busca['melhor_score']:
+                estado_busca['melhor_score'] = score
+                estado_busca['melhor_solucao'] = solucao
+    if estado_busca['melhor_solucao'] is not None:
+        estado_busca['tempo_melhor_solucao'] = compartilhado.tempo.value - estado_busca['tempo_inicial']
+    estado_busca['subproblemas'] = len(prefixos)
+
+# --- Busca em Vizinhança Grande (LNS) ---
+
+VIZINHANCAS = ('professor', 'sala', 'horario')
+
+def escolher_vizinhanca(solucao, codificacao, tamanho, rng):
+    """
+    Sorteia um tipo de recurso (professor, sala ou horário) e libera as disciplinas de
+    um recurso sorteado desse tipo, completando com as de outros recursos do mesmo tipo
+    até `tamanho` disciplinas. Retorna (tipo, disciplinas liberadas).
+    """
+    indice = rng.randrange(len(VIZINHANCAS))
+    por_recurso = {}
+    for var, valor in solucao.items():
+        por_recurso.setdefault(codificacao.decodificar(valor)[indice], []).append(var)
+    recursos = list(por_recurso)
+    rng.shuffle(recursos)
+    livres = []
+    for recurso in recursos:
+        grupo = por_recurso[recurso]
+        # Ordem sorteada: vizinhanças repetidas não refazem a mesma busca limitada
+        rng.shuffle(grupo)
+        livres.extend(grupo)
+        if len(livres) >= tamanho:
+            break
+    return VIZINHANCAS[indice], livres[:tamanho]
+
+def custo_do_valor(dominios, custos, var, valor):
+    return custos[var][np.flatnonzero(dominios[var] == valor)[0]].item()
+
+def busca_lns(variaveis, dominios, estado_busca, limite_segundos=10.0, tamanho_vizinhanca=6, limite_nos=200,
+              atribuicao_inicial=None, max_iteracoes=None, semente=None, limite_nos_inicial=20000):
+    """
+    Busca em vizinhança grande (LNS), anytime. Sem `atribuicao_inicial`, roda antes o
+    branch-and-bound completo até `limite_nos_inicial` nós: se ele terminar, a solução
+    está provada ótima (ou o problema sem solução) e a LNS nem começa; senão, parte da
+    melhor solução que ele achou (ou da primeira encontrada depois). Então repete:
+    libera uma vizinhança (escolher_vizinhanca) e a resolve de novo com o
+    branch-and-bound, com as demais disciplinas fixas, até `limite_nos` nós e só
+    aceitando penalidade menor. Cada melhoria vai para o relatório e para
+    estado_busca['historico']. Para em `limite_segundos`, em `max_iteracoes` ou ao
+    alcançar o limite inferior; 'interrompida' só fica falso com o ótimo provado (pela
+    busca inicial, pelo limite inferior ou por uma vizinhança do tamanho do problema).
+    """
+    rng = random.Random(semente)
+    codificacao, custos = estado_busca['codificacao'], estado_busca['custos']
+    relatorio = estado_busca['relatorio']
+    tempo_inicial = estado_busca['tempo_inicial']
+    limite_inferior = sum(estado_busca['custo_minimo'].values())
+    estado_busca.update(iteracoes=0, melhorias={tipo: 0 for tipo in VIZINHANCAS}, interrompida=True)
+
+    provado = False
+    if atribuicao_inicial is None:
+        inicial = novo_estado_busca(variaveis, dominios, None, codificacao, custos=custos,
+                                    limite_nos=limite_nos_inicial, limite_segundos=limite_segundos)
+        inicial['tempo_inicial'] = tempo_inicial
+        backtracking_otimizado_terminal(variaveis, {}, list(variaveis), dominios, inicial)
+        estado_busca['nos'] += inicial['nos']
+        estado_busca['podas_limite'] += inicial['podas_limite']
+        if inicial['melhor_solucao'] is None and inicial['interrompida']:
+            # Nenhuma solução no limite de nós: basta a primeira, dentro do tempo
+            inicial = novo_estado_busca(variaveis, dominios, None, codificacao, custos=custos,
+                                        limite_segundos=limite_segundos)
+            inicial['tempo_inicial'] = tempo_inicial
+            inicial['parar_na_primeira'] = True
+            backtracking_otimizado_terminal(variaveis, {}, list(variaveis), dominios, inicial)
+            estado_busca['nos'] += inicial['nos']
+            estado_busca['podas_limite'] += inicial['podas_limite']
+        if inicial['melhor_solucao'] is None:
+            # Sem interrupção, a busca completa provou que não há solução
+            estado_busca['interrompida'] = inicial['interrompida']
+            return
+        atribuicao_inicial = inicial['melhor_solucao']
+        # Busca completa terminada (a da primeira solução sempre para interrompida): a solução já é ótima
+        provado = not inicial['interrompida']
+    solucao = dict(atribuicao_inicial)
+    custo_atual = {var: custo_do_valor(dominios, custos, var, valor) for var, valor in solucao.items()}
+    score = sum(custo_atual.values())
+
+    def registrar_melhoria():
+        agora = time.time() - tempo_inicial
+        estado_busca.update(melhor_solucao=solucao, melhor_score=score, penalidade_parcial=score,
+                            tempo_melhor_solucao=agora)
+        estado_busca['historico'].append((agora, score))
+        relatorio.notificar('melhor_solucao', None, solucao, estado_busca)
+
+    registrar_melhoria()
+    while not provado and score > limite_inferior and time.time() - tempo_inicial < limite_segundos:
+        if max_iteracoes is not None and estado_busca['iteracoes'] >= max_iteracoes:
+            break
+        estado_busca['iteracoes'] += 1
+        tipo, livres = escolher_vizinhanca(solucao, codificacao, tamanho_vizinhanca, rng)
+        conjunto_livres = set(livres)
+        sub = novo_estado_busca(variaveis, dominios, None, codificacao, custos=custos, limite_nos=limite_nos)
+        atribuicao = fixar_valores(sub, [(var, valor, custo_atual[var]) for var, valor in solucao.items()
+                                         if var not in conjunto_livres])
+        sub['melhor_score'] = score
+        backtracking_otimizado_terminal(variaveis, atribuicao, livres, dominios, sub)
+        estado_busca['nos'] += sub['nos']
+        estado_busca['podas_limite'] += sub['podas_limite']
+        if sub['melhor_solucao'] is not None:
+            solucao, score = sub['melhor_solucao'], sub['melhor_score']
+            for var in livres:
+                custo_atual[var] = custo_do_valor(dominios, custos, var, solucao[var])
+            estado_busca['melhorias'][tipo] += 1
+            registrar_melhoria()
+        elif not sub['interrompida'] and len(livres) == len(variaveis):
+            # A vizinhança era o problema inteiro e foi esgotada: a solução atual é ótima
+            provado = True
+            break
+    estado_busca['interrompida'] = not provado and score > limite_inferior
 
 # --- 2. LABORATÓRIO DE TESTES ---
 if __name__ == "__main__":
-    CENARIO_TESTE = 1
-    print(f"--- EXECUTANDO CENÁRIO DE TESTE #{CENARIO_TESTE} ---")
+    from timetabling_instancias import carregar_instancia, montar_modelo
 
-    VARIAVEIS = ['IA', 'Cálculo', 'Física', 'Química']
-    SALAS = ['Sala 101', 'Lab A']
-    HORARIOS = ['Seg-Manhã', 'Seg-Tarde', 'Ter-Manhã']
+    # Cenários em csp/instancias: cenario1.json (base), cenario2.json (sem a professora Marie)
+    # e cenario3.json (preferência extra de sala para Física). Aceita também diretórios de CSVs.
+    ARQUIVO_INSTANCIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instancias', 'cenario1.json')
+    # Progresso: 'terminal' (redesenho limitado), 'eventos' (registro JSON) ou 'nulo' (sem saída)
+    MODO_RELATORIO = 'terminal'
+    QUADROS_POR_SEGUNDO = 10
+    ARQUIVO_EVENTOS = 'eventos_timetabling.jsonl'
+    # Com mais de um processo, os domínios das primeiras disciplinas são divididos em um pool
+    PROCESSOS = 1
+    # Tenta só a primeira sala/horário livre de cada classe de valores intercambiáveis
+    QUEBRAR_SIMETRIA = True
+    # 'exata' (branch-and-bound até provar o ótimo) ou 'lns' (vizinhança grande, anytime)
+    MODO_BUSCA = 'exata'
+    LIMITE_SEGUNDOS_LNS = 10
 
-    if CENARIO_TESTE == 2:
-        PROFESSORES = ['Fabiano', 'Newton', 'Einstein']
-    else:
-        PROFESSORES = ['Fabiano', 'Newton', 'Einstein', 'Marie']
-
-    RESTRICOES_DURAS = {
-        'requisito_sala': lambda disc, val: not ((disc in ['IA', 'Cálculo'] and val[1] != 'Sala 101') or \
-                                                 (disc in ['Física', 'Química'] and val[1] != 'Lab A')),
-        'capacitacao_prof': lambda disc, val: not (disc == 'IA' and val[0] != 'Fabiano'),
-        'recurso_unico': lambda disc, val, atr: not any(
-            (val[0] == v[0]) or \
-            (val[1] == v[1] and val[2] == v[2]) \
-            for v in atr.values()
-        )
-    }
-    
-    # --- CORREÇÃO DE SINTAXE APLICADA AQUI ---
-    RESTRICOES_SUAVES = [
-        lambda sol: (
-            sum(1 for v in sol.values() if v[0] == 'Einstein' and 'Tarde' in v[2]),
-            [f"Einstein alocado à tarde ({d})" for d, v in sol.items() if v[0] == 'Einstein' and 'Tarde' in v[2]]
-        ),
-        lambda sol: (
-            sum(1 for v in sol.values() if v[0] == 'Marie' and v[1] != 'Sala 101'),
-            [f"Marie alocada fora da Sala 101 ({d})" for d, v in sol.items() if v[0] == 'Marie' and v[1] != 'Sala 101']
-        )
-    ]
-    
-    if CENARIO_TESTE == 3:
-        RESTRICOES_SUAVES.append(
-            lambda sol: (1, [f"Física não alocada na Sala 101"]) if 'Física' in sol and sol['Física'][1] != 'Sala 101' else (0, [])
-        )
+    instancia = carregar_instancia(ARQUIVO_INSTANCIA)
+    print(f"--- EXECUTANDO INSTÂNCIA {instancia['nome']} ---")
 
     print("Configurando o problema...")
-    dominios = gerar_dominios_iniciais(VARIAVEIS, PROFESSORES, SALAS, HORARIOS)
-    dominios_podados = aplicar_restricoes_iniciais(dominios, RESTRICOES_DURAS)
+    VARIAVEIS, codificacao, dominios_podados, custos, RESTRICOES_SUAVES = montar_modelo(instancia)
+    print(f"Valores nos domínios após a poda: {sum(len(d) for d in dominios_podados.values())} "
+          f"({sum(d.nbytes for d in dominios_podados.values()) / 1024:.1f} KB)")
     
-    if any(not d for d in dominios_podados.values()):
+    if any(len(d) == 0 for d in dominios_podados.values()):
         problema_insolúvel = True
     else:
         problema_insolúvel = False
-        estado_da_busca = {'melhor_solucao': None, 'melhor_score': float('inf')}
+        if MODO_RELATORIO == 'terminal':
+            relatorio = RelatorioTerminal(VARIAVEIS, codificacao, QUADROS_POR_SEGUNDO)
+        elif MODO_RELATORIO == 'eventos':
+            relatorio = RelatorioEventos(ARQUIVO_EVENTOS)
+        else:
+            relatorio = RelatorioNulo()
+        estado_da_busca = novo_estado_busca(VARIAVEIS, dominios_podados, RESTRICOES_SUAVES, codificacao, relatorio,
+                                            custos=custos, quebrar_simetria=QUEBRAR_SIMETRIA)
         print("\nIniciando busca...")
-        tempo_inicial = time.time()
-        backtracking_otimizado_terminal(VARIAVEIS, {}, list(VARIAVEIS), dominios_podados, estado_da_busca, RESTRICOES_DURAS, RESTRICOES_SUAVES)
+        tempo_inicial = estado_da_busca['tempo_inicial'] = time.time()
+        if MODO_BUSCA == 'lns':
+            busca_lns(VARIAVEIS, dominios_podados, estado_da_busca, LIMITE_SEGUNDOS_LNS)
+        elif PROCESSOS > 1:
+            backtracking_paralelo(VARIAVEIS, dominios_podados, estado_da_busca, PROCESSOS)
+        else:
+            backtracking_otimizado_terminal(VARIAVEIS, {}, list(VARIAVEIS), dominios_podados, estado_da_busca)
         tempo_total = time.time() - tempo_inicial
+        relatorio.finalizar(estado_da_busca)
 
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print(f"--- Relatório Final (Cenário #{CENARIO_TESTE}) ---")
+    if MODO_RELATORIO == 'terminal':
+        print(LIMPAR_TELA, end='')
+    print(f"--- Relatório Final ({instancia['nome']}) ---")
     if not problema_insolúvel:
-        print(f"Tempo Total de Execução: {tempo_total:.2f} segundos")
+        if estado_da_busca['interrompida']:
+            print(f"Tempo Total de Execução (sem provar o ótimo): {tempo_total:.2f} segundos")
+        else:
+            print(f"Tempo Total de Execução (até provar o ótimo): {tempo_total:.2f} segundos")
+        if MODO_BUSCA == 'lns':
+            print(f"Iterações da LNS: {estado_da_busca['iteracoes']} | Melhorias por vizinhança: {estado_da_busca['melhorias']}")
+        if estado_da_busca['tempo_melhor_solucao'] is not None:
+            print(f"Tempo até encontrar a melhor solução: {estado_da_busca['tempo_melhor_solucao']:.2f} segundos")
+        print(f"Nós explorados: {estado_da_busca['nos']} | Ramos podados pelo limite inferior: {estado_da_busca['podas_limite']} "
+              f"| Valores simétricos descartados: {estado_da_busca['podas_simetria']}")
         if estado_da_busca['melhor_solucao']:
-            score_final, violacoes_finais = calcular_penalidade(estado_da_busca['melhor_solucao'], RESTRICOES_SUAVES)
+            melhor_solucao = codificacao.como_tuplas(estado_da_busca['melhor_solucao'])
+            score_final, violacoes_finais = calcular_penalidade(melhor_solucao, RESTRICOES_SUAVES)
             print(f"\n--- Melhor Solução Encontrada (Score de Penalidade: {score_final}) ---")
-            for disc, val in sorted(estado_da_busca['melhor_solucao'].items()):
+            for disc, val in sorted(melhor_solucao.items()):
                 print(f"- {disc:<10}: Professor {val[0]:<10} | {val[1]:<10} | {val[2]:<10}")
             if violacoes_finais:
                 print("\nPreferências Violadas:"); [print(f"  - {v}") for v in violacoes_finais]
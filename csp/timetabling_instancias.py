@@ -0,0 +1,362 @@
+"""
+PROJETO 5 (INSTÂNCIAS): ALOCAÇÃO DE AULAS EM ARQUIVOS
+
+Instâncias de alocação de aulas descritas em JSON (um arquivo) ou CSV (um diretório),
+com regras declarativas no lugar de lambdas, e um gerador com semente de instâncias
+de tamanho crescente. Uma instância é um dicionário:
+
+- 'disciplinas': [{'nome', 'tipo_sala'}]  (tipo_sala opcional)
+- 'professores': [{'nome', 'habilitacoes'}]  (lista de disciplinas; ausente = todas)
+- 'salas': [{'nome', 'tipo'}]
+- 'horarios': [nomes]
+- 'regras_duras': [{'tipo', ...}] com tipos 'sala_obrigatoria' (disciplina, salas)
+  e 'horarios_permitidos' (disciplina, horarios)
+- 'regras_suaves': [{'tipo', 'peso', ...}] com tipos 'professor_evita_horario'
+  (professor, horarios ou contem), 'professor_prefere_sala' (professor, salas),
+  'disciplina_prefere_sala' (disciplina, salas) e 'disciplina_prefere_horario'
+  (disciplina, horarios ou contem)
+
+Além das regras, a sala precisa ter o tipo exigido pela disciplina e o professor
+precisa estar habilitado nela.
+"""
+import csv
+import json
+import os
+import random
+import time
+import numpy as np
+
+from csp_timetabling import aplicar_restricoes_iniciais, gerar_dominios_iniciais
+
+TIPOS_REGRAS_DURAS = ('sala_obrigatoria', 'horarios_permitidos')
+TIPOS_REGRAS_SUAVES = ('professor_evita_horario', 'professor_prefere_sala', 'disciplina_prefere_sala',
+                       'disciplina_prefere_horario')
+
+# --- Leitura e Gravação ---
+
+def carregar_instancia(caminho):
+    """Carrega uma instância de um arquivo .json ou de um diretório de CSVs (ver carregar_csv)."""
+    if os.path.isdir(caminho):
+        instancia = carregar_csv(caminho)
+    else:
+        with open(caminho, encoding='utf-8') as arquivo:
+            instancia = json.load(arquivo)
+    instancia.setdefault('nome', os.path.splitext(os.path.basename(os.path.normpath(caminho)))[0])
+    validar_instancia(instancia)
+    return instancia
+
+def salvar_instancia(caminho, instancia):
+    """Grava a instância em JSON (caminho terminado em .json) ou como diretório de CSVs."""
+    if caminho.endswith('.json'):
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(instancia, arquivo, ensure_ascii=False, indent=1)
+    else:
+        salvar_csv(caminho, instancia)
+
+def _lista(texto):
+    """Campo CSV com itens separados por ';' -> lista (vazio -> None)."""
+    return [item.strip() for item in texto.split(';') if item.strip()] if texto else None
+
+def carregar_csv(diretorio):
+    """
+    Diretório com disciplinas.csv (nome, tipo_sala), professores.csv (nome, habilitacoes),
+    salas.csv (nome, tipo), horarios.csv (nome) e regras.csv (categoria, tipo, peso,
+    disciplina, professor, salas, horarios, contem). Listas usam ';' como separador.
+    """
+    def ler(nome):
+        with open(os.path.join(diretorio, nome), newline='', encoding='utf-8') as arquivo:
+            return list(csv.DictReader(arquivo))
+
+    instancia = {
+        'disciplinas': [{'nome': linha['nome'], 'tipo_sala': linha.get('tipo_sala') or None}
+                        for linha in ler('disciplinas.csv')],
+        'professores': [{'nome': linha['nome'], 'habilitacoes': _lista(linha.get('habilitacoes'))}
+                        for linha in ler('professores.csv')],
+        'salas': [{'nome': linha['nome'], 'tipo': linha.get('tipo') or None} for linha in ler('salas.csv')],
+        'horarios': [linha['nome'] for linha in ler('horarios.csv')],
+        'regras_duras': [],
+        'regras_suaves': [],
+    }
+    if os.path.exists(os.path.join(diretorio, 'regras.csv')):
+        for linha in ler('regras.csv'):
+            regra = {'tipo': linha['tipo']}
+            for campo in ('disciplina', 'professor', 'contem'):
+                if linha.get(campo):
+                    regra[campo] = linha[campo]
+            for campo in ('salas', 'horarios'):
+                if linha.get(campo):
+                    regra[campo] = _lista(linha[campo])
+            if linha['categoria'] == 'suave':
+                regra['peso'] = float(linha['peso']) if linha.get('peso') else 1
+                if regra['peso'] == int(regra['peso']):
+                    regra['peso'] = int(regra['peso'])
+                instancia['regras_suaves'].append(regra)
+            elif linha['categoria'] == 'dura':
+                instancia['regras_duras'].append(regra)
+            else:
+                raise ValueError(f"{diretorio}/regras.csv: categoria inválida {linha['categoria']!r} "
+                                 f"(use 'dura' ou 'suave')")
+    return instancia
+
+def salvar_csv(diretorio, instancia):
+    """Grava a instância no formato lido por carregar_csv."""
+    os.makedirs(diretorio, exist_ok=True)
+
+    def gravar(nome, campos, linhas):
+        with open(os.path.join(diretorio, nome), 'w', newline='', encoding='utf-8') as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=campos)
+            escritor.writeheader()
+            escritor.writerows(linhas)
+
+    gravar('disciplinas.csv', ['nome', 'tipo_sala'],
+           [{'nome': d['nome'], 'tipo_sala': d.get('tipo_sala') or ''} for d in instancia['disciplinas']])
+    gravar('professores.csv', ['nome', 'habilitacoes'],
+           [{'nome': p['nome'], 'habilitacoes': ';'.join(p.get('habilitacoes') or [])}
+            for p in instancia['professores']])
+    gravar('salas.csv', ['nome', 'tipo'], [{'nome': s['nome'], 'tipo': s.get('tipo') or ''} for s in instancia['salas']])
+    gravar('horarios.csv', ['nome'], [{'nome': h} for h in instancia['horarios']])
+    campos_regra = ['categoria', 'tipo', 'peso', 'disciplina', 'professor', 'salas', 'horarios', 'contem']
+    linhas = []
+    for categoria, chave in (('dura', 'regras_duras'), ('suave', 'regras_suaves')):
+        for regra in instancia.get(chave, []):
+            linha = {campo: regra.get(campo, '') for campo in campos_regra}
+            linha['categoria'] = categoria
+            for campo in ('salas', 'horarios'):
+                linha[campo] = ';'.join(regra.get(campo) or [])
+            linhas.append(linha)
+    gravar('regras.csv', campos_regra, linhas)
+
+def validar_instancia(instancia):
+    """Confere nomes repetidos, referências a itens inexistentes e tipos de regra."""
+    nomes = {}
+    for chave in ('disciplinas', 'professores', 'salas'):
+        nomes[chave] = [item['nome'] for item in instancia[chave]]
+    nomes['horarios'] = list(instancia['horarios'])
+    for chave, lista in nomes.items():
+        if len(set(lista)) != len(lista):
+            raise ValueError(f"Instância com {chave} repetidos")
+    conjuntos = {chave: set(lista) for chave, lista in nomes.items()}
+    for professor in instancia['professores']:
+        for disciplina in professor.get('habilitacoes') or []:
+            if disciplina not in conjuntos['disciplinas']:
+                raise ValueError(f"Professor {professor['nome']!r} habilitado em disciplina inexistente {disciplina!r}")
+    for chave, tipos in (('regras_duras', TIPOS_REGRAS_DURAS), ('regras_suaves', TIPOS_REGRAS_SUAVES)):
+        for regra in instancia.get(chave, []):
+            if regra.get('tipo') not in tipos:
+                raise ValueError(f"Tipo de regra desconhecido em {chave}: {regra.get('tipo')!r} "
+                                 f"(opções: {', '.join(tipos)})")
+            for campo, conjunto in (('disciplina', 'disciplinas'), ('professor', 'professores')):
+                if campo in regra and regra[campo] not in conjuntos[conjunto]:
+                    raise ValueError(f"Regra {regra['tipo']!r} cita {campo} inexistente {regra[campo]!r}")
+            for campo in ('salas', 'horarios'):
+                for item in regra.get(campo) or []:
+                    if item not in conjuntos[campo]:
+                        raise ValueError(f"Regra {regra['tipo']!r} cita item inexistente em {campo}: {item!r}")
+
+# --- Compilação das Regras ---
+
+def _horarios_da_regra(regra, horarios):
+    """Horários citados por uma regra: lista explícita ou os que contêm o texto de 'contem'."""
+    if 'contem' in regra:
+        return {horario for horario in horarios if regra['contem'] in horario}
+    return set(regra.get('horarios') or [])
+
+def compilar_restricoes(instancia):
+    """
+    Converte a instância em (restricoes_duras, restricoes_suaves) no formato de
+    `csp_timetabling.py`: predicados unários e funções solucao -> (penalidade, violações).
+    """
+    tipo_exigido = {d['nome']: d.get('tipo_sala') for d in instancia['disciplinas']}
+    tipo_sala = {s['nome']: s.get('tipo') for s in instancia['salas']}
+    habilitacoes = {p['nome']: set(p['habilitacoes']) if p.get('habilitacoes') else None
+                    for p in instancia['professores']}
+    salas_obrigatorias = {}
+    horarios_permitidos = {}
+    # Várias regras duras para a mesma disciplina se acumulam: vale a interseção
+    for regra in instancia.get('regras_duras', []):
+        if regra['tipo'] == 'sala_obrigatoria':
+            permitidos, valores = salas_obrigatorias, set(regra['salas'])
+        else:
+            permitidos, valores = horarios_permitidos, _horarios_da_regra(regra, instancia['horarios'])
+        if regra['disciplina'] in permitidos:
+            permitidos[regra['disciplina']] &= valores
+        else:
+            permitidos[regra['disciplina']] = valores
+
+    restricoes_duras = {
+        'requisito_sala': lambda disc, sala: (tipo_exigido[disc] is None or tipo_sala[sala] == tipo_exigido[disc]) and
+                                             (disc not in salas_obrigatorias or sala in salas_obrigatorias[disc]),
+        'capacitacao_prof': lambda disc, prof: habilitacoes[prof] is None or disc in habilitacoes[prof],
+        'horario_permitido': lambda disc, horario: disc not in horarios_permitidos or
+                                                   horario in horarios_permitidos[disc],
+    }
+    restricoes_suaves = [_compilar_regra_suave(regra, instancia['horarios'])
+                         for regra in instancia.get('regras_suaves', [])]
+    return restricoes_duras, restricoes_suaves
+
+def _compilar_regra_suave(regra, horarios):
+    peso = regra.get('peso', 1)
+    tipo = regra['tipo']
+    if tipo == 'professor_evita_horario':
+        prof, evitados = regra['professor'], _horarios_da_regra(regra, horarios)
+        viola = lambda d, v: v[0] == prof and v[2] in evitados
+        mensagem = "{prof} alocado em horário evitado ({disc}, {horario})"
+    elif tipo == 'professor_prefere_sala':
+        prof, salas = regra['professor'], set(regra['salas'])
+        viola = lambda d, v: v[0] == prof and v[1] not in salas
+        mensagem = "{prof} alocado fora das salas preferidas ({disc}, {sala})"
+    elif tipo == 'disciplina_prefere_sala':
+        disciplina, salas = regra['disciplina'], set(regra['salas'])
+        viola = lambda d, v: d == disciplina and v[1] not in salas
+        mensagem = "{disc} não alocada nas salas preferidas ({sala})"
+    else:
+        disciplina, preferidos = regra['disciplina'], _horarios_da_regra(regra, horarios)
+        viola = lambda d, v: d == disciplina and v[2] not in preferidos
+        mensagem = "{disc} fora dos horários preferidos ({horario})"
+
+    def penalidade(solucao):
+        violadas = [(d, v) for d, v in solucao.items() if viola(d, v)]
+        return peso * len(violadas), [mensagem.format(disc=d, prof=v[0], sala=v[1], horario=v[2])
+                                      for d, v in violadas]
+    return penalidade
+
+def calcular_custos_vetorizados(instancia, variaveis, dominios, codificacao):
+    """
+    Mesmo resultado de `calcular_custos` para as regras suaves declarativas, mas com
+    NumPy: as regras viram tabelas (professor x horário), (professor x sala),
+    (disciplina x sala) e (disciplina x horário), somadas nos IDs decodificados.
+    Reordena cada domínio por custo crescente e retorna os custos alinhados.
+    """
+    indice_prof = {nome: i for i, nome in enumerate(codificacao.professores)}
+    indice_sala = {nome: i for i, nome in enumerate(codificacao.salas)}
+    indice_horario = {nome: i for i, nome in enumerate(codificacao.horarios)}
+    num_profs, num_salas, num_horarios = len(indice_prof), len(indice_sala), len(indice_horario)
+    prof_horario = np.zeros((num_profs, num_horarios))
+    prof_sala = np.zeros((num_profs, num_salas))
+    disc_sala = {}
+    disc_horario = {}
+    for regra in instancia.get('regras_suaves', []):
+        peso = regra.get('peso', 1)
+        tipo = regra['tipo']
+        if tipo == 'professor_evita_horario':
+            for horario in _horarios_da_regra(regra, codificacao.horarios):
+                prof_horario[indice_prof[regra['professor']], indice_horario[horario]] += peso
+        elif tipo == 'professor_prefere_sala':
+            fora = np.ones(num_salas)
+            fora[[indice_sala[sala] for sala in regra['salas']]] = 0
+            prof_sala[indice_prof[regra['professor']]] += peso * fora
+        elif tipo == 'disciplina_prefere_sala':
+            fora = np.ones(num_salas)
+            fora[[indice_sala[sala] for sala in regra['salas']]] = 0
+            disc_sala[regra['disciplina']] = disc_sala.get(regra['disciplina'], 0) + peso * fora
+        else:
+            fora = np.ones(num_horarios)
+            fora[[indice_horario[h] for h in _horarios_da_regra(regra, codificacao.horarios)]] = 0
+            disc_horario[regra['disciplina']] = disc_horario.get(regra['disciplina'], 0) + peso * fora
+
+    custos = {}
+    for var in variaveis:
+        prof_ids, sala_ids, horario_ids = codificacao.decodificar(dominios[var])
+        custos_var = prof_horario[prof_ids, horario_ids] + prof_sala[prof_ids, sala_ids]
+        if var in disc_sala:
+            custos_var += disc_sala[var][sala_ids]
+        if var in disc_horario:
+            custos_var += disc_horario[var][horario_ids]
+        # Pesos inteiros mantêm penalidades inteiras, como na versão com lambdas
+        if np.all(custos_var == np.round(custos_var)):
+            custos_var = custos_var.astype(np.int64)
+        ordem = np.argsort(custos_var, kind='stable')
+        dominios[var] = dominios[var][ordem]
+        custos[var] = custos_var[ordem]
+    return custos
+
+def montar_modelo(instancia):
+    """
+    Instância -> (variaveis, codificacao, dominios, custos, restricoes_suaves), com
+    domínios já podados pelas regras duras e ordenados por custo.
+    """
+    variaveis = [d['nome'] for d in instancia['disciplinas']]
+    professores = [p['nome'] for p in instancia['professores']]
+    salas = [s['nome'] for s in instancia['salas']]
+    restricoes_duras, restricoes_suaves = compilar_restricoes(instancia)
+    codificacao, dominios = gerar_dominios_iniciais(variaveis, professores, salas, instancia['horarios'])
+    dominios = aplicar_restricoes_iniciais(dominios, restricoes_duras, codificacao)
+    custos = calcular_custos_vetorizados(instancia, variaveis, dominios, codificacao)
+    return variaveis, codificacao, dominios, custos, restricoes_suaves
+
+# --- Gerador com Semente ---
+
+def gerar_instancia(num_disciplinas, num_professores, num_salas, num_horarios, semente=None,
+                    tipos_sala=('teoria', 'laboratorio'), professores_por_disciplina=3,
+                    prob_preferencia_disciplina=0.0):
+    """
+    Instância aleatória viável: os tipos de sala se alternam entre salas e disciplinas,
+    cada disciplina tem `professores_por_disciplina` professores habilitados e cada
+    professor tem um horário preferido e penalidades de 1 a 3 nos demais. Com
+    probabilidade `prob_preferencia_disciplina`, uma disciplina também prefere um quarto
+    dos horários (peso de 1 a 5), o que desfavorece as escolhas gulosas.
+    """
+    rng = random.Random(semente)
+    disciplinas = [{'nome': f"Disc{i:03d}", 'tipo_sala': tipos_sala[i % len(tipos_sala)]}
+                   for i in range(num_disciplinas)]
+    nomes_professores = [f"Prof{i:03d}" for i in range(num_professores)]
+    salas = [{'nome': f"Sala{i:03d}", 'tipo': tipos_sala[i % len(tipos_sala)]} for i in range(num_salas)]
+    horarios = [f"H{i:02d}" for i in range(num_horarios)]
+
+    habilitacoes = {prof: [] for prof in nomes_professores}
+    for disciplina in disciplinas:
+        for prof in rng.sample(nomes_professores, min(professores_por_disciplina, num_professores)):
+            habilitacoes[prof].append(disciplina['nome'])
+    # Sem habilitações o professor ficaria livre para todas as disciplinas
+    professores = [{'nome': prof, 'habilitacoes': habilitacoes[prof]} for prof in nomes_professores
+                   if habilitacoes[prof]]
+
+    regras_suaves = []
+    for professor in professores:
+        preferido = rng.choice(horarios)
+        for horario in horarios:
+            if horario != preferido:
+                regras_suaves.append({'tipo': 'professor_evita_horario', 'professor': professor['nome'],
+                                      'horarios': [horario], 'peso': rng.randint(1, 3)})
+    if prob_preferencia_disciplina > 0:
+        for disciplina in disciplinas:
+            if rng.random() < prob_preferencia_disciplina:
+                regras_suaves.append({'tipo': 'disciplina_prefere_horario', 'disciplina': disciplina['nome'],
+                                      'horarios': rng.sample(horarios, max(1, num_horarios // 4)),
+                                      'peso': rng.randint(1, 5)})
+    return {'nome': f"gerada-{num_disciplinas}x{num_professores}x{num_salas}x{num_horarios}-s{semente}",
+            'disciplinas': disciplinas, 'professores': professores, 'salas': salas, 'horarios': horarios,
+            'regras_duras': [], 'regras_suaves': regras_suaves}
+
+# --- BLOCO PRINCIPAL DE EXECUÇÃO ---
+
+if __name__ == "__main__":
+    import tracemalloc
+
+    from csp_timetabling import backtracking_otimizado_terminal, novo_estado_busca
+
+    SEMENTE = 42
+    LIMITE_NOS = 20000
+    # (disciplinas, professores, salas, horários), até a escala de uma universidade
+    TAMANHOS = [(50, 20, 10, 20), (100, 40, 20, 25), (200, 80, 40, 30), (500, 200, 100, 50)]
+
+    print(f"{'Instância':<28} | {'Montagem (s)':>12} | {'Pico mem. (MB)':>14} | {'Valores':>10} | "
+          f"{'Domínios (MB)':>13} | {'Nós/s':>9} | {'Completa':>8} | {'Score':>7}")
+    for tamanho in TAMANHOS:
+        instancia = gerar_instancia(*tamanho, semente=SEMENTE)
+        tracemalloc.start()
+        tempo_inicial = time.perf_counter()
+        variaveis, codificacao, dominios, custos, _ = montar_modelo(instancia)
+        tempo_montagem = time.perf_counter() - tempo_inicial
+        pico = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+        # Vazão do solver: busca sem relatório, parada em LIMITE_NOS nós
+        estado = novo_estado_busca(variaveis, dominios, None, codificacao, custos=custos, limite_nos=LIMITE_NOS)
+        tempo_inicial = time.perf_counter()
+        backtracking_otimizado_terminal(variaveis, {}, list(variaveis), dominios, estado)
+        tempo_busca = time.perf_counter() - tempo_inicial
+        score = estado['melhor_score'] if estado['melhor_solucao'] is not None else '-'
+        print(f"{instancia['nome']:<28} | {tempo_montagem:>12.2f} | {pico:>14.1f} | "
+              f"{sum(len(d) for d in dominios.values()):>10} | {sum(d.nbytes for d in dominios.values()) / 1e6:>13.1f} | "
+              f"{estado['nos'] / tempo_busca:>9.0f} | {'sim' if estado['melhor_solucao'] else 'não':>8} | {score:>7}")
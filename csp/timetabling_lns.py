@@ -0,0 +1,61 @@
+"""
+PROJETO 5 (ANÁLISE): ALOCAÇÃO DE AULAS - LNS vs. BRANCH-AND-BOUND
+
+Em instâncias grandes, o branch-and-bound exaustivo de `csp_timetabling.py` acha uma
+primeira solução gulosa rapidamente, mas quase não a melhora no tempo disponível.
+Este script dá o mesmo tempo ao branch-and-bound e à busca em vizinhança grande
+(`busca_lns`) e compara a melhor penalidade de cada um ao longo do tempo.
+"""
+import time
+
+from csp_timetabling import backtracking_otimizado_terminal, busca_lns, novo_estado_busca
+from timetabling_instancias import gerar_instancia, montar_modelo
+
+def melhor_ate(historico, segundos):
+    """Melhor penalidade conhecida `segundos` após o início (None se ainda não havia solução)."""
+    melhor = None
+    for instante, penalidade in historico:
+        if instante > segundos:
+            break
+        melhor = penalidade
+    return melhor
+
+def executar_analise(tamanhos, limite_segundos, instantes, tamanho_vizinhanca, limite_nos, semente):
+    colunas = " | ".join(f"{f'{instante:g} s':>6}" for instante in instantes)
+    print(f"{'Instância':<26} | {'Busca':<6} | {'Lim. inf.':>9} | {colunas} | {'Nós':>9} | {'Iterações':>9}")
+    for tamanho in tamanhos:
+        instancia = gerar_instancia(*tamanho, semente=semente, prob_preferencia_disciplina=0.7)
+        variaveis, codificacao, dominios, custos, _ = montar_modelo(instancia)
+
+        exaustiva = novo_estado_busca(variaveis, dominios, None, codificacao, custos=custos,
+                                      limite_segundos=limite_segundos)
+        exaustiva['tempo_inicial'] = time.time()
+        backtracking_otimizado_terminal(variaveis, {}, list(variaveis), dominios, exaustiva)
+
+        lns = novo_estado_busca(variaveis, dominios, None, codificacao, custos=custos)
+        lns['tempo_inicial'] = time.time()
+        busca_lns(variaveis, dominios, lns, limite_segundos, tamanho_vizinhanca, limite_nos, semente=semente)
+
+        limite_inferior = sum(lns['custo_minimo'].values())
+        for nome, estado, iteracoes in (('B&B', exaustiva, '-'), ('LNS', lns, lns['iteracoes'])):
+            valores = [melhor_ate(estado['historico'], instante) for instante in instantes]
+            colunas = " | ".join(f"{'-' if valor is None else valor:>6}" for valor in valores)
+            print(f"{instancia['nome']:<26} | {nome:<6} | {limite_inferior:>9} | {colunas} | {estado['nos']:>9} | "
+                  f"{iteracoes:>9}")
+        if not exaustiva['interrompida']:
+            print(f"{'':<26}   (branch-and-bound provou o ótimo {exaustiva['melhor_score']})")
+        print(f"{'':<26}   melhorias da LNS por vizinhança: {lns['melhorias']}")
+
+# --- BLOCO PRINCIPAL DE EXECUÇÃO ---
+
+if __name__ == "__main__":
+    SEMENTE = 42
+    LIMITE_SEGUNDOS = 20
+    INSTANTES = [0.1, 0.5, 1, 2, 5, 10, 20]
+    TAMANHO_VIZINHANCA = 6
+    LIMITE_NOS_VIZINHANCA = 200
+    # (disciplinas, professores, salas, horários); salas x horários perto do número de disciplinas
+    TAMANHOS = [(8, 4, 2, 4), (60, 20, 6, 12), (150, 50, 12, 15), (400, 130, 30, 16)]
+
+    print(f"--- Melhor penalidade ao longo do tempo ({LIMITE_SEGUNDOS} s por busca) ---")
+    executar_analise(TAMANHOS, LIMITE_SEGUNDOS, INSTANTES, TAMANHO_VIZINHANCA, LIMITE_NOS_VIZINHANCA, SEMENTE)
@@ -0,0 +1,92 @@
+"""
+PROJETO 5 (ANÁLISE): ALOCAÇÃO DE AULAS - BUSCA SEQUENCIAL vs. PARALELA
+
+Gera instâncias de alocação de aulas com semente (`timetabling_instancias.py`),
+resolve cada uma com o branch-and-bound sequencial de `csp_timetabling.py` e com a
+divisão de domínios em um pool de processos (melhor penalidade compartilhada), e
+mede o speedup para cada número de processos.
+
+A busca exata cresce exponencialmente: com 10 disciplinas ela já leva ~13 s em um
+núcleo e com 11, ~55 s. Por isso o speedup até provar o ótimo é medido em instâncias
+pequenas, e as instâncias grandes rodam com o mesmo limite de tempo em todos os modos.
+Nelas, o speedup é a vazão (nós por segundo) relativa à sequencial, e a melhor
+penalidade alcançada no prazo mostra o ganho de qualidade.
+"""
+import os
+import time
+
+from csp_timetabling import backtracking_otimizado_terminal, backtracking_paralelo, novo_estado_busca
+from timetabling_instancias import gerar_instancia, montar_modelo
+
+def resolver_sequencial(variaveis, codificacao, dominios, custos, limite_segundos=None):
+    estado = novo_estado_busca(variaveis, dominios, None, codificacao, custos=custos, limite_segundos=limite_segundos)
+    estado['tempo_inicial'] = time.time()
+    backtracking_otimizado_terminal(variaveis, {}, list(variaveis), dominios, estado)
+    return estado, time.time() - estado['tempo_inicial']
+
+def resolver_paralelo(variaveis, codificacao, dominios, custos, processos, profundidade, limite_segundos=None):
+    estado = novo_estado_busca(variaveis, dominios, None, codificacao, custos=custos, limite_segundos=limite_segundos)
+    estado['tempo_inicial'] = time.time()
+    backtracking_paralelo(variaveis, dominios, estado, processos, profundidade)
+    return estado, time.time() - estado['tempo_inicial']
+
+def executar_analise(tamanhos, contagens_processos, profundidade, semente):
+    print(f"{'Instância':<18} | {'Modo':<12} | {'Tempo (s)':>9} | {'Speedup':>7} | {'Score':>5} | "
+          f"{'Nós':>10} | {'Podas':>10} | {'Subproblemas':>12}")
+    for num_disciplinas, num_professores, num_salas, num_horarios in tamanhos:
+        nome = f"{num_disciplinas}x{num_professores}x{num_salas}x{num_horarios}"
+        instancia = gerar_instancia(num_disciplinas, num_professores, num_salas, num_horarios, semente)
+        variaveis, codificacao, dominios, custos, _ = montar_modelo(instancia)
+        estado, tempo_sequencial = resolver_sequencial(variaveis, codificacao, dominios, custos)
+        print(f"{nome:<18} | {'sequencial':<12} | {tempo_sequencial:>9.2f} | {1.0:>7.2f} | "
+              f"{estado['melhor_score']:>5} | {estado['nos']:>10} | {estado['podas_limite']:>10} | {'-':>12}")
+        for processos in contagens_processos:
+            estado_paralelo, tempo = resolver_paralelo(variaveis, codificacao, dominios, custos, processos,
+                                                       profundidade)
+            if estado_paralelo['melhor_score'] != estado['melhor_score']:
+                raise AssertionError(f"{nome}: busca paralela encontrou {estado_paralelo['melhor_score']}, "
+                                     f"sequencial {estado['melhor_score']}")
+            print(f"{nome:<18} | {f'{processos} processos':<12} | {tempo:>9.2f} | {tempo_sequencial / tempo:>7.2f} | "
+                  f"{estado_paralelo['melhor_score']:>5} | {estado_paralelo['nos']:>10} | "
+                  f"{estado_paralelo['podas_limite']:>10} | {estado_paralelo['subproblemas']:>12}")
+
+def executar_analise_com_prazo(tamanhos, contagens_processos, profundidade, limite_segundos, semente):
+    """Instâncias grandes: todos os modos param no mesmo prazo; compara vazão e penalidade alcançada."""
+    print(f"{'Instância':<18} | {'Modo':<12} | {'Tempo (s)':>9} | {'Nós/s':>10} | {'Speedup':>7} | {'Score':>5} | "
+          f"{'Nós':>10} | {'Subproblemas':>12}")
+    for num_disciplinas, num_professores, num_salas, num_horarios in tamanhos:
+        nome = f"{num_disciplinas}x{num_professores}x{num_salas}x{num_horarios}"
+        instancia = gerar_instancia(num_disciplinas, num_professores, num_salas, num_horarios, semente)
+        variaveis, codificacao, dominios, custos, _ = montar_modelo(instancia)
+        estado, tempo = resolver_sequencial(variaveis, codificacao, dominios, custos, limite_segundos)
+        vazao_sequencial = estado['nos'] / tempo
+        print(f"{nome:<18} | {'sequencial':<12} | {tempo:>9.2f} | {vazao_sequencial:>10.0f} | {1.0:>7.2f} | "
+              f"{estado['melhor_score']:>5} | {estado['nos']:>10} | {'-':>12}")
+        for processos in contagens_processos:
+            estado_paralelo, tempo = resolver_paralelo(variaveis, codificacao, dominios, custos, processos,
+                                                       profundidade, limite_segundos)
+            vazao = estado_paralelo['nos'] / tempo
+            print(f"{nome:<18} | {f'{processos} processos':<12} | {tempo:>9.2f} | {vazao:>10.0f} | "
+                  f"{vazao / vazao_sequencial:>7.2f} | {estado_paralelo['melhor_score']:>5} | "
+                  f"{estado_paralelo['nos']:>10} | {estado_paralelo['subproblemas']:>12}")
+
+# --- BLOCO PRINCIPAL DE EXECUÇÃO ---
+
+if __name__ == "__main__":
+    SEMENTE = 42
+    # (disciplinas, professores, salas, horários)
+    TAMANHOS = [(8, 4, 2, 4), (9, 4, 2, 5), (10, 5, 2, 5)]
+    # Instâncias grandes, resolvidas só até o prazo
+    TAMANHOS_GRANDES = [(60, 20, 6, 12), (150, 50, 12, 15), (400, 130, 30, 16)]
+    LIMITE_SEGUNDOS = 10
+    PROFUNDIDADE_DIVISAO_GRANDES = 1  # com 2, as instâncias grandes já teriam dezenas de milhares de prefixos
+    PROFUNDIDADE_DIVISAO = 2
+    nucleos = os.cpu_count() or 1
+    CONTAGENS_PROCESSOS = sorted({1, 2, 4, nucleos} | {n for n in (8, 16) if n <= nucleos})
+
+    print(f"--- Speedup da busca paralela ({nucleos} núcleos disponíveis) ---")
+    executar_analise(TAMANHOS, CONTAGENS_PROCESSOS, PROFUNDIDADE_DIVISAO, SEMENTE)
+
+    print(f"\n--- Instâncias grandes com prazo de {LIMITE_SEGUNDOS} s (speedup = vazão de nós) ---")
+    executar_analise_com_prazo(TAMANHOS_GRANDES, CONTAGENS_PROCESSOS, PROFUNDIDADE_DIVISAO_GRANDES, LIMITE_SEGUNDOS,
+                               SEMENTE)